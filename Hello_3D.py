@@ -26,6 +26,7 @@ from Python_BMP.BITMAPlib import(
         hexahedravert,
         icosahedvertandsurface,
         newBMP,
+        newzbuffer,
         octahedravert,
         plot3Dsolid as f,
         RGB2int,
@@ -50,6 +51,7 @@ def main():
         my = 768
         file = f'Hello{f.__name__}.bmp'
         bmp = newBMP(mx, my, 24)
+        zb = newzbuffer(mx, my) # depth buffer shared by the solids
         maxpt = bottomrightcoord(bmp)
         cenpt = centercoord(bmp) # bitmap dependent coords
         c = getcolorname2RGBdict()
@@ -77,33 +79,33 @@ def main():
         for s in shapes:
                 f(bmp, s[0], True, s[1], s[2], s[3],
                   rotvec3D(10, 5, 5), tvect, d,
-                  addvect(cenpt, [-160, -10]))
+                  addvect(cenpt, [-160, -10]), zb)
         f(bmp, decahedvertandsurface(25),
           True, cf['brightred'], False,
           0, rotvec3D(7, 77, 20),
-          tvect, d, addvect(cenpt, [280, -250]))
+          tvect, d, addvect(cenpt, [280, -250]), zb)
         f(bmp, icosahedvertandsurface(25),
           True, cf['brightwhite'], False,
           0, rotvec3D(70, 7, 20),
-          tvect, d, addvect(cenpt, [+60, -130]))
+          tvect, d, addvect(cenpt, [+60, -130]), zb)
         f(bmp, spherevertandsurface([5, 0, 0], 60, 10),
           True, cf['brightwhite'], False,
           0, rotvec3D(190, 145, 70),
-          tvect, d, addvect(cenpt, [300, -50]))
+          tvect, d, addvect(cenpt, [300, -50]), zb, 'gouraud')
         f(bmp, cylindervertandsurface([1,0,0], 20, 10, 5),
           True, cf['brightyellow'], True,
           RGB2int(20,20,0), rotvec3D(60, 74, 72),
-          tvect, d, addvect(cenpt,[-200, -50]))
+          tvect, d, addvect(cenpt,[-200, -50]), zb)
         f(bmp, conevertandsurface([1, 0, 0], 20, 15, 5),
           True, cf['brightorange'],
           False, RGB2int(20,20,0),
           rotvec3D(6,67,2),
-          tvect, d, addvect(cenpt, [-300, -150]))
+          tvect, d, addvect(cenpt, [-300, -150]), zb)
         fnxy = lambda x, y: x | y
         f(bmp, surfplot3Dvertandsurface(-15, -35, 35, 35, 5, fnxy),
           True, cf['brightcyan'],
           True, 0, rotvec3D(20, 67, 30),
-          tvect, d, addvect(cenpt, [-420, -25]))
+          tvect, d, addvect(cenpt, [-420, -25]), zb)
 
         saveBMP(file,bmp) # dump bytes to file
         print('Saved to %s in %s\nAll done close %s to finish' % \
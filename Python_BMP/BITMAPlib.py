@@ -31,14 +31,60 @@
 
 from . import shims
 from array import array
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+from itertools import repeat
 from math import(sin, cos, radians, pi)
-from os import environ
+from multiprocessing import get_all_start_methods, get_context
+from os import cpu_count, environ
 from os.path import pathsep
 from pathlib import Path
+from mmap import ACCESS_COPY, ACCESS_READ, ACCESS_WRITE
+from pickle import dumps
 from random import random
 from typing import Callable
 from numbers import Number
-from .proctimer import functimer
+from operator import eq
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    SharedMemory = None
+from .regionview import RegionView
+
+from .render3D import(
+    iterzoutlinepixels,
+    iterzsolidspans,
+    newzbuffer,
+    screenvertices,
+    transformvertices,
+    visiblesides
+    )
+
+from .resample import(
+    resampleBGRrows,
+    resamplefilters
+    )
+
+from .progress import(
+    getprogressreporter,
+    loggingprogress,
+    printprogress,
+    progressreporting,
+    setprogressreporter,
+    throttleprogress
+    )
+
+from .proctimer import(
+    countprofile,
+    functimer,
+    getprofilesink,
+    loggingsink,
+    printsink,
+    profiling,
+    saveprofilestats2JSON,
+    setprofilesink,
+    statssink
+    )
 
 from .bmpconstants import(
     bmpheaderid,
@@ -85,9 +131,12 @@ from .primitives2D import(
     arcvert,
     bsplinevert,
     circleinvolutevert,
+    circledistsqrfunc,
+    circlerowhalfwidths,
     cornuspiralvert,
     ellipsevert,
     eggcurvevert,
+    ellipserowhalfwidths,
     epicycloidvert,
     flowervert,
     gearcurvevert,
@@ -117,6 +166,8 @@ from .primitives2D import(
     iterhypotrochoid,
     iterline,
     iterparallelogram,
+    iterpenspans,
+    itersectorspans,
     iterspirograph,
     itersquircle,
     itersuperellipse,
@@ -126,6 +177,7 @@ from .primitives2D import(
     rectboundarycoords,
     recvert,
     regpolygonvert,
+    segdistsqrfunc,
     sortrecpoints,
     spirographvert,
     squirclevert,
@@ -136,11 +188,13 @@ from .primitives2D import(
     )
 
 from .solids3D import(
+    clearmeshcache,
     conevertandsurface,
     cubevert,
     cylindervertandsurface,
     decahedvertandsurface,
     fillpolydata,
+    iterpolyfillspans,
     gensides,
     getshapesidedict,
     hexahedravert,
@@ -154,6 +208,21 @@ from .solids3D import(
     tetrahedravert
     )
 
+from .colorquant import(
+    colorhistfromBGRbufs,
+    mediancutpal,
+    quantizeBGRbufs
+    )
+
+from .colormasks import(
+    boolbits,
+    colordistmasks,
+    edgemasks,
+    iterbitspans,
+    itermaskbits,
+    palRGBplanes
+    )
+
 from .colors import(
     applybrightnessadjtoBGRbuf,
     applycolorfiltertoBGRbuf,
@@ -174,10 +243,12 @@ from .colors import(
     int2RGB,
     int2RGBarr,
     int2RGBlist,
+    intlist2BGRbuf,
     invertbitsinbuffer,
     isvalidcolorbit,
     makeBGRbuf,
     matchRGBtopal,
+    matchRGBtopalfunc,
     monochrome,
     monochromefiltertoBGRbuf,
     monochromepal,
@@ -205,7 +276,9 @@ from .paramchecks import(
 
 from .bufferflip import(
     flipnibbleinbuf,
-    rotatebitsinbuf
+    fliprunbuf,
+    rotatebitsinbuf,
+    swaprunbufs
     )
 
 from .chartools import(
@@ -218,7 +291,11 @@ from .conditionaltools import iif, swapif
 
 from .dicttools import dict2descorderlist
 
-from .fileutils import checklink, checklinks
+from .fileutils import(
+    BMPmap,
+    checklink,
+    checklinks
+    )
 
 from .fonts import(
     font8x8, font8x14, getcharfont)
@@ -236,6 +313,8 @@ from .fractals import(
     itermarekdragon,
     itermultibrot,
     itermulticircle,
+    itermultifractalrows,
+    itermultifractalcomplexparrows,
     itermultijulia,
     iterspiraljulia,
     fractaldomainparamdict,
@@ -248,7 +327,30 @@ from .fractals import(
     funcparamdict,
     kochcurvevert,
     kochsnowflakevert,
-    newton
+    multibrotrows,
+    multicirclerows,
+    multicornrows,
+    multijuliarows,
+    marekdragonrows,
+    barnsleytreerows,
+    sinjuliarows,
+    cosjuliarows,
+    spiraljuliarows,
+    lambdarows,
+    tetrationrows,
+    xorrows,
+    xordivrows,
+    newton,
+    newtonrows
+    )
+
+from .fractaltiles import(
+    FractalTileCache,
+    fractaltile,
+    fractaltilegrid,
+    getfractaltilecache,
+    itertiledfractalrows,
+    setfractaltilecache
     )
 
 from .inttools import(
@@ -264,8 +366,14 @@ from .funcmeta import getfuncmetastr
 
 from .bufresize import(
     adjustxbufsize,
+    pack1bitbuf,
+    pack4bitbuf,
+    packrowindices,
     resizebufNtimesbigger,
-    resizesmaller24bitbuf
+    resizesmaller24bitbuf,
+    unpack1bitbuf,
+    unpack4bitbuf,
+    unpackrowindices
     )
 
 from .charts import(
@@ -311,6 +419,223 @@ def _setx(bmp: array, xmax: int):
     writeint(bmpx, 4, bmp, xmax)
 
 
+def _plot24bitpixel(bmp: array,
+        s: int, x: int, c: int):
+    """Sets a pixel in a row of a 24 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+        c  : unsigned int color
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    s += x * 3
+    bmp[s: s + 3] = array('B', [c & 0xff,
+                               (c >> 8) & 0xff,
+                                c >> 16])
+
+
+def _plot8bitpixel(bmp: array,
+        s: int, x: int, c: int):
+    """Sets a pixel in a row of an 8 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+        c  : unsigned int color
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    bmp[s + x] = c & 0xff
+
+
+def _plot4bitpixel(bmp: array,
+        s: int, x: int, c: int):
+    """Sets a pixel in a row of a 4 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+        c  : unsigned int color
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    s += x >> 1
+    c &= 0xf
+    if x & 1 == 1:
+        bmp[s] = (bmp[s] & 0xf0) + c
+    else:
+        bmp[s] = (c << 4) + (bmp[s] & 0xf)
+
+
+def _plot1bitpixel(bmp: array,
+        s: int, x: int, c: int):
+    """Sets a pixel in a row of a 1 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+        c  : unsigned int color
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    s += x >> 3
+    mask = 1 << (7 - (x & 7))
+    if c > 0:
+        bmp[s] |= mask
+    else:
+        bmp[s] &= mask ^ 0xff
+
+
+def _get24bitpixel(bmp: array,
+        s: int, x: int) -> int:
+    """Gets a pixel in a row of a 24 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+
+    Returns:
+        unsigned int color value
+    """
+    s += x * 3
+    return (bmp[s + 2] << 16) + \
+           (bmp[s + 1] << 8) + bmp[s]
+
+
+def _get8bitpixel(bmp: array,
+        s: int, x: int) -> int:
+    """Gets a pixel in a row of an 8 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+
+    Returns:
+        unsigned int color value
+    """
+    return bmp[s + x]
+
+
+def _get4bitpixel(bmp: array,
+        s: int, x: int) -> int:
+    """Gets a pixel in a row of a 4 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+
+    Returns:
+        unsigned int color value
+    """
+    b = bmp[s + (x >> 1)]
+    return (b & 0xf) if x & 1 == 1 else b >> 4
+
+
+def _get1bitpixel(bmp: array,
+        s: int, x: int) -> int:
+    """Gets a pixel in a row of a 1 bit BMP
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+        s  : offset of the row
+        x  : unsigned int location
+             in x-axis
+
+    Returns:
+        unsigned int color value
+    """
+    return (bmp[s + (x >> 3)] >> (7 - (x & 7))) & 1
+
+
+_pixelfuncdict = {
+    24: (_plot24bitpixel, _get24bitpixel),
+     8: (_plot8bitpixel, _get8bitpixel),
+     4: (_plot4bitpixel, _get4bitpixel),
+     1: (_plot1bitpixel, _get1bitpixel)}
+
+
+_hdmetacache = {}
+
+_invertbytes = bytes(range(255, -1, -1))
+_flipXYbandbytes = 1 << 18
+
+
+def _hdmeta(hd: bytes) -> tuple:
+    """Decodes the fields of a bmp header
+    that pixel access depends on
+
+    Args:
+        hd: bytes from bmpx up to and
+            including bmpcolorbits
+
+    Returns:
+        (x, y, bits, row bytes,
+         offset of pixel data,
+         pixel setter, pixel getter)
+    """
+    x = readint(0, 4, hd)
+    y = readint(bmpy - bmpx, 4, hd)
+    bits = hd[bmpcolorbits - bmpx]
+    return (x, y, bits, _xbytes(x, bits),
+            bmpheadersizedict.get(bits)) + \
+            _pixelfuncdict.get(bits, (None, None))
+
+
+def _bmpmeta(bmp: array) -> tuple:
+    """Gets the metadata of a BMP
+    from a cache keyed on its header
+    so it is decoded only once
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+
+    Returns:
+        (x, y, bits, row bytes,
+         offset of pixel data,
+         pixel setter, pixel getter)
+        the setter is called as
+        setter(bmp, row offset, x, color)
+        and the getter as
+        getter(bmp, row offset, x)
+    """
+    hd = bmp[bmpx: bmpcolorbits + 1].tobytes()
+    m = _hdmetacache.get(hd)
+    if m is None:
+        if len(_hdmetacache) > 255:
+            _hdmetacache.clear()
+        m = _hdmetacache[hd] = _hdmeta(hd)
+    return m
+
+
 def getmaxx(bmp: array) -> int:
     """Gets the x value stored in the windows bmp header
 
@@ -321,7 +646,7 @@ def getmaxx(bmp: array) -> int:
     Returns:
         int value of x bmp dimension
     """
-    return readint(bmpx, 4, bmp)
+    return _bmpmeta(bmp)[0]
 
 
 def _sety(bmp: array, ymax: int):
@@ -348,7 +673,7 @@ def getmaxy(bmp: array) -> int:
     Returns:
         int value of y bmp dimension
     """
-    return readint(bmpy, 4, bmp)
+    return _bmpmeta(bmp)[1]
 
 
 def getmaxxy(bmp: array) -> tuple:
@@ -361,8 +686,7 @@ def getmaxxy(bmp: array) -> tuple:
     Returns:
         tuple (x:int,y:int)
     """
-    return (readint(bmpx, 4, bmp),
-            readint(bmpy, 4, bmp))
+    return _bmpmeta(bmp)[:2]
 
 
 def bottomrightcoord(
@@ -376,8 +700,8 @@ def bottomrightcoord(
     Returns:
         tuple (x:int,y:int)
     """
-    return (readint(bmpx, 4, bmp) - 1,
-            readint(bmpy, 4, bmp) - 1)
+    (x, y) = _bmpmeta(bmp)[:2]
+    return (x - 1, y - 1)
 
 
 def centercoord(bmp: array) -> tuple:
@@ -390,8 +714,8 @@ def centercoord(bmp: array) -> tuple:
     Returns:
         tuple (x:int,y:int)
     """
-    return ((readint(bmpx, 4, bmp) - 1) >> 1,
-            (readint(bmpy, 4, bmp) - 1) >> 1)
+    (x, y) = _bmpmeta(bmp)[:2]
+    return ((x - 1) >> 1, (y - 1) >> 1)
 
 
 def isinBMPrectbnd(bmp: array,
@@ -409,8 +733,8 @@ def isinBMPrectbnd(bmp: array,
         True if within bounds
         False if out of bounds
     """
-    return (x < readint(bmpx, 4, bmp) and
-            y < readint(bmpy, 4, bmp)) and \
+    (mx, my) = _bmpmeta(bmp)[:2]
+    return (x < mx and y < my) and \
            (x > -1 and y > -1)
 
 
@@ -461,9 +785,7 @@ def _xchrcnt(bmp: array) -> int:
         count of bytes or
         chars in a row (x dim)
     """
-    return _xbytes(
-                readint(bmpx, 4, bmp),
-                    bmp[bmpcolorbits])
+    return _bmpmeta(bmp)[3]
 
 
 def _setflsz(bmp: array, size: int):
@@ -555,9 +877,10 @@ def _24bmof(bmp: array,
     Returns:
         int value of offset to that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return (x * 3) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-        _xbytes(readint(bmpx, 4, bmp), 24))
+        ((my - y - 1) * \
+        _xbytes(mx, 24))
 
 
 def _24bmofhd(bmp: array,
@@ -575,9 +898,10 @@ def _24bmofhd(bmp: array,
     Returns:
         int value of offset to that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return (x * 3) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-        _xbytes(readint(bmpx, 4, bmp), 24 )) + 54
+        ((my - y - 1) * \
+        _xbytes(mx, 24)) + 54
 
 
 def _8bmof(bmp: array,
@@ -596,9 +920,10 @@ def _8bmof(bmp: array,
         int value of offset to
         that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return x + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-            _xbytes(readint(bmpx, 4, bmp), 8))
+        ((my - y - 1) * \
+            _xbytes(mx, 8))
 
 
 def _8bmofhd(bmp: array,
@@ -619,9 +944,10 @@ def _8bmofhd(bmp: array,
         int value of offset to
         that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return x + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-             _xbytes(readint(bmpx, 4, bmp), 8)) + \
+        ((my - y - 1) * \
+             _xbytes(mx, 8)) + \
                  1078
 
 
@@ -640,9 +966,10 @@ def _4bmof(bmp: array,
     Returns:
         int value of offset to that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return (x >> 1) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-             _xbytes(readint(bmpx, 4, bmp), 4))
+        ((my - y - 1) * \
+             _xbytes(mx, 4))
 
 
 def _1bmof(bmp: array,
@@ -660,9 +987,10 @@ def _1bmof(bmp: array,
     Returns:
         int value of offset to that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return (x >> 3) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-            _xbytes(readint(bmpx, 4, bmp), 1))
+        ((my - y - 1) * \
+            _xbytes(mx, 1))
 
 
 def _4bmofhd(bmp: array,
@@ -682,9 +1010,10 @@ def _4bmofhd(bmp: array,
     Returns:
         int value of offset to that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return (x >> 1) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-            _xbytes(readint(bmpx, 4, bmp), 4)) + \
+        ((my - y - 1) * \
+            _xbytes(mx, 4)) + \
                 118
 
 
@@ -705,9 +1034,10 @@ def _1bmofhd(bmp: array,
     Returns:
         int value of offset to that data in byte array
     """
+    (mx, my) = getmaxxy(bmp)
     return (x >> 3) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-            _xbytes(readint(bmpx, 4, bmp), 1)) + \
+        ((my - y - 1) * \
+            _xbytes(mx, 1)) + \
                 62
 
 
@@ -791,9 +1121,8 @@ def getmaxxyandbits(bmp: array) -> tuple:
     Returns:
         (x-dimension, y-dimension, bit depth)
     """
-    return (((readint(bmpx, 4, bmp),
-              readint(bmpy, 4, bmp)),
-              bmp[bmpcolorbits]))
+    m = _bmpmeta(bmp)
+    return (m[:2], m[2])
 
 
 def _xbytes(x: int, bits: int) -> int:
@@ -997,12 +1326,16 @@ def setRGBpal(bmp: array, c: int,
     bmp[s: s + 3] = RGB2BGRarr(r, g, b)
 
 
-def colorhistorgram(bmp: array) -> list:
+def colorhistorgram(bmp: array,
+        progress: Callable = None) -> list:
     """Creates a color histogram
 
     Args:
-        bmp: unsigned byte array
-             with bmp format
+        bmp     : unsigned byte array
+                  with bmp format
+        progress: progress reporter
+                  (default the one set
+                  by setprogressreporter)
 
     Returns:
         list sorted in descending order of color frequencies
@@ -1010,7 +1343,8 @@ def colorhistorgram(bmp: array) -> list:
     d = {}
     for v in iterimagecolor(bmp,
                 sysmsg['colorhist'],
-                '*', sysmsg['done']):
+                '*', sysmsg['done'],
+                progress):
         c = v[1]
         if c not in d:
             d.setdefault(c,1)
@@ -1232,6 +1566,118 @@ def CopyBMPxydim2newBMP(bmp: array,
                   newbits)
 
 
+def _iter24bitrowsdown(bmp: array):
+    """Yields the BGR pixel data of each
+        row of a 24-bit bitmap from
+        the top of the image down
+
+    Args:
+        bmp: unsigned byte array
+             with 24-bit bmp format
+
+    Yields:
+        unsigned byte array
+        (row padding excluded)
+    """
+    (x, y, _, stride, hdsz, _, _) = _bmpmeta(bmp)
+    w = 3 * x
+    for s in range(hdsz + (y - 1) * stride,
+                   hdsz - 1, -stride):
+        yield bmp[s: s + w]
+
+
+def _iterBGRrowsdown(bmp: array):
+    """Yields the pixels of each row
+        of a bitmap of any bit depth
+        as BGR pixel data from the
+        top of the image down
+
+    Args:
+        bmp: unsigned byte array
+             with bmp format
+
+    Yields:
+        unsigned byte array or
+        bytearray (row padding
+        excluded)
+    """
+    (x, y, bits, stride, hdsz, _, _) = _bmpmeta(bmp)
+    if bits == 24:
+        yield from _iter24bitrowsdown(bmp)
+        return
+    (rt, gt, bt) = palRGBplanes(getallRGBpal(bmp))
+    for s in range(hdsz + (y - 1) * stride,
+                   hdsz - 1, -stride):
+        idx = unpackrowindices(
+                bmp[s: s + stride], bits, x)
+        buf = bytearray(3 * x)
+        buf[0::3] = idx.translate(bt)
+        buf[1::3] = idx.translate(gt)
+        buf[2::3] = idx.translate(rt)
+        yield buf
+
+
+def quantize24bitimage(bmp: array,
+        newbits: int,
+        dither: str = 'none',
+        similaritythreshold: int = 0,
+        usemonopal: bool = False,
+        RGBfactors: list[float, float, float] = None
+        ) -> array:
+    """Creates a 1, 4 or 8-bit copy of a
+        24-bit bitmap with a median cut
+        palette and optional dithering
+
+    Args:
+        bmp                : unsigned byte array
+                             with 24-bit
+                             bmp format
+        newbits            : can be 1, 4
+                             or 8 bits
+        dither             : 'none',
+                             'floydsteinberg'
+                             or 'ordered'
+        similaritythreshold: boxes of colors
+                             narrower than this
+                             are not split
+                             when building
+                             the palette
+        usemonopal         : True -> image
+                             will be mono
+        RGBfactors         : (r: float,
+                              b: float,
+                              g: float)
+                             values range
+                             from 0 to 1
+                             used only if
+                             usemonopal
+                             is True
+
+    Returns:
+        unsigned byte array with bitmap layout
+    """
+    nbmp = CopyBMPxydim2newBMP(bmp, newbits)
+    if newbits == 1:
+        pal = getallRGBpal(nbmp)
+    elif usemonopal:
+        pal = setBMP2monochrome(nbmp, RGBfactors)
+    else:
+        pal = mediancutpal(
+                colorhistfromBGRbufs(
+                    _iter24bitrowsdown(bmp)),
+                1 << newbits,
+                similaritythreshold)
+        setbmppal(nbmp, pal)
+    (x, y, _, stride, hdsz, _, _) = _bmpmeta(nbmp)
+    s = hdsz + (y - 1) * stride
+    for buf in quantizeBGRbufs(
+            _iter24bitrowsdown(bmp),
+            x, pal, newbits, dither):
+        nbmp[s: s + len(buf)] = buf
+        s -= stride
+    return nbmp
+
+
 @checklink
 def loadBMP(filename: str) -> array:
     """Load bitmap to a byte array
@@ -1254,6 +1700,7 @@ def loadBMP(filename: str) -> array:
             if fsize > 54:
                 f.seek(0)
                 a.frombytes(f.read(fsize))
+                countprofile(bytesread=len(a))
             else:
                 print(sysmsg['notBMP'])
         f.close()
@@ -1291,6 +1738,74 @@ def saveBMP(filename: str, bmp: array):
     with open(filename, 'wb') as f:
         f.write(bmp)
         f.close()
+    if getprofilesink() is not None:
+        (x, y) = getmaxxy(bmp)
+        countprofile(x * y, 0, len(bmp))
+
+
+@checklink
+def mapBMP(filename: str,
+        mode: str = 'r+') -> BMPmap:
+    """Maps a bitmap file to memory
+       (uncompressed bitmap only)
+       so it can be read or drawn on
+       without loading the whole file
+
+    Args:
+        filename: full path to
+                  the file to be mapped
+        mode    : 'r'  -> read only
+                  'r+' -> changes are
+                          written to
+                          the file
+                  'c'  -> changes are
+                          kept in memory
+
+    Returns:
+        memory mapped bitmap
+        that slices like an
+        unsigned byte array
+        (close it when done)
+    """
+    access = {'r': ACCESS_READ,
+              'r+': ACCESS_WRITE,
+              'c': ACCESS_COPY}[mode]
+    with open(filename,
+            'rb' if mode == 'r' else 'r+b') as f:
+        hd = f.read(10)
+        fsize = char2int(hd[2:]) \
+            if hd[:2] == b'BM' else 0
+        if fsize <= 54:
+            print(sysmsg['notBMP'])
+            return None
+        return BMPmap(f.fileno(), fsize,
+                      access=access)
+
+
+def createBMPfile(filename: str,
+        x: int, y: int, colorbits: int):
+    """Creates a blank bitmap file
+        without building it in memory
+        so it can be mapped with mapBMP
+
+    Args:
+        filename : full path to
+                   the file to be created
+        x, y     : unsigned int values
+                   of x and y dims
+        colorbits: bit depth
+                   (1, 4, 8, 24) bits
+
+    Returns:
+        A Bitmap File
+    """
+    (filesize, hdrsize, x, y, bits) = \
+        _bmmeta(x, y, colorbits)
+    hd = _setmeta([hdrsize, hdrsize, x, y, bits])
+    _setflsz(hd, filesize)
+    with open(filename, 'wb') as f:
+        f.write(hd)
+        f.truncate(filesize)
 
 
 def BMPbitBLTput(bmp: array,
@@ -1472,48 +1987,141 @@ def plotxybit(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    if not isinBMPrectbnd(bmp, x, y):
+    (mx, my, _, r, hd, plotpixel, _) = _bmpmeta(bmp)
+    if -1 < x < mx and -1 < y < my:
+        plotpixel(bmp, hd + (my - y - 1) * r, x, c)
+
+
+def plotxyrow(bmp: array,
+        x: int, y: int, colors: list[int]):
+    """Sets a run of pixels starting at (x, y)
+    and going right to the colors in a list
+
+    Args:
+        bmp   : unsigned byte array
+                with bmp format
+        x, y  : int location of
+                the leftmost pixel
+        colors: [c: int, ...]
+                one color per pixel
+
+    Returns:
+        byref modified unsigned byte array
+        (pixels outside the bitmap are skipped)
+    """
+    (mx, my) = getmaxxy(bmp)
+    if not isinrange(y, my, -1):
+        return
+    if x < 0:
+        colors = colors[-x:]
+        x = 0
+    n = min(len(colors), mx - x)
+    if n <= 0:
         return
     bits = bmp[bmpcolorbits]
+    s = _BMoffsethd(bmp, x, y)
     if bits == 24:
-        offset = (x * 3) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-        _xbytes(readint(bmpx, 4, bmp), 24 )) + 54
-        bmp[offset: offset + 3] = \
-            array('B', [c & 0xff,
-                      (c >> 8) & 0xff,
-                       c >> 16])
+        bmp[s: s + n * 3] = intlist2BGRbuf(colors[:n])
     elif bits == 8:
-        bmp[x + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-             _xbytes(readint(bmpx, 4, bmp), 8)) + \
-                 1078] = c & 0xff
+        bmp[s: s + n] = array('B',
+            [c & 0xff for c in colors[:n]])
+    else:
+        e = _BMoffsethd(bmp, x + n - 1, y) + 1
+        if bits == 4:
+            buf = unpack4bitbuf(bmp[s: e])
+            i = x & 1
+            buf[i: i + n] = [c & 0xf for c in colors[:n]]
+            bmp[s: e] = array('B', pack4bitbuf(buf))
+        elif bits == 1:
+            buf = unpack1bitbuf(bmp[s: e])
+            i = x & 7
+            buf[i: i + n] = [1 if c > 0 else 0
+                                for c in colors[:n]]
+            bmp[s: e] = array('B', pack1bitbuf(buf))
+
+def plotxybits(bmp: array,
+        xs: list[int], ys: list[int],
+        colors: list[int]):
+    """Sets many pixels in a bitmap
+    in one pass
+
+    Args:
+        bmp   : unsigned byte array
+                with bmp format
+        xs, ys: sequences of int
+                locations in x and y
+        colors: one unsigned int color
+                for all the pixels or
+                a sequence of colors
+                one per pixel
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    (mx, my, bits, r, hd, _, _) = _bmpmeta(bmp)
+    s = hd + (my - 1) * r
+    if isinstance(colors, int):
+        colors = repeat(colors)
+    pts = [(x, s - y * r, c)
+            for (x, y, c) in zip(xs, ys, colors)
+                if -1 < x < mx and -1 < y < my]
+    if bits == 24:
+        for (x, o, c) in pts:
+            o += x * 3
+            bmp[o] = c & 0xff
+            bmp[o + 1] = (c >> 8) & 0xff
+            bmp[o + 2] = c >> 16
+    elif bits == 8:
+        for (x, o, c) in pts:
+            bmp[o + x] = c & 0xff
     elif bits == 4:
-        offset = (x >> 1) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-            _xbytes(readint(bmpx, 4, bmp), 4)) + \
-                118
-        c &= 0xf
-        if x & 1 == 1:
-            bmp[offset] = \
-                (bmp[offset] & 0xf0) + c
-        else:
-            bmp[offset] = \
-                (c << 4) + (bmp[offset] & 0xf)
+        for (x, o, c) in pts:
+            o += x >> 1
+            if x & 1 == 1:
+                bmp[o] = (bmp[o] & 0xf0) + (c & 0xf)
+            else:
+                bmp[o] = ((c & 0xf) << 4) + (bmp[o] & 0xf)
     elif bits == 1:
-        offset = (x >> 3) + \
-        ((readint(bmpy, 4, bmp) - y - 1) * \
-            _xbytes(readint(bmpx, 4, bmp), 1)) + \
-                62
-        b = bmp[offset]
-        mask = 1 << (7 - (x % 8))
-        c = 1 if c > 0 else 0
-        if c == 1:
-           b |= mask
-        elif (b & mask) == mask \
-        and c == 0:
-           b = b ^ mask
-        bmp[offset] = b
+        for (x, o, c) in pts:
+            o += x >> 3
+            if c > 0:
+                bmp[o] |= 0x80 >> (x & 7)
+            else:
+                bmp[o] &= (0x80 >> (x & 7)) ^ 0xff
+
+
+def plotRGBpoints(bmp: array,
+        xs: list[int], ys: list[int],
+        rgbs: list[list[int, int, int]]):
+    """Sets many pixels in a bitmap
+    to [R, G, B] colors in one pass
+
+    Args:
+        bmp   : unsigned byte array
+                with bmp format
+        xs, ys: sequences of int
+                locations in x and y
+        rgbs  : one color for all the
+                pixels defined by
+                [R: byte, G: byte, B: byte]
+                or a sequence of them
+                one per pixel
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    if len(rgbs) == 3 and isinstance(rgbs[0], int):
+        rgbs = [rgbs]
+        single = True
+    else:
+        single = False
+    if bmp[bmpcolorbits] == 24:
+        colors = [(r << 16) + (g << 8) + b
+                    for (r, g, b) in rgbs]
+    else:
+        colors = list(map(matchRGBtopalfunc(
+                    getallRGBpal(bmp)), rgbs))
+    plotxybits(bmp, xs, ys, colors[0] if single else colors)
 
 
 def getxybit(bmp: array,
@@ -1529,26 +2137,10 @@ def getxybit(bmp: array,
     Returns:
         unsigned int color value
     """
-    retval = 0
-    if isinBMPrectbnd(bmp, x, y):
-        offset = _BMoffsethd(bmp, x, y)
-        bits = bmp[bmpcolorbits]
-        if bits == 1:
-            mask = 7 - (x % 8)
-            retval = \
-                (bmp[offset] & (1 << mask)) >> mask
-        elif bits == 4:
-            retval = (bmp[offset] & 0xf) if x & 1 == 1 else (bmp[offset] & 0xf0) >> 4
-        elif bits == 8:
-            retval = bmp[offset]
-        elif bits == 24:
-            retval = \
-                RGB2int(bmp[offset+2],
-                        bmp[offset+1],
-                        bmp[offset])
-    else:
-        retval = -1
-    return retval
+    (mx, my, _, r, hd, _, getpixel) = _bmpmeta(bmp)
+    if -1 < x < mx and -1 < y < my:
+        return getpixel(bmp, hd + (my - y - 1) * r, x)
+    return -1
 
 
 def getRGBxybitvec(bmp: array,
@@ -1690,9 +2282,14 @@ def plotxypointlist(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    for v in vlist:
-        roundpen(bmp, v,
-            penradius, color)
+    if penradius <= 1:
+        vlist = list(vlist)
+        plotxybits(bmp, [v[0] for v in vlist],
+                        [v[1] for v in vlist], color)
+    else:
+        for v in vlist:
+            roundpen(bmp, v,
+                penradius, color)
 
 
 def roundpen(bmp: array, point: list,
@@ -1769,34 +2366,24 @@ def line(bmp: array,
         bits = bmp[bmpcolorbits]
         p1 = (x1, y1)
         p2 = (x2, y2)
-        c = _getBMoffhdfunc(bmp)
+        (_, my, _, r, hd, plotpixel, _) = _bmpmeta(bmp)
+        s = hd + (my - 1) * r
         if bits == 24:
             buf = int2BGRarr(color)
             for (x, y) in iterline(p1, p2):
-                s = c(bmp, x, y)
-                bmp[s: s + 3] = buf
+                o = s - y * r + x * 3
+                bmp[o: o + 3] = buf
         elif bits ==  8:
             color &= 0xff
             for (x, y) in iterline(p1, p2):
-                bmp[c(bmp, x, y)] = \
-                    color
-        elif bits == 4:
+                bmp[s - y * r + x] = color
+        else:
             if color > 15:
                 color &= 0xf
+            if bits == 1 and color > 1:
+                color &= 0x1
             for (x, y) in iterline(p1, p2):
-                s = c(bmp, x, y)
-                if x & 1 == 1:
-                    bmp[s] = \
-                        (bmp[s] & 0xf0) + color
-                else:
-                    bmp[s] = (color << 4) + \
-                             (bmp[s] & 0xf)
-        elif bits == 1:
-            if color > 1:
-                color &= 0x1
-            for (x, y) in iterline(p1, p2):
-                plotxybit(bmp, x, y, color)
-
+                plotpixel(bmp, s - y * r, x, color)
 
 def horiline(bmp: array, y: int,
         x1: int, x2: int, color: int):
@@ -1820,6 +2407,8 @@ def horiline(bmp: array, y: int,
         x1, x2 = swapif(x1, x2, x1 > x2)
         x1 = setmin(x1, 0)
         x2 = setmax(x2, mx - 1)
+        if x1 > x2:
+            return
         dx = x2 - x1 + 1
         s = _BMoffsethd(bmp, x1, y)
         if bits == 24:
@@ -1844,10 +2433,16 @@ def horiline(bmp: array, y: int,
                 plotxybit(bmp,
                     x2 - 1, y, color)
         elif bits == 1:
-            x2 += 1
-            for x in range(x1, x2):
-                plotxybit(bmp,
-                    x, y, color)
+            c = 0xff if color > 0 else 0
+            e = _BMoffsethd(bmp, x2, y)
+            lm = 0xff >> (x1 & 7)
+            rm = (0xff << (7 - (x2 & 7))) & 0xff
+            if s == e:
+                lm &= rm
+            bmp[s] = (bmp[s] & (lm ^ 0xff)) + (c & lm)
+            if s < e:
+                bmp[s + 1: e] = array('B', [c] * (e - s - 1))
+                bmp[e] = (bmp[e] & (rm ^ 0xff)) + (c & rm)
     else:
         print(sysmsg['lineoutofbnd'])
 
@@ -2118,6 +2713,113 @@ def drawvec(bmp: array,
             linevec(bmp, a, b, color)
 
 
+def _penstroke(bmp: array,
+        pnts: list[list[int, int]],
+        penradius: int, color: int):
+    """Stamps a round pen at every
+    point by drawing the spans it
+    covers so each pixel is set once
+
+    Args:
+        bmp      : unsigned byte array
+                   with bmp format
+        pnts     : [(x, y), ...]
+                   pen centers
+        penradius: radius of pen
+                   in pixels
+        color    : color of the pen
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    fillspans(bmp,
+        iterpenspans(pnts, penradius,
+            *getmaxxy(bmp)), color)
+
+
+def _gradpenstroke(bmp: array,
+        pnts: list[list[int, int]],
+        penradius: int,
+        distsqr: Callable,
+        lumrange: list[int, int],
+        RGBfactors: list[float, float, float]):
+    """Stamps a round pen at every
+    point and colors each covered
+    pixel once by its distance
+    to the centerline
+
+    Args:
+        bmp       : unsigned byte array
+                    with bmp format
+        pnts      : [(x, y), ...]
+                    pen centers
+        penradius : radius of pen
+                    in pixels
+        distsqr   : function(y, x1, x2)
+                    that returns the
+                    squared distances
+                    to the centerline
+                    like the ones from
+                    segdistsqrfunc
+        lumrange  : [byte, byte] range
+                    of the gradient
+        RGBfactors: [r, g, b] value
+                    range from
+                    0.0 to 1.0
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    if penradius < 1:
+        return
+    lum1, lumrang = range2baseanddelta(lumrange)
+    bits = bmp[bmpcolorbits]
+    if bits != 24:
+        pal = getallRGBpal(bmp)
+    lut = []
+    for i in range(1, penradius + 1):
+        c = colormix(int(lum1 +
+            (lumrang * i / penradius)),
+                RGBfactors)
+        if bits != 24:
+            c = matchRGBtopal(int2RGBarr(c), pal)
+        # a pen of radius i covers the
+        # pixels up to i * (i + 1)
+        # squared distance away
+        lut += [c] * (i * i + i + 1 - len(lut))
+    lim = len(lut) - 1
+    for (y, x1, x2) in iterpenspans(pnts,
+            penradius, *getmaxxy(bmp)):
+        plotxyrow(bmp, x1, y,
+            [lut[int(min(d, lim))]
+                for d in distsqr(y, x1, x2)])
+
+
+def _thicklinesegs(
+        vertlist: list[list[Number, Number]],
+        isclosed: bool
+        ) -> list[list[list[int, int]]]:
+    """Rounded endpoints of the lines
+    that connect a list of vertices
+
+    Args:
+        vertlist: [(x, y), ...]
+                  list of vertices
+        isclosed: True -> the last
+                  vertex connects
+                  to the first
+
+    Returns:
+        [[p1, p2], ...]
+    """
+    v = [roundvect(p) for p in vertlist]
+    segs = [[v[i - 1], v[i]]
+            for i in range(1, len(v))]
+    if isclosed:
+        segs.append([v[0], v[-1]])
+    return segs
+
+
 def thickroundline(bmp: array,
         p1: list, p2: list,
         penradius: int, color: int):
@@ -2135,9 +2837,8 @@ def thickroundline(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    for (x, y) in iterline(p1, p2):
-        circle(bmp, x, y,
-        penradius, color, True)
+    _penstroke(bmp, iterline(p1, p2),
+        penradius, color)
 
 
 def gradthickroundline(bmp: array,
@@ -2169,18 +2870,13 @@ def gradthickroundline(bmp: array,
         byref modified
         unsigned byte array
     """
-    lum1, lumrang = range2baseanddelta(lumrange)
-    for i in range(penradius, 0, -1):
-        c = colormix(int(lum1 +
-            (lumrang * i / penradius)),
-            	RGBfactors)
-        if bmp[bmpcolorbits] != 24:
-            c = matchRGBtopal(
-                    int2RGBarr(c),
-                    getallRGBpal(bmp))
-        thickroundline(bmp, p1, p2, i, c)
+    _gradpenstroke(bmp, iterline(p1, p2),
+        penradius,
+        segdistsqrfunc([[p1, p2]], penradius),
+        lumrange, RGBfactors)
 
 
+@functimer
 @intcircleparam24bitonly
 def _usenopar24btfn2circreg(bmp: array,
         x: int, y: int, r: int,
@@ -2234,6 +2930,7 @@ def _usenopar24btfn2circreg(bmp: array,
                 bmp[s1: e1] = func(bmp[s1: e1])
 
 
+@functimer
 @intcircleparam24bitonly
 def _use24btfn2circreg(bmp: array,
         x: int, y: int, r: int,
@@ -2389,6 +3086,7 @@ def copycircregion(bmp: array,
       copycircregion2buf(bmp, x, y, r))
 
 
+@functimer
 @intcircleparam
 def _usenoparfn2circreg(bmp: array,
         x: int, y: int, r: int,
@@ -2460,10 +3158,16 @@ def flipXYcircregion(bmp: array,
     bits = bmp[bmpcolorbits]
     c = _getBMoffhdfunc(bmp)
     if bits not in [24, 8]:
-        n = flipXY(bmp)
+        # flip only the rows and columns
+        # of the region starting at a row
+        # that keeps the bit alignment of
+        # the flipped pixels
+        (x0, y0) = (x - r, (y - r) & ~7)
+        n = flipXY(crop(bmp, x0, y0, x + r,
+                min(((y + r) | 7) + 1, getmaxy(bmp)) - 1))
         for (v0, v1) in itercirclepartlineedge(r):
-            x3, x4 = mirror(y, v0)
-            y3, y4 = mirror(x, v1)
+            x3, x4 = mirror(y - y0, v0)
+            y3, y4 = mirror(x - x0, v1)
             x1, x2 = mirror(x, v0)
             y1, y2 = mirror(y, v1)
             bmp[c(bmp, x1, y1): c(bmp, x2, y1)] = \
@@ -2508,7 +3212,29 @@ def fliphoricircregion(bmp: array,
         bmp, x, y, r, 'F')
 
 
-@func8and24bitonlyandentirecircleinboundary
+def _vertlineedgerowwidths(r: int) -> list[int]:
+    """Gets the half widths of the rows
+        of the circular area traced by
+        itercirclepartvertlineedge
+
+    Args:
+        r: int radius
+
+    Returns:
+        [half width: int, ...]
+        indexed by the distance
+        of the row from the center
+    """
+    h = {}
+    for (x, y) in itercirclepartvertlineedge(r):
+        h[x] = max(h.get(x, -1), y)
+    w = [0] * (h[0] + 1)
+    for x in sorted(h):
+        w[: h[x] + 1] = [x] * (h[x] + 1)
+    return w
+
+
+@entirecircleinboundary
 def horitransformincircregion(
         bmp: array,
         x: int, y: int, r: int,
@@ -2530,49 +3256,14 @@ def horitransformincircregion(
         byref modified
         unsigned byte array
     """
-    def _24F():
-        bmp[s1: e1 - 2: k], bmp[s2: e2 -2: k], bmp[s1 + 1: e1-1: k], bmp[s2 + 1: e2-1: k], bmp[s1 + 2: e1: k], bmp[s2 + 2: e2: k] = \
-        bmp[s2: e2 - 2: k], bmp[s1: e1 - 2: k], bmp[s2 + 1: e2 - 1: k], bmp[s1 + 1: e1 - 1: k], bmp[s2 + 2: e2: k], bmp[s1 + 2: e1: k]
-
-    def _8F():
-        bmp[s1: e1: k], bmp[s2: e2: k] = \
-        bmp[s2: e2: k], bmp[s1: e1: k]
-
-    def _24R():
-        bmp[s1: e1 - 2: k], bmp[s1 + 1: e1 -1: k], bmp[s1 + 2: e1: k] = \
-        bmp[s2: e2 - 2: k], bmp[s2 + 1: e2 - 1: k], bmp[s2 + 2: e2: k]
-
-    def _8R():
-        bmp[s1: e1: k] = bmp[s2: e2: k]
-
-    def _24L():
-        bmp[s2: e2 - 2: k], bmp[s2 + 1: e2 - 1: k], bmp[s2 + 2: e2: k] = \
-        bmp[s1: e1 - 2: k], bmp[s1 + 1: e1 - 1: k], bmp[s1 + 2: e1: k]
-
-    def _8L():
-        bmp[s2: e2: k] = bmp[s1: e1: k]
-
-    c = _getBMoffhdfunc(bmp)
-
-    f ={8: {'F': _8F,
-            'R': _8R,
-            'L': _8L
-             },
-        24: {'F': _24F,
-             'R': _24R,
-             'L': _24L
-             }
-        }[bmp[bmpcolorbits]][trans]
-
-    for v in itercirclepartvertlineedge(r):
-        x1, x2 = mirror(x, v[0])
-        y1, y2 = mirror(y, v[1])
-        k = _xchrcnt(bmp)
-        s1 = c(bmp, x1, y2)
-        e1 = c(bmp, x1, y1) + k
-        s2 = c(bmp, x2, y2)
-        e2 = c(bmp, x2, y1) + k
-        f()
+    (_, my, bits, k, hd, _, _) = _bmpmeta(bmp)
+    for (dy, w) in enumerate(
+            _vertlineedgerowwidths(r)):
+        for y1 in {y - dy, y + dy}:
+            s = hd + (my - 1 - y1) * k
+            bmp[s: s + k] = fliprunbuf(
+                bmp[s: s + k], bits,
+                x - w, x + w, trans)
 
 
 def mirrorleftincircregion(
@@ -3248,9 +3939,8 @@ def thickcircle(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    for (p0, p1) in itercircle(x, y, r):
-        circle(bmp, p0, p1,
-        penradius, color, True)
+    _penstroke(bmp, itercircle(x, y, r),
+        penradius, color)
 
 
 def gradthickcircle(bmp: array,
@@ -3276,14 +3966,146 @@ def gradthickcircle(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
+    _gradpenstroke(bmp, itercircle(x, y, r),
+        penradius, circledistsqrfunc(x, y, r),
+        lumrange, RGBfactors)
+
+
+def _lumramp(bmp: array,
+        lums: list[int],
+        RGBfactors: list[float, float, float]
+        ) -> list[int]:
+    """Colors for a list of luminosities
+    ready to plot in a bitmap
+
+    Args:
+        bmp       : unsigned byte array
+                    with bmp format
+        lums      : list of byte
+                    luminosities
+        RGBfactors: [r, g, b] range are
+                    from 0.0 to 1.0
+
+    Returns:
+        list of int color values
+        (matched to the palette
+        if not 24-bit)
+    """
+    ramp = [colormix(l, RGBfactors) for l in lums]
+    if bmp[bmpcolorbits] != 24:
+        match = matchRGBtopalfunc(
+                    getallRGBpal(bmp))
+        ramp = [match(int2RGBarr(c)) for c in ramp]
+    return ramp
+
+
+def gradcolorramp(bmp: array,
+        lumrange: list[int, int],
+        RGBfactors: list[float, float, float],
+        steps: int) -> list[int]:
+    """Colors of a luminosity gradient
+    ready to plot in a bitmap
+
+    Args:
+        bmp       : unsigned byte array
+                    with bmp format
+        lumrange  : [byte, byte] range
+                    of the gradient
+        RGBfactors: [r, g, b] range are
+                    from 0.0 to 1.0
+        steps     : number of colors
+
+    Returns:
+        list of int color values
+        (matched to the palette
+        if not 24-bit) that go from
+        lumrange[0] towards lumrange[1]
+    """
     lum1, lumrang = range2baseanddelta(lumrange)
-    for i in range(penradius, 0, -1):
-        c = colormix(int(
-                lum1 + (lumrang * i / penradius)), RGBfactors)
-        if bmp[bmpcolorbits] != 24:
-            c = matchRGBtopal(
-                    int2RGBarr(c), getallRGBpal(bmp))
-        thickcircle(bmp, x, y, r, i, c)
+    return _lumramp(bmp,
+        [int(lum1 + (lumrang * i / steps))
+            for i in range(steps)], RGBfactors)
+
+
+_radialrowcache = {}
+
+
+def _radialrows(b: int, a: int,
+        steps: int) -> list:
+    """Ramp indices for the rows of
+    a filled ellipse by normalized
+    distance from the center
+    worked out once for each shape
+
+    Args:
+        b, a : major and minor axes
+               (b is along y)
+        steps: number of ramp colors
+
+    Returns:
+        [[index, ...], ...] for rows
+        0 to b away from the center
+        each row going from -x to x
+    """
+    key = (b, a, steps)
+    rows = _radialrowcache.get(key)
+    if rows is None:
+        if len(_radialrowcache) > 63:
+            _radialrowcache.clear()
+        if a == b:
+            hw = circlerowhalfwidths(b)
+        else:
+            hw = ellipserowhalfwidths(b, a)
+        m = steps - 1
+        rows = []
+        for (dy, w) in enumerate(hw):
+            fy = (dy / b) ** 2
+            half = [min(int((fy + (dx / a) ** 2) ** .5 *
+                            steps), m)
+                    for dx in range(w + 1)]
+            rows.append(half[:0:-1] + half)
+        _radialrowcache[key] = rows
+    return rows
+
+
+def radialgradfill(bmp: array,
+        x: int, y: int, b: int, a: int,
+        ramp: list[int]):
+    """Fills an ellipse one row
+    at a time with colors picked
+    by normalized distance from
+    the center so each pixel
+    is written once
+
+    Args:
+        bmp : unsigned byte array
+              with bmp format
+        x, y: center of ellipse
+        b, a: major and minor axes
+              (a circle if b == a)
+        ramp: list of int color
+              values from the center
+              to the edge like the
+              ones from gradcolorramp
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    if a < 1 or b < 1 or len(ramp) == 0:
+        return
+    (mx, my) = getmaxxy(bmp)
+    for (dy, row) in enumerate(
+            _radialrows(b, a, len(ramp))):
+        w = len(row) >> 1
+        x1 = x - w
+        i = setmin(-x1, 0)
+        e = setmax(len(row), mx - x1)
+        if i >= e:
+            continue
+        colors = [ramp[k] for k in row[i: e]]
+        for py in {y - dy, y + dy}:
+            if isinrange(py, my, -1):
+                plotxyrow(bmp, x1 + i, py, colors)
 
 
 def gradcircle(bmp: array,
@@ -3305,16 +4127,9 @@ def gradcircle(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    lum1, lumrang = range2baseanddelta(lumrange)
-    for i in range(r - 1, 0, -1):
-        c = colormix(
-                int(lum1 + (lumrang * i / r)),
-                RGBfactors)
-        if bmp[bmpcolorbits] != 24:
-            c = matchRGBtopal(
-                    int2RGBarr(c),
-                    getallRGBpal(bmp))
-        thickcircle(bmp, x, y, i, 2, c)
+    radialgradfill(bmp, x, y, r, r,
+        gradcolorramp(bmp, lumrange,
+            RGBfactors, r))
 
 
 def orb(bmp: array,
@@ -3334,21 +4149,18 @@ def orb(bmp: array,
         byref modified unsigned byte array
     """
     j = r >> 1
-    c = colormix(255, RGBfactors)
-    if bmp[bmpcolorbits] != 24:
-        c = matchRGBtopal(
-                int2RGBarr(c),
-                getallRGBpal(bmp))
-    filledcircle(bmp, x, y, j, c)
-    for i in range(r - 1, j, -1):
-        c = colormix(
-                int(255 * (r - i) / j),
-                RGBfactors)
+    if j < 1:
+        c = colormix(255, RGBfactors)
         if bmp[bmpcolorbits] != 24:
             c = matchRGBtopal(
                     int2RGBarr(c),
                     getallRGBpal(bmp))
-        thickcircle(bmp, x, y, i, 2, c)
+        filledcircle(bmp, x, y, j, c)
+        return
+    radialgradfill(bmp, x, y, r, r,
+        _lumramp(bmp,
+            [setmax(int(255 * (r - i) / j), 255)
+                for i in range(r)], RGBfactors))
 
 
 def thickellipserot(bmp: array,
@@ -3371,10 +4183,9 @@ def thickellipserot(bmp: array,
         byref modified
         unsigned byte array
     """
-    for (p0, p1) in iterellipserot(x, y,
-                b, a, degrot):
-        circle(bmp, p0, p1,
-            penradius, color, True)
+    _penstroke(bmp,
+        iterellipserot(x, y, b, a, degrot),
+        penradius, color)
 
 
 def gradthickellipserot(bmp: array,
@@ -3550,20 +4361,9 @@ def gradellipse(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    lum1, lumrang = range2baseanddelta(lumrange)
-    r = max(a, b)
-    a -= r
-    b -= r
-    for i in range(r, 0, -1):
-        c = colormix(
-                int(lum1 + (lumrang * i / r)),
-                RGBfactors)
-        if bmp[bmpcolorbits] != 24:
-            c = matchRGBtopal(
-                    int2RGBarr(c),
-                    getallRGBpal(bmp))
-        ellipse(bmp, x, y,
-        b + i, a + i, c, True)
+    radialgradfill(bmp, x, y, b, a,
+        gradcolorramp(bmp, lumrange,
+            RGBfactors, max(a, b)))
 
 
 @intcircleparam
@@ -3595,17 +4395,26 @@ def drawarc(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    av = arcvert(x, y, r,
-         startdegangle, enddegangle)
-    for p in av:
-        plotxybit(bmp, p[0], p[1],
-            color)
     if isfilled:
-        fillboundary(bmp,
-            fillpolydata(av,
-                getmaxx(bmp),
-                getmaxy(bmp)),
+        if startdegangle < enddegangle:
+            arcs = [[startdegangle, enddegangle]]
+        elif startdegangle > enddegangle:
+            # the arc goes past 12 o'clock
+            arcs = [[startdegangle, 360],
+                    [0, enddegangle]]
+        else:
+            arcs = []
+        for degangles in arcs:
+            fillspans(bmp,
+                (s[:3] for s in itersectorspans(
+                    x, y, r, degangles,
+                    *getmaxxy(bmp))),
                 fillcolor)
+    else:
+        av = arcvert(x, y, r,
+             startdegangle, enddegangle)
+        plotxybits(bmp, [p[0] for p in av],
+                        [p[1] for p in av], color)
 
 
 def rectangle(bmp: array,
@@ -3695,8 +4504,9 @@ def beziercurve(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    for v in iterbeziercurve(pntlist):
-        roundpen(bmp, v, penradius, color)
+    plotxypointlist(bmp,
+        iterbeziercurve(pntlist),
+        penradius, color)
 
 
 def bspline(bmp: array, pntlist: list,
@@ -3722,9 +4532,10 @@ def bspline(bmp: array, pntlist: list,
     Returns:
         byref modified unsigned byte array
     """
-    for v in iterbspline(pntlist,
-             isclosed, curveback):
-        roundpen(bmp, v, penradius, color)
+    plotxypointlist(bmp,
+        iterbspline(pntlist,
+            isclosed, curveback),
+        penradius, color)
 
 
 def plotrotated8bitpatternwithfn(
@@ -4761,6 +5572,173 @@ def plotitalic8bitpatternsidewayasdots(
         plotcircinsqr)
 
 
+_glyphcache = {}
+
+
+def clearglyphcache():
+    """Drops the glyphs cached by
+        the string drawing functions
+    """
+    _glyphcache.clear()
+
+
+def _fontkey(fontbuf: list) -> bytes:
+    """Gets a digest of a font
+        to key its glyphs by
+    """
+    return sha1(bytes(fontbuf)).digest()
+
+
+def _glyphruns(c: str,
+        fontbuf: list,
+        scale: int, pixspace: int,
+        color: int,
+        fontrenderfunc: Callable,
+        bits: int,
+        xphase: int, yphase: int) -> tuple:
+    """Rasterizes a glyph into runs of
+        pixels by drawing it with a
+        font render function on two
+        scratch bitmaps that have
+        different backgrounds and
+        keeping the pixels that
+        came out the same
+
+    Args:
+        c             : char to draw
+        fontbuf       : the font
+                        (see fonts.py)
+        scale         : control how big
+                        the font is
+        pixspace      : space between
+                        each bit
+        color         : color of the font
+        fontrenderfunc: function that
+                        renders the font
+        bits          : bit depth
+        xphase, yphase: x and y of the
+                        glyph modulo the
+                        pixels per byte
+                        and modulo 2
+
+    Returns:
+        ((x1, y1, x2, y2) bounds of
+         the pixels or None if there
+         are none,
+         [(dx, dy, run), ...] rows of
+         pixel bytes or indices
+         relative to the glyph origin)
+        or None if the glyph does not
+        fit in the scratch bitmaps
+    """
+    m = (((max(fontbuf[0], 8) + 8) * scale + 9) >> 3) << 3
+    n = (m << 1) + 8
+    (ox, oy) = (m + xphase, m + yphase)
+    pattern = getcharfont(fontbuf, c)
+    rows = []
+    for fill in (False, True):
+        b = newBMP(n, n, bits)
+        if fill:
+            hd = _hdsz(b)
+            b[hd:] = array('B', b'\xff' * (len(b) - hd))
+        fontrenderfunc(b, ox, oy, pattern,
+            scale, pixspace, color)
+        v = RegionView(b, 0, 0, n - 1, n - 1)
+        rows.append([v.pixelrow(i) for i in range(n)])
+    step = 3 if bits == 24 else 1
+    (runs, xs, ys) = ([], [], [])
+    for (y, (r0, r1)) in enumerate(zip(*rows)):
+        for (x1, x2) in iterbitspans(boolbits(
+                map(eq, r0[::step], r1[::step]))):
+            run = r0[x1 * step: (x2 + 1) * step]
+            runs.append((x1 - ox, y - oy,
+                array('B', run) if bits > 4 else list(run)))
+            xs += [x1, x2]
+            ys.append(y)
+    if not runs:
+        return (None, runs)
+    if min(xs) == 0 or max(xs) == n - 1 or \
+       min(ys) == 0 or max(ys) == n - 1:
+        return None
+    return ((min(xs) - ox, min(ys) - oy,
+             max(xs) - ox, max(ys) - oy), runs)
+
+
+def _plotglyph(bmp: array,
+        x: int, y: int, c: str,
+        scale: int, pixspace: int,
+        color: int, fontbuf: list,
+        fontkey: bytes,
+        fontrenderfunc: Callable):
+    """Draws a char with a font render
+        function from a cache of glyphs
+        rasterized into runs of pixels
+        so every row of the glyph is
+        one slice assignment
+
+    Glyphs that reach the border of
+    the bitmap or go past it are drawn
+    by the font render function itself
+
+    Args:
+        bmp           : unsigned
+                        byte array
+                        with bmp format
+        x, y          : sets where to
+                        draw the char
+        c             : char to draw
+        scale         : control how big
+                        the font is
+        pixspace      : space between
+                        each bit
+        color         : color of the font
+        fontbuf       : the font
+                        (see fonts.py)
+        fontkey       : made by _fontkey
+                        from fontbuf
+        fontrenderfunc: function that
+                        renders the font
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    (mx, my, bits, r, hd, _, _) = _bmpmeta(bmp)
+    xphase = x & (7 if bits == 1 else 1)
+    key = (fontkey, c, scale, pixspace,
+           tuple(color) if type(color) == list else color,
+           fontrenderfunc, bits, xphase, y & 1)
+    try:
+        g = _glyphcache.get(key, False)
+        if g is False:
+            if len(_glyphcache) > 4095:
+                _glyphcache.clear()
+            g = _glyphcache[key] = _glyphruns(c,
+                fontbuf, scale, pixspace, color,
+                fontrenderfunc, bits, xphase, y & 1)
+    except TypeError:
+        g = None
+    if g is not None:
+        (bnd, runs) = g
+        if bnd is None:
+            return
+        (x1, y1, x2, y2) = bnd
+        if 0 < x + x1 and x + x2 < mx - 1 and \
+           0 < y + y1 and y + y2 < my - 1:
+            if bits < 8:
+                for (dx, dy, run) in runs:
+                    plotxyrow(bmp, x + dx, y + dy, run)
+                return
+            step = bits >> 3
+            for (dx, dy, run) in runs:
+                s = hd + (my - 1 - y - dy) * r + \
+                    (x + dx) * step
+                bmp[s: s + len(run)] = run
+            return
+    fontrenderfunc(bmp, x, y,
+        getcharfont(fontbuf, c),
+        scale, pixspace, color)
+
+
 def plotstringfunc(bmp: array,
         x: int, y: int, str2plot: str,
         scale: int, pixspace: int,
@@ -4804,6 +5782,7 @@ def plotstringfunc(bmp: array,
                 spacebetweenchar
     ystep = fontbuf[0] * scale + \
                 spacebetweenchar
+    fk = _fontkey(fontbuf)
     for c in orderfunc(str2plot):
         if c == '\n':
             y += ystep
@@ -4811,12 +5790,13 @@ def plotstringfunc(bmp: array,
         elif c == '\t':
             x += xstep << 2
         else:
-            fontrenderfunc(bmp, x, y,
-                getcharfont(fontbuf, c),
-                scale, pixspace, color)
+            _plotglyph(bmp, x, y, c,
+                scale, pixspace, color,
+                fontbuf, fk, fontrenderfunc)
             x += xstep
 
 
+@functimer
 def plotstringfunc2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -4880,6 +5860,7 @@ def plotstringfunc2file(file: str,
         mx -= 1
         my -= 1
         filledrect(bmp, 0, 0, mx, my, backgroundcolor)
+    fk = _fontkey(fontbuf)
     for c in orderfunc(str2plot):
         if c == '\n':
             y += ystep
@@ -4887,13 +5868,14 @@ def plotstringfunc2file(file: str,
         elif c == '\t':
             x += xstep << 2
         else:
-            fontrenderfunc(bmp, x, y,
-                getcharfont(fontbuf, c),
-                scale, pixspace, color)
+            _plotglyph(bmp, x, y, c,
+                scale, pixspace, color,
+                fontbuf, fk, fontrenderfunc)
             x += xstep
     saveBMP(file, bmp)
 
 
+@functimer
 def plotstringverticalwithfn2file(
         file: str,
         str2plot: str,
@@ -4960,6 +5942,7 @@ def plotstringverticalwithfn2file(
         mx -= 1
         my -= 1
         filledrect(bmp, 0, 0, mx, my, backgroundcolor)
+    fk = _fontkey(fontbuf)
     for c in orderfunc(str2plot):
         if c == '\n':
             x += xstep
@@ -4967,9 +5950,9 @@ def plotstringverticalwithfn2file(
         elif c == '\t':
             y += ystep << 2
         else:
-            fontrenderfunc(bmp, x, y,
-               getcharfont(fontbuf,c),
-               scale, pixspace, color)
+            _plotglyph(bmp, x, y, c,
+               scale, pixspace, color,
+               fontbuf, fk, fontrenderfunc)
             y += ystep
     saveBMP(file, bmp)
 
@@ -5014,6 +5997,7 @@ def plotstring(bmp: array,
         plot8bitpattern)
 
 
+@functimer
 def plotstring2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5056,6 +6040,7 @@ def plotstring2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotverticalstring2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5134,6 +6119,7 @@ def plotitalicstring(bmp: array,
         plotitalic8bitpattern)
 
 
+@functimer
 def plotitalicstring2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5176,6 +6162,7 @@ def plotitalicstring2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotverticalitalicstring2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5218,6 +6205,7 @@ def plotverticalitalicstring2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotreverseditalicstring2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5260,6 +6248,7 @@ def plotreverseditalicstring2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotverticalstringasdots2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5302,6 +6291,7 @@ def plotverticalstringasdots2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotverticalitalicstringasdots2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5378,6 +6368,7 @@ def plotstringasdots(bmp: array,
         plot8bitpatternasdots)
 
 
+@functimer
 def plotstringasdots2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5420,6 +6411,7 @@ def plotstringasdots2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotitalicstringasdots2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5462,6 +6454,7 @@ def plotitalicstringasdots2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotreversedstring2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5504,6 +6497,7 @@ def plotreversedstring2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotreversedstringasdots2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5687,6 +6681,7 @@ def plotstringupsidedown(bmp: array,
         plot8bitpatternupsidedown)
 
 
+@functimer
 def plotupsidedownstring2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5729,6 +6724,7 @@ def plotupsidedownstring2file(file: str,
         bitdepth)
 
 
+@functimer
 def plotupsidedownstringasdots2file(file: str,
         str2plot: str,
         scale: int, pixspace: int,
@@ -5983,6 +6979,7 @@ def plotstringsidewayfn(bmp: array,
     oy = y
     xstep = (scale << 3 ) + spacebetweenchar
     ystep = fontbuf[0] * scale + spacebetweenchar
+    fk = _fontkey(fontbuf)
     for c in enumletters(str2plot):
         if c == '\n':
             x += ystep #we swap x and y since sideways
@@ -5990,9 +6987,9 @@ def plotstringsidewayfn(bmp: array,
         elif c == '\t':
             y -= xstep << 2 #we swap x and y since sideways
         else:
-            fn(bmp, x, y,
-               getcharfont(fontbuf, c),
-               scale, pixspace, color)
+            _plotglyph(bmp, x, y, c,
+               scale, pixspace, color,
+               fontbuf, fk, fn)
             y -= xstep
 
 
@@ -6173,6 +7170,7 @@ def plotstringverticalwithfn(
                 spacebetweenchar
     ystep = fontbuf[0] * scale + \
                 spacebetweenchar
+    fk = _fontkey(fontbuf)
     for c in enumletters(str2plot):
         if c == '\n':
             x += xstep
@@ -6180,9 +7178,9 @@ def plotstringverticalwithfn(
         elif c == '\t':
             y += ystep << 2
         else:
-            fn(bmp, x, y,
-               getcharfont(fontbuf,c),
-               scale, pixspace, color)
+            _plotglyph(bmp, x, y, c,
+               scale, pixspace, color,
+               fontbuf, fk, fn)
             y += ystep
 
 
@@ -6343,12 +7341,36 @@ def fillboundary(bmp: array,
     """
     for y in bndfilldic:
         b =  bndfilldic[y]
-        yint = len(b)
-        if yint == 1:
-            plotxybit(bmp, b[0], y, color)
-        else:
-            for j in range(1, yint):
-                horiline(bmp, y, b[j - 1], b[j], color)
+        if len(b) > 0:
+            horiline(bmp, y, b[0], b[-1], color)
+
+
+def fillspans(bmp: array,
+        spans: list[list[int, int, int]],
+        color: int):
+    """Draws horizontal spans
+
+    Args:
+        bmp  : unsigned byte array
+               with bmp format
+        spans: [(y, xstart, xend), ...]
+               like the ones from
+               iterpolyfillspans
+        color: color of fill
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    if bmp[bmpcolorbits] == 4:
+        # horiline leaves out some 4 bit
+        # pixels so the spans are merged
+        # into the nibbles here
+        for (y, x1, x2) in spans:
+            plotxyrow(bmp, x1, y,
+                [color] * (x2 - x1 + 1))
+    else:
+        for (y, x1, x2) in spans:
+            horiline(bmp, y, x1, x2, color)
 
 
 def plotpolyfill(bmp: array,
@@ -6367,8 +7389,8 @@ def plotpolyfill(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    fillboundary(bmp,
-        fillpolydata(polyboundary(vertlist),
+    fillspans(bmp,
+        iterpolyfillspans(vertlist,
             getmaxx(bmp), getmaxy(bmp)), color)
 
 
@@ -6388,16 +7410,9 @@ def thickplotpoly(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    vertcount = len(vertlist)
-    for i in range(vertcount):
-        if i > 0:
-            thickroundline(bmp,
-                roundvect(vertlist[i - 1]),
-                roundvect(vertlist[i]),
-                penradius, color)
-    thickroundline(bmp,
-        roundvect(vertlist[0]),
-        roundvect(vertlist[vertcount - 1]),
+    _penstroke(bmp,
+        (p for seg in _thicklinesegs(vertlist, True)
+           for p in iterline(*seg)),
         penradius, color)
 
 
@@ -6423,16 +7438,11 @@ def gradthickplotpoly(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    lum1, lumrang = range2baseanddelta(lumrange)
-    for i in range(penradius, 0, -1):
-        c = colormix(int(
-                lum1 + (lumrang * i / penradius)),
-                RGBfactors)
-        if bmp[bmpcolorbits] != 24:
-            c = matchRGBtopal(
-                int2RGBarr(c),
-                getallRGBpal(bmp))
-        thickplotpoly(bmp, vertlist, i, c)
+    segs = _thicklinesegs(vertlist, True)
+    _gradpenstroke(bmp,
+        (p for seg in segs for p in iterline(*seg)),
+        penradius, segdistsqrfunc(segs, penradius),
+        lumrange, RGBfactors)
 
 
 def gradplotlines(bmp: array,
@@ -6457,6 +7467,13 @@ def gradplotlines(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
+    if penradius >= 2:
+        segs = _thicklinesegs(vertlist, False)
+        _gradpenstroke(bmp,
+            (p for seg in segs for p in iterline(*seg)),
+            penradius, segdistsqrfunc(segs, penradius),
+            lumrange, RGBfactors)
+        return
     lum1, lumrang = range2baseanddelta(lumrange)
     for i in range(penradius, 0, -1):
         c = colormix(int(
@@ -6498,12 +7515,10 @@ def plotlines(bmp: array,
                     vertlist[i - 1],
                     vertlist[i], color)
     elif penradius >= 2:
-        for i in range(vertcount):
-            if i > 0:
-                thickroundline(bmp,
-                    roundvect(vertlist[i - 1]),
-                    roundvect(vertlist[i]),
-                    penradius, color)
+        _penstroke(bmp,
+            (p for seg in _thicklinesegs(vertlist, False)
+               for p in iterline(*seg)),
+            penradius, color)
 
 
 def plotpoly(bmp: array,
@@ -6625,9 +7640,18 @@ def plot3Dsolid(bmp: array,
         rotvect: list[float, float, float],
         transvect3D: list[float, float, float],
         d: int,
-        transvect: list[int, int]):
+        transvect: list[int, int],
+        zbuffer: array = None,
+        shading: str = 'flat'):
     """3D solid rendering function
 
+    The sides are filled a triangle
+    at a time and only where they
+    are nearer than what is in the
+    depth buffer so solids drawn
+    with the same depth buffer hide
+    each other where they should
+
     Args:
         bmp         : unsigned
                       byte array
@@ -6652,17 +7676,93 @@ def plot3Dsolid(bmp: array,
         transvect   : 2D translation
                       vector for
                       screen position
+        zbuffer     : depth buffer from
+                      newzbuffer(mx, my)
+                      shared by the
+                      solids of a scene
+                      (default a new
+                      one for this solid)
+        shading     : 'flat'    -> one
+                                   color
+                                   per side
+                      'gouraud' -> colors
+                                   blended
+                                   from the
+                                   corners
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    if shading not in ('flat', 'gouraud'):
+        print(sysmsg['invalidshading'])
+        return
+    (mx, my) = getmaxxy(bmp)
+    if zbuffer is None:
+        zbuffer = newzbuffer(mx, my)
+    elif len(zbuffer) != mx * my:
+        print(sysmsg['invalidzbuffer'])
+        return
+    (rot, proj) = transformvertices(
+        vertandsides[0], rotvect, transvect3D, d)
+    scr = screenvertices(rot, proj, transvect)
+    sides = visiblesides(rot, vertandsides[1])
+    if issolid:
+        _plotlumspans(bmp, iterzsolidspans(scr, rot,
+            sides, zbuffer, mx, my,
+            shading == 'gouraud'), RGBfactors)
+    if showoutline:
+        pts = list(iterzoutlinepixels(scr, sides,
+                   zbuffer, mx, my))
+        if pts:
+            (xs, ys) = zip(*pts)
+            plotxybits(bmp, xs, ys, outlinecolor)
+
+
+def _plotlumspans(bmp: array,
+        spans: list[list[int, int, int,
+                         float, float]],
+        RGBfactors: list[float, float, float]):
+    """Draws spans of luminosity values
+        mixed with a color like the
+        ones from iterzsolidspans
+
+    Args:
+        bmp       : unsigned byte array
+                    with bmp format
+        spans     : [(y, xstart, xend,
+                      lum at xstart,
+                      lum change per
+                      pixel), ...]
+        RGBfactors: [r, g, b]
+                    r, g, b are
+                    float values
+                    from 0.0 to 1.0
 
     Returns:
         byref modified unsigned byte array
     """
-    plot3d(bmp, gensides(perspective(
-           vertandsides[0], rotvect,
-           transvect3D, d),
-        transvect, vertandsides[1]),
-        issolid, RGBfactors,
-        showoutline,
-        outlinecolor)
+    (_, my, bits, r, hd, _, _) = _bmpmeta(bmp)
+    colors = [colormix(l, RGBfactors) for l in range(256)]
+    if bits == 24:
+        px = [c.to_bytes(3, 'little') for c in colors]
+    else:
+        match = matchRGBtopalfunc(getallRGBpal(bmp))
+        px = [bytes((match(int2RGBarr(c)),)) for c in colors]
+    b = len(px[0])
+    s = hd + (my - 1) * r
+    with memoryview(bmp) as buf:
+        for (y, x1, x2, l, dl) in spans:
+            n = x2 - x1 + 1
+            if dl == 0:
+                row = px[min(max(int(l), 0), 255)] * n
+            else:
+                row = b''.join([px[min(max(int(l + dl * k), 0), 255)]
+                                for k in range(n)])
+            if bits < 8:
+                RegionView(bmp, x1, y, x2, y).setpixelrow(0, row)
+            else:
+                o = s - y * r + x1 * b
+                buf[o: o + n * b] = row
 
 
 def gradvert(bmp: array,
@@ -6690,6 +7790,13 @@ def gradvert(bmp: array,
         byref modified
         unsigned byte array
     """
+    if penradius >= 2:
+        pnts = [roundvect(p) for p in vertlist]
+        _gradpenstroke(bmp, pnts, penradius,
+            segdistsqrfunc([[p, p] for p in pnts],
+                penradius),
+            lumrange, RGBfactors)
+        return
     lum1, lumrang = range2baseanddelta(lumrange)
     for i in range(penradius, 0, -1):
         c = colormix(
@@ -6993,15 +8100,22 @@ def XYscatterplot(
     Returns:
         byref modified unsigned byte array
     """
+    pts = []
     for v in XYdata:
         r = v[2]
         w = userdef2Dcooordsys2screenxy(
                 v[0], v[1], XYcoordinfo)
         if r>1:
+            if pts != []:
+                plotxybits(bmp, *zip(*pts))
+                pts = []
             circlevec(bmp, w,
                 setmax(r, 5), v[3], v[4])
         else:
-            plotvecxypoint(bmp, w, v[3])
+            (x, y) = roundvect(w)
+            pts.append((x, y, v[3]))
+    if pts != []:
+        plotxybits(bmp, *zip(*pts))
     if showLinearRegLine:
         m = LSMslope(XYdata)
         b = LSMYint(XYdata)
@@ -7028,9 +8142,165 @@ def getneighborcolorlist(
                 v, getmaxx(bmp), getmaxy(bmp), True)]
 
 
-def iterimagedgevert(
+def _iterrowsdown(bmp: array,
+        report: Callable = None,
+        rowprocind: str = ''):
+    """Yields the raw pixel data of
+        each row of a bitmap from
+        the top of the image down
+
+    Args:
+        bmp       : unsigned byte array
+                    with bmp format
+        report    : progress reporter
+                    told about every
+                    row yielded
+        rowprocind: what to report
+                    as a row is
+                    yielded
+
+    Yields:
+        unsigned byte array
+        (row padding included)
+    """
+    (_, my, _, r, hd, _, _) = _bmpmeta(bmp)
+    for y in range(my):
+        s = hd + (my - 1 - y) * r
+        yield bmp[s: s + r]
+        if report is not None and y < my - 1:
+            report(rowprocind, y + 1, my)
+
+
+def getimagedgemasks(
         bmp: array,
-        similaritythreshold: float):
+        similaritythreshold: float,
+        progress: Callable = None
+        ) -> list[int]:
+    """Finds edges in an image as
+        a mask with one int per row
+
+    Args:
+        bmp                : unsigned
+                             byte array
+                             with
+                             bmp format
+        similaritythreshold: how
+                             different
+                             a neighbor
+                             is before
+                             it is an
+                             edge
+        progress           : progress
+                             reporter
+                             (default the
+                             one set by
+                             setprogress-
+                             reporter)
+
+    Returns:
+        [mask: int, ...] where bit x
+        of mask y is set if (x, y)
+        is on an edge
+    """
+    report = getprogressreporter(progress)
+    (mx, my, bits, _, _, _, _) = _bmpmeta(bmp)
+    if report is not None:
+        report(sysmsg['edgedetect'], 0, my)
+    masks = edgemasks(
+        _iterrowsdown(bmp, report, '*'),
+        bits, mx,
+        getallRGBpal(bmp) if bits < 24 else None,
+        similaritythreshold)
+    if report is not None:
+        report(sysmsg['done'], my, my)
+    return masks
+
+
+def getimageregionmasks(
+        bmp: array,
+        rgb: list[int, int, int],
+        similaritythreshold: float
+        ) -> list[int]:
+    """Selects a region by color as
+        a mask with one int per row
+
+    Args:
+        bmp                : unsigned
+                             byte array
+                             with bmp
+                             format
+        rgb                : (r: byte,
+                              g: byte,
+                              b: byte)
+        similaritythreshold: how close
+                             to the color
+                             before we
+                             select it
+
+    Returns:
+        [mask: int, ...] where bit x
+        of mask y is set if (x, y)
+        is selected
+    """
+    (mx, _, bits, _, _, _, _) = _bmpmeta(bmp)
+    return colordistmasks(
+        _iterrowsdown(bmp), bits, mx,
+        getallRGBpal(bmp) if bits < 24 else None,
+        rgb, similaritythreshold)
+
+
+def itermaskvert(masks: list[int]):
+    """Yields the points set in a mask
+
+    Args:
+        masks: [mask: int, ...]
+               one per row
+
+    Yields:
+        (x: int, y: int)
+        from the bottom row up
+    """
+    for y in range(len(masks) - 1, -1, -1):
+        for x in itermaskbits(masks[y]):
+            yield (x, y)
+
+
+def plotmasks(bmp: array,
+        masks: list[int],
+        penradius: int, color: int):
+    """Draws a circle or a point
+    depending on the penradius
+    with a given color for
+    all points set in a mask
+
+    Args:
+        bmp      : unsigned byte array
+                   with bmp format
+        masks    : [mask: int, ...]
+                   one per row
+        penradius: radius of the pen
+                   (in pixels)
+        color    : color of the pen
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    if penradius <= 1:
+        fillspans(bmp,
+            ((y, x1, x2)
+             for (y, m) in enumerate(masks)
+             for (x1, x2) in iterbitspans(m)),
+            color)
+    else:
+        for v in itermaskvert(masks):
+            roundpen(bmp, v,
+                penradius, color)
+
+
+def iterimagedgevert(
+        bmp: array,
+        similaritythreshold: float,
+        progress: Callable = None):
     """Find edges in an image
 
     Args:
@@ -7042,21 +8312,19 @@ def iterimagedgevert(
                              to the color
                              before we
                              yield it
+        progress           : progress
+                             reporter
+                             (default the
+                             one set by
+                             setprogress-
+                             reporter)
 
     Yields:
         (x: int, y: int)
     """
-    (mx, my) = getmaxxy(bmp)
-    for (v0, v1) in iterimageRGB(bmp,
-                sysmsg['edgedetect'],
-                '*' , sysmsg['done']):
-        for u in itergetneighbors(
-                    v0, mx, my, False):
-            if distance(
-                    getRGBxybitvec(bmp, u), v1) > \
-                        similaritythreshold:
-                yield u
-                break
+    yield from itermaskvert(
+        getimagedgemasks(bmp,
+            similaritythreshold, progress))
 
 
 def iterimageregionvertbyRGB(
@@ -7081,11 +8349,9 @@ def iterimageregionvertbyRGB(
     Yields:
         ((x: int, y: int), (r: byte, g: byte, b: byte))
     """
-    for v in iterimageRGB(bmp,
-                sysmsg['edgedetect'],
-                '*', sysmsg['done']):
-        if distance(rgb, v[1]) < similaritythreshold:
-            yield v[0]
+    yield from itermaskvert(
+        getimageregionmasks(bmp, rgb,
+            similaritythreshold))
 
 
 def getimageregionbyRGB(
@@ -7158,8 +8424,8 @@ def plotimgedges(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotxypointlist(bmp,
-        getimagedgevert(bmp,
+    plotmasks(bmp,
+        getimagedgemasks(bmp,
             similaritythreshold),
         edgeradius, edgecolor)
 
@@ -7241,28 +8507,37 @@ def upgradeto24bitimage(bmp: array):
 
 
 def iterimageRGB(bmp: array,
-        waitmsg: str, rowprocind: str,
-        finishmsg: str):
+        waitmsg: str = '',
+        rowprocind: str = '',
+        finishmsg: str = '',
+        progress: Callable = None):
     """Yields (r, g, b) information for the entire bitmap
 
     Args:
         bmp       : unsigned byte array
                     with bmp format
-        waitmsg   : what to display
-                    in terminal at
-                    process start
-        rowprocind: char to display as
-                    a row is processed
-        finishmsg : what to display
-                    in terminal at
-                    process end
+        waitmsg   : what to report
+                    at process start
+        rowprocind: what to report
+                    as a row is
+                    processed
+        finishmsg : what to report
+                    at process end
+        progress  : progress reporter
+                    (default the one
+                    set by
+                    setprogressreporter
+                    and if none is set
+                    nothing is reported)
 
     Yields:
         ((x: int, y: int), (r: byte, g: byte, b: byte))
     """
-    if waitmsg != '':
-        print(waitmsg)
-    y = getmaxy(bmp) - 1
+    report = getprogressreporter(progress)
+    my = getmaxy(bmp)
+    if report is not None:
+        report(waitmsg, 0, my)
+    y = my - 1
     offset = 0
     b = getBMPimgbytes(bmp)
     maxoffset = len(b)
@@ -7304,39 +8579,46 @@ def iterimageRGB(bmp: array,
             x = 0
             y -= 1
             offset += padbytes
-            if rowprocind != '':
-                print(rowprocind, end = '')
+            if report is not None and y > -1:
+                report(rowprocind, my - 1 - y, my)
         offset += doff
-    print('\n')
-    if finishmsg != '':
-        print(finishmsg)
+    if report is not None:
+        report(finishmsg, my, my)
 
 
 def iterimagecolor(bmp: array,
-        waitmsg: str, rowprocind: str,
-        finishmsg: str):
+        waitmsg: str = '',
+        rowprocind: str = '',
+        finishmsg: str = '',
+        progress: Callable = None):
     """Yields color information for entire bitmap
 
     Args:
         bmp       : unsigned byte array
                     with bmp format
-        waitmsg   : what to display
-                    in the terminal
+        waitmsg   : what to report
                     when process starts
-        rowprocind: string to print in
-                    the terminal as a
-                    row is processed as
+        rowprocind: what to report
+                    as a row is
+                    processed as
                     a process indicator
-        finishmsg : what to display
-                    in the terminal
+        finishmsg : what to report
                     when process ends
+        progress  : progress reporter
+                    (default the one
+                    set by
+                    setprogressreporter
+                    and if none is set
+                    nothing is reported)
 
     Yields:
         ((x: int, y: int), color: int)
     """
-    if waitmsg != '':
-        print(waitmsg)
-    y = getmaxy(bmp) - 1
+    report = getprogressreporter(progress)
+    my = getmaxy(bmp)
+    if report is not None:
+        report(waitmsg, 0, my)
+    y = my - 1
     offset = 0
     b = getBMPimgbytes(bmp)
     maxoffset = len(b)
@@ -7372,12 +8654,33 @@ def iterimagecolor(bmp: array,
             x = 0
             y -= 1
             offset += pb
-            if rowprocind != '':
-                print(rowprocind, end='')
+            if report is not None and y > -1:
+                report(rowprocind, my - 1 - y, my)
         offset += doff
-    print('\n')
-    if finishmsg != '':
-        print(finishmsg)
+    if report is not None:
+        report(finishmsg, my, my)
+
+
+@entirerectinboundary
+def regionview(bmp: array,
+        x1: int, y1: int,
+        x2: int, y2: int) -> RegionView:
+    """Gets a view of a rectangular region
+        whose rows are read and written
+        in the bitmap without copies
+
+    Args:
+        bmp           : unsigned
+                        byte array
+                        with bmp format
+        x1, y1, x2, y2: defines the
+                        rectangle
+
+    Returns:
+        RegionView (the bitmap can not
+        change size while it is used)
+    """
+    return RegionView(bmp, x1, y1, x2, y2)
 
 
 @entirerectinboundary
@@ -7396,13 +8699,13 @@ def copyrect(bmp: array,
     retval = array('B', [bmp[bmpcolorbits]])
     x1, y1, x2, y2 = \
        sortrecpoints(x1, y1, x2, y2)
+    n = adjustxbufsize(bmp, x1, x2)
     retval += int2buf(2, x2 - x1 + 2)
     retval += int2buf(2, y2 - y1 + 1)
-    retval += int2buf(2,
-                adjustxbufsize(bmp, x1, x2))
-    for buf in itercopyrect(
-                    bmp, x1, y1, x2, y2):
-        retval += buf
+    retval += int2buf(2, n)
+    v = RegionView(bmp, x1, y1, x2, y2)
+    retval.frombytes(b''.join(v[i][:n]
+        for i in range(len(v) - 1, -1, -1)))
     return retval
 
 
@@ -7429,18 +8732,19 @@ def pasterect(bmp: array, buf: array,
         r = _xchrcnt(bmp)
         if listinBMPrecbnd(bmp, ((x1, y1),
                                 (x2, y2))):
-            offset = _BMoffset(bmp, x1, y2)
+            hd = _hdsz(bmp)
+            s = hd + _BMoffset(bmp, x1, y2)
             br = buf2int(buf[5: 7])
-            startoff = 7
-            endoff = br + 7
-            bufsize = len(buf)
-            while startoff < bufsize:
-                BMPbitBLTput(bmp,
-                    offset,
-                    buf[startoff: endoff])
-                offset += r
-                startoff = endoff
-                endoff += br
+            if br == 0:
+                return
+            with memoryview(bmp) as m, \
+                 memoryview(buf) as b:
+                for i in range(7, len(b), br):
+                    if hd <= s and s + br <= len(m):
+                        m[s: s + br] = b[i: i + br]
+                    else:
+                        print(sysmsg['invalidoffset'])
+                    s += r
         else:
             print(sysmsg['regionoutofbounds'])
 
@@ -7484,6 +8788,20 @@ def invertimagebits(bmp: array):
         offset += 1
 
 
+def _invertrowbytes(row: array) -> array:
+    """Inverts the bits in a row
+        of bitmap bytes
+
+    Args:
+        row: unsigned byte array
+
+    Returns:
+        unsigned byte array
+    """
+    return array('B',
+        row.tobytes().translate(_invertbytes))
+
+
 def erasealternatehorizontallines(
         bmp: array,
         int_eraseeverynline: int,
@@ -7904,8 +9222,8 @@ def fliphorzontalpixelbased(
                     x2: int, y2: int):
     """Flips horizontal
         a rectangular region
-        using pixel addressing
-        (slightly slow)
+        with pixel exact edges
+        at any bit depth
 
     Args:
         bmp           : unsigned
@@ -7920,15 +9238,8 @@ def fliphorzontalpixelbased(
         unsigned byte array
 
     """
-    m = x1 + ((x2 - x1) >> 1)
-    while x1 <= m:
-        y = y1
-        while y <= y2:
-            swapcolors(bmp, (x1, y),
-                            (x2, y))
-            y += 1
-        x1 += 1
-        x2 -= 1
+    horitransregion(bmp, x1, y1,
+                         x2, y2, 'F')
 
 
 @entirerectinboundary
@@ -7937,8 +9248,8 @@ def fliphverticalalpixelbased(
                     x2: int, y2: int):
     """Flips vertical
         a rectangular region
-        using pixel addressing
-        (slightly slow)
+        with pixel exact edges
+        at any bit depth
 
     Args:
         bmp           : unsigned
@@ -7951,15 +9262,17 @@ def fliphverticalalpixelbased(
         byref modified
         unsigned byte array
     """
-    m = y1 + ((y2 - y1) >> 1)
-    while y1 <= m:
-        x = x1
-        while x <= x2:
-            swapcolors(bmp, (x, y1),
-                            (x, y2))
-            x += 1
-        y1 += 1
-        y2 -= 1
+    x1, y1, x2, y2 = sortrecpoints(
+                        x1, y1, x2, y2)
+    (_, my, bits, r, hd, _, _) = _bmpmeta(bmp)
+    s1 = hd + (my - 1 - y1) * r
+    s2 = hd + (my - 1 - y2) * r
+    while s1 > s2:
+        bmp[s1: s1 + r], bmp[s2: s2 + r] = \
+            swaprunbufs(bmp[s1: s1 + r],
+                bmp[s2: s2 + r], bits, x1, x2)
+        s1 -= r
+        s2 += r
 
 
 @entirerectinboundary
@@ -7997,6 +9310,41 @@ def horizontalbulkswap(bmp: array,
         x2 -= dx
 
 
+@entirerectinboundary
+def horitransregion(bmp: array,
+        x1: int, y1: int,
+        x2: int, y2: int, trans: str):
+    """Do horizontal image transforms
+        in a rectangular region
+        a whole row at a time
+
+    Args:
+        bmp            : unsigned
+                         byte array
+                         with bmp format
+        x1, y1, x2, y2 : ints that
+                         defines the
+                         rectangular
+                         region
+        trans          : single letter
+                         transform code
+                'L' - mirror left half
+                'R' - mirror right half
+                'F' - flip
+
+    Returns:
+        byref modified
+        unsigned byte array
+    """
+    x1, y1, x2, y2 = sortrecpoints(
+                        x1, y1, x2, y2)
+    (_, my, bits, r, hd, _, _) = _bmpmeta(bmp)
+    for s in range(hd + (my - 1 - y2) * r,
+                   hd + (my - y1) * r, r):
+        bmp[s: s + r] = fliprunbuf(
+            bmp[s: s + r], bits, x1, x2, trans)
+
+
 def fliphorizontalregion(bmp: array,
         x1: int, y1: int,
         x2: int, y2: int):
@@ -8015,29 +9363,8 @@ def fliphorizontalregion(bmp: array,
         byref modified
         unsigned byte array
     """
-    def _24(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1 - 2: r], bmp[s2: e2 - 2: r], bmp[s1 + 1: e1 - 1: r], bmp[s2 + 1: e2 - 1: r], bmp[s1 + 2: e1: r], bmp[s2 + 2: e2: r] = \
-        bmp[s2: e2 - 2: r], bmp[s1: e1 - 2: r], bmp[s2 + 1: e2 - 1: r], bmp[s1 + 1: e1 - 1: r], bmp[s2 + 2: e2: r], bmp[s1 + 2: e1: r]
-
-    def _8(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1: r], bmp[s2: e2: r]= \
-        bmp[s2: e2: r], bmp[s1: e1: r]
-
-    def _4(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1: r], bmp[s2: e2: r] = \
-         flipnibbleinbuf(bmp[s2: e2: r]),  flipnibbleinbuf(bmp[s1: e1: r])
-
-    def _1(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1: r], bmp[s2: e2: r] = \
-        rotatebitsinbuf(bmp[s2: e2: r]), rotatebitsinbuf(bmp[s1: e1: r])
-
-    horizontalbulkswap(
-        bmp,
-        x1, y1, x2, y2,
-        {24: _24,
-          8: _8,
-          4: _4,
-          1: _1}[bmp[bmpcolorbits]])
+    horitransregion(bmp, x1, y1,
+                         x2, y2, 'F')
 
 
 def mirrorleftinregion(
@@ -8057,27 +9384,8 @@ def mirrorleftinregion(
         byref modified
         unsigned byte array
     """
-    def _24(bmp, s1, e1, s2, e2, r):
-        bmp[s2: e2 - 2: r], bmp[s2 + 1: e2 - 1: r], bmp[s2 + 2: e2: r]= \
-        bmp[s1: e1 - 2: r], bmp[s1 + 1: e1 - 1: r], bmp[s1 + 2: e1: r]
-
-    def _8(bmp, s1, e1, s2, e2, r):
-        bmp[s2: e2: r] = bmp[s1: e1: r]
-
-    def _4(bmp, s1, e1, s2, e2, r):
-        bmp[s2: e2: r] = \
-             flipnibbleinbuf(bmp[s1: e1: r])
-
-    def _1(bmp, s1, e1, s2, e2, r):
-        bmp[s2: e2: r] = \
-            rotatebitsinbuf(bmp[s1: e1: r])
-
-    horizontalbulkswap(bmp,
-        x1, y1, x2, y2,
-        {24: _24,
-          8: _8,
-          4: _4,
-          1: _1}[bmp[bmpcolorbits]])
+    horitransregion(bmp, x1, y1,
+                         x2, y2, 'L')
 
 
 def mirrorrightinregion(
@@ -8097,27 +9405,8 @@ def mirrorrightinregion(
         byref modified
         unsigned byte array
     """
-    def _24(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1 - 2: r], bmp[s1 + 1: e1 - 1: r], bmp[s1 + 2: e1: r]=\
-        bmp[s2: e2 - 2: r], bmp[s2 + 1: e2 - 1: r], bmp[s2 + 2: e2: r]
-
-    def _8(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1: r] = bmp[s2: e2: r]
-
-    def _4(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1: r] = \
-             flipnibbleinbuf(bmp[s2: e2: r])
-
-    def _1(bmp, s1, e1, s2, e2, r):
-        bmp[s1: e1: r] = \
-            rotatebitsinbuf(bmp[s2: e2: r])
-
-    horizontalbulkswap(
-        bmp, x1, y1, x2, y2,
-        {24: _24,
-          8: _8,
-          4: _4,
-          1: _1}[bmp[bmpcolorbits]])
+    horitransregion(bmp, x1, y1,
+                         x2, y2, 'R')
 
 
 def mirrorleft(bmp: array):
@@ -8341,42 +9630,72 @@ def fliphorizontal(bmp: array):
         getmaxy(bmp) - 1)
 
 
-def flipXY(bmp: array):
+def flipXY(bmp: array,
+        progress: Callable = None):
     """Flips the x and y coordinates of
         an in-memory bitmap for a
         90 degree rotation
 
     Args:
-        bmp: unsigned byte array
-             with bmp format
+        bmp     : unsigned byte array
+                  with bmp format
+        progress: progress reporter
+                  (default the one set
+                  by setprogressreporter)
 
     Returns:
         byref modified
         unsigned byte array
     """
-    mx = getmaxy(bmp)
-    my = getmaxx(bmp)
-    bits = bmp[bmpcolorbits]
-    nbmp = newBMP(mx, my, bits)
-    if bits in [8, 24]:
-        r = _xchrcnt(nbmp)
-        mx -= 1
-        if bits < 24:
-            copyRGBpal(bmp, nbmp)
-        offset = 0
-        for y in range(my):
-            BMPbitBLTput(nbmp,
-                offset,
-                array('B', vertBMPbitBLTget(bmp, y, 0, mx)))
-            offset += r
-    else:
+    (mx, my, bits, r, hd, _, _) = _bmpmeta(bmp)
+    nbmp = newBMP(my, mx, bits)
+    if bits < 24:
         copyRGBpal(bmp, nbmp)
-        for v in iterimagecolor(bmp,
-                    sysmsg['flipXY'], '*',
-                    sysmsg['done']):
-            plotxybit(nbmp, v[0][1],
-                            v[0][0],
-                            v[1])
+    report = getprogressreporter(progress)
+    if report is not None:
+        report(sysmsg['flipXY'], 0, my)
+    bpp = 3 if bits == 24 else 1
+    w = mx * bpp
+    if bits < 8:
+        # (x, y) -> (y, x)
+        (s0, ds) = (hd + (my - 1) * r, -r)
+    else:
+        # (x, y) -> (my - 1 - y, mx - 1 - x)
+        (s0, ds) = (hd, r)
+    cols = [bytearray() for _ in range(mx)]
+    band = max(_flipXYbandbytes // w, 1)
+    for y1 in range(0, my, band):
+        y2 = min(y1 + band, my)
+        buf = b''.join(bmp[s: s + w].tobytes()
+                if bits > 4 else
+                unpackrowindices(bmp[s: s + r], bits, mx)
+            for s in range(s0 + y1 * ds,
+                           s0 + y2 * ds, ds))
+        if bpp == 1:
+            for x in range(mx):
+                cols[x] += buf[x::w]
+        else:
+            n = 3 * (y2 - y1)
+            for x in range(mx):
+                c = bytearray(n)
+                i = 3 * x
+                c[0::3] = buf[i::w]
+                c[1::3] = buf[i + 1::w]
+                c[2::3] = buf[i + 2::w]
+                cols[x] += c
+        if report is not None:
+            for y in range(y1 + 1, min(y2, my - 1) + 1):
+                report('*', y, my)
+    (_, _, _, r, hd, _, _) = _bmpmeta(nbmp)
+    s = hd + (mx - 1) * r if bits < 8 else hd
+    ds = -r if bits < 8 else r
+    for c in cols:
+        if bits < 8:
+            c = packrowindices(c, bits)
+        nbmp[s: s + len(c)] = array('B', c)
+        s += ds
+    if report is not None:
+        report(sysmsg['done'], my, my)
     return nbmp
 
 
@@ -8433,19 +9752,10 @@ def crop(bmp: array, x1: int, y1: int,
     bits = bmp[bmpcolorbits]
     nbmp = newBMP(x2 - x1 + 1,
                   y2 - y1 + 1, bits)
-    if bits < 8:
+    if bits < 24:
         copyRGBpal(bmp, nbmp)
-        for v in itergetcolorfromrectregion(
-                    bmp, x1, y1, x2, y2):
-            intplotvecxypoint(nbmp,
-                subvect(v[0], (x1, y1)), v[1])
-    else:
-        offset = 0
-        r = _xchrcnt(nbmp)
-        for buf in itercopyrect(
-                        bmp, x1, y1, x2, y2):
-            BMPbitBLTput(nbmp, offset, buf)
-            offset += r
+    RegionView(bmp, x1, y1,
+        x2, y2).blit(nbmp, 0, 0)
     return nbmp
 
 
@@ -8472,11 +9782,11 @@ def invertregion(
     bits = bmp[bmpcolorbits]
     if bits < 8:
         c = getmaxcolors(bmp) - 1
-        for v in itergetcolorfromrectregion(
-                    bmp, x1, y1, x2, y2):
-            intplotvecxypoint(bmp,
-                v[0], getxybitvec(
-                        bmp, v[0]) ^ c)
+        pts = list(itergetcolorfromrectregion(
+                    bmp, x1, y1, x2, y2))
+        plotxybits(bmp, [v[0][0] for v in pts],
+                        [v[0][1] for v in pts],
+                        [v[1] ^ c for v in pts])
     else:
         offset = iif(bits == 24,
                     _24bmof(bmp, x1, y2),
@@ -8778,7 +10088,175 @@ def verticalbrightnessgradto24bitimage(
         getmaxy(bmp) - 1, lumrange)
 
 
-def plotmultifractal(bmp: array,
+def plotmultifractal(bmp: array,
+        x1: int, y1: int,
+        x2: int, y2: int,
+        d: float,
+        func: Callable,
+        domain: list[float, float, float, float],
+        RGBfactors: list[float, float, float],
+        maxiter: int):
+    """Draw a Multi Fractal
+
+    Args:
+        bmp           : unsigned
+                        byte array
+                        with bmp format
+        x1, y1, x2, y2: rectangular area
+                        to draw in
+        d             : power to raise z to
+        func          : fractal function
+        domain        : coordinates in real
+                        and imaginary plane
+        rgbfactors    : [r, g, b] values
+                        range from
+                        0.0 to 1.0
+        maxiter       : when to break
+                        color compute
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    maxcolors = getmaxcolors(bmp)
+    mcolor = maxcolors - 1
+    for (x, y, c) in func(x1, y1, x2, y2, d,
+                          domain, maxiter):
+        if bmp[bmpcolorbits] == 24:
+            c = colormix(((255 - c) * 20) % 256,
+                        RGBfactors)
+        else:
+            c = mcolor - c % maxcolors
+        plotxybit(bmp, x, y, c)
+
+
+def plotmultifractalcomplexpar(bmp: array,
+        x1: int, y1: int,
+        x2: int, y2: int,
+        c: complex,
+        d: float,
+        func: Callable,
+        domain: list[float, float, float, float],
+        RGBfactors: list[float, float, float],
+        maxiter: int):
+    """Draw a Multifractal with a comnplex parameter
+
+    Args:
+        bmp           : unsigned
+                        byte array
+                        with bmp format
+        x1, y1, x2, y2: rectangular area
+                        to draw in
+        c             : complex number
+        d             : power to raise z to
+        func          : fractal function
+        domain        : coordinates in real
+                        and imaginary plane
+        rgbfactors    : [r, g, b] values
+                        range from
+                        0.0 to 1.0
+        maxiter       : when to break
+                        color compute
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    maxcolors = getmaxcolors(bmp)
+    mcolor = maxcolors - 1
+    for (x, y, cl) in func(x1, y1, x2, y2, c, d,
+                           domain, maxiter):
+        if bmp[bmpcolorbits] == 24:
+            cl = colormix(((255 - cl) * 20) % 256,
+                        RGBfactors)
+        else:
+            cl = mcolor - cl % maxcolors
+        plotxybit(bmp, x, y, cl)
+
+
+def _fractalcolor(bmp: array, c: int,
+        RGBfactors: list[float, float, float]) -> int:
+    """Gets the color for an iteration
+    count of a fractal
+
+    Args:
+        bmp       : unsigned
+                    byte array
+                    with bmp format
+        c         : iteration count
+        rgbfactors: [r, g, b] values
+                    range from
+                    0.0 to 1.0
+
+    Returns:
+        int color
+    """
+    if bmp[bmpcolorbits] == 24:
+        return colormix(((255 - c) * 20) % 256,
+                    RGBfactors)
+    maxcolors = getmaxcolors(bmp)
+    return maxcolors - 1 - int(c) % maxcolors
+
+
+def _fractalcolorlut(bmp: array,
+        RGBfactors: list[float, float, float],
+        maxiter: int) -> dict:
+    """Precomputes the color for every
+    iteration count of a fractal
+
+    Args:
+        bmp       : unsigned
+                    byte array
+                    with bmp format
+        rgbfactors: [r, g, b] values
+                    range from
+                    0.0 to 1.0
+        maxiter   : when to break
+                    color compute
+
+    Returns:
+        dict of int colors keyed
+        by iteration count
+    """
+    return {c: _fractalcolor(bmp, c, RGBfactors)
+                for c in range(maxiter + 1)}
+
+
+def _fractalrowcolors(bmp: array,
+        row: list,
+        lut: dict,
+        RGBfactors: list[float, float, float]
+        ) -> list[int]:
+    """Maps a scanline of iteration
+    counts to colors
+
+    Args:
+        bmp       : unsigned
+                    byte array
+                    with bmp format
+        row       : [c, ...] iteration
+                    counts
+        lut       : dict made by
+                    _fractalcolorlut
+                    counts not found in
+                    it like the float
+                    values of multicircle
+                    are added to it
+        rgbfactors: [r, g, b] values
+                    range from
+                    0.0 to 1.0
+
+    Returns:
+        list of int colors
+    """
+    try:
+        return [lut[c] for c in row]
+    except KeyError:
+        for c in row:
+            if c not in lut:
+                lut[c] = _fractalcolor(bmp, c, RGBfactors)
+        return [lut[c] for c in row]
+
+
+def plotmultifractalrows(bmp: array,
         x1: int, y1: int,
         x2: int, y2: int,
         d: float,
@@ -8786,7 +10264,7 @@ def plotmultifractal(bmp: array,
         domain: list[float, float, float, float],
         RGBfactors: list[float, float, float],
         maxiter: int):
-    """Draw a Multi Fractal
+    """Draw a Multi Fractal a scanline at a time
 
     Args:
         bmp           : unsigned
@@ -8795,7 +10273,8 @@ def plotmultifractal(bmp: array,
         x1, y1, x2, y2: rectangular area
                         to draw in
         d             : power to raise z to
-        func          : fractal function
+        func          : fractal scanline function
+                        like multibrotrows
         domain        : coordinates in real
                         and imaginary plane
         rgbfactors    : [r, g, b] values
@@ -8807,19 +10286,15 @@ def plotmultifractal(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    maxcolors = getmaxcolors(bmp)
-    mcolor = maxcolors - 1
-    for (x, y, c) in func(x1, y1, x2, y2, d,
-                          domain, maxiter):
-        if bmp[bmpcolorbits] == 24:
-            c = colormix(((255 - c) * 20) % 256,
-                        RGBfactors)
-        else:
-            c = mcolor - c % maxcolors
-        plotxybit(bmp, x, y, c)
+    lut = _fractalcolorlut(bmp, RGBfactors, maxiter)
+    for (x, y, row) in itermultifractalrows(
+            x1, y1, x2, y2, d, func, domain,
+            maxiter, getmaxxy(bmp)):
+        plotxyrow(bmp, x, y,
+            _fractalrowcolors(bmp, row, lut, RGBfactors))
 
 
-def plotmultifractalcomplexpar(bmp: array,
+def plotmultifractalcomplexparrows(bmp: array,
         x1: int, y1: int,
         x2: int, y2: int,
         c: complex,
@@ -8828,7 +10303,8 @@ def plotmultifractalcomplexpar(bmp: array,
         domain: list[float, float, float, float],
         RGBfactors: list[float, float, float],
         maxiter: int):
-    """Draw a Multifractal with a comnplex parameter
+    """Draw a Multifractal with a complex
+    parameter a scanline at a time
 
     Args:
         bmp           : unsigned
@@ -8838,7 +10314,8 @@ def plotmultifractalcomplexpar(bmp: array,
                         to draw in
         c             : complex number
         d             : power to raise z to
-        func          : fractal function
+        func          : fractal scanline function
+                        like multijuliarows
         domain        : coordinates in real
                         and imaginary plane
         rgbfactors    : [r, g, b] values
@@ -8850,16 +10327,213 @@ def plotmultifractalcomplexpar(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
+    lut = _fractalcolorlut(bmp, RGBfactors, maxiter)
+    for (x, y, row) in itermultifractalcomplexparrows(
+            x1, y1, x2, y2, c, d, func, domain,
+            maxiter, getmaxxy(bmp)):
+        plotxyrow(bmp, x, y,
+            _fractalrowcolors(bmp, row, lut, RGBfactors))
+
+
+def plotfractaltiles(bmp: array,
+        x: int, y: int,
+        zoom: int,
+        d: any,
+        func: Callable,
+        domain: list[float, float, float, float],
+        RGBfactors: list[float, float, float],
+        maxiter: int,
+        c: complex = None,
+        basesize: int = 256,
+        cache: FractalTileCache = None):
+    """Fills a bitmap with a view of a
+    fractal made from cached tiles so
+    panning, drawing the view again
+    and raising maxiter reuse the
+    iterations done before
+
+    Args:
+        bmp       : unsigned
+                    byte array
+                    with bmp format
+        x, y      : top left pixel of
+                    the view on the
+                    grid of the zoom
+                    level
+        zoom      : zoom level (the
+                    real axis of the
+                    domain spans
+                    basesize * 2 ** zoom
+                    pixels)
+        d         : power to raise z to
+        func      : fractal scanline function
+                    like multibrotrows
+        domain    : coordinates in real
+                    and imaginary plane
+        rgbfactors: [r, g, b] values
+                    range from
+                    0.0 to 1.0
+        maxiter   : when to break
+                    color compute
+        c         : complex number for
+                    functions like
+                    multijuliarows
+        basesize  : pixels the real axis
+                    spans at zoom 0
+        cache     : FractalTileCache
+                    (default the one set
+                    by setfractaltilecache)
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    lut = _fractalcolorlut(bmp, RGBfactors, maxiter)
+    (mx, my) = getmaxxy(bmp)
+    for (_, r, row) in itertiledfractalrows(
+            x, y, mx, my, zoom, d, func, domain,
+            maxiter, c, basesize, cache):
+        plotxyrow(bmp, 0, r,
+            _fractalrowcolors(bmp, row, lut, RGBfactors))
+
+
+def mandelbrottiles(bmp: array,
+        x: int, y: int,
+        zoom: int,
+        domain: list[float, float, float, float],
+        RGBfactors: list[float, float, float],
+        maxiter: int,
+        cache: FractalTileCache = None):
+    """Fills a bitmap with a view of
+    a Mandelbrot set made from
+    cached tiles
+
+    Args:
+        bmp       : unsigned
+                    byte array
+                    with bmp format
+        x, y      : top left pixel of
+                    the view on the
+                    grid of the zoom
+                    level
+        zoom      : zoom level
+        domain    : coordinates in real
+                    and imaginary plane
+        rgbfactors: [r, g, b] values
+                    range from
+                    0.0 to 1.0
+        maxiter   : when to break
+                    color compute
+        cache     : FractalTileCache
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    plotfractaltiles(bmp, x, y, zoom, 2,
+        multibrotrows, domain, RGBfactors,
+        maxiter, cache=cache)
+
+
+def juliatiles(bmp: array,
+        x: int, y: int,
+        zoom: int,
+        c: complex,
+        domain: list[float, float, float, float],
+        RGBfactors: list[float, float, float],
+        maxiter: int,
+        cache: FractalTileCache = None):
+    """Fills a bitmap with a view of
+    a Julia set made from cached tiles
+
+    Args:
+        bmp       : unsigned
+                    byte array
+                    with bmp format
+        x, y      : top left pixel of
+                    the view on the
+                    grid of the zoom
+                    level
+        zoom      : zoom level
+        c         : complex number
+        domain    : coordinates in real
+                    and imaginary plane
+        rgbfactors: [r, g, b] values
+                    range from
+                    0.0 to 1.0
+        maxiter   : when to break
+                    color compute
+        cache     : FractalTileCache
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    plotfractaltiles(bmp, x, y, zoom, 2,
+        multijuliarows, domain, RGBfactors,
+        maxiter, c, cache=cache)
+
+
+def _plotnewtonsfractalrows(bmp: array,
+        rows: list,
+        RGBfactorslist: list[list[float, float, float]]
+        ) -> list:
+    """Colors the scanlines of a
+    Newtons Fractal by root
+
+    Args:
+        bmp           : unsigned
+                        byte array
+                        with bmp format
+        rows          : [(x, y, [(root, c), ...]), ...]
+                        from itermultifractalrows
+                        with newtonrows
+        rgbfactorslist: [[r, g, b],...] values
+                        range from 0.0 to 1.0
+
+    Returns:
+        byref modified unsigned byte array
+        list of roots
+    """
+    tol = 10e-3
     maxcolors = getmaxcolors(bmp)
     mcolor = maxcolors - 1
-    for (x, y, cl) in func(x1, y1, x2, y2, c, d,
-                           domain, maxiter):
-        if bmp[bmpcolorbits] == 24:
-            cl = colormix(((255 - cl) * 20) % 256,
-                        RGBfactors)
-        else:
-            cl = mcolor - cl % maxcolors
-        plotxybit(bmp, x, y, cl)
+    bits = bmp[bmpcolorbits]
+    roots = []
+    rootindex = {}
+    colors = {}
+    # roots are numbered in the order a column by
+    # column scan finds them
+    for i in range(len(rows[0][2]) if rows else 0):
+        for (_, _, row) in rows:
+            rt = row[i][0]
+            if rt != None and rt not in rootindex:
+                for (j, tst_rt) in enumerate(roots):
+                    if abs(tst_rt - rt) < tol:
+                        rootindex[rt] = j
+                        break
+                else:
+                    rootindex[rt] = len(roots)
+                    roots.append(rt)
+    for (x, y, row) in rows:
+        i = 0
+        n = len(row)
+        while i < n:
+            if row[i][0] == None:
+                i += 1
+                continue
+            run = []
+            while i < n and row[i][0] != None:
+                (rt, c) = row[i]
+                k = (rootindex[rt], c)
+                if k not in colors:
+                    if bits == 24:
+                        colors[k] = colormix(
+                            ((255 - c) * 20) % 256,
+                            RGBfactorslist[k[0]])
+                    else:
+                        colors[k] = mcolor - c % maxcolors
+                run.append(colors[k])
+                i += 1
+            plotxyrow(bmp, x + i - len(run), y, run)
+    return roots
 
 
 def newtonsfractal(bmp: array,
@@ -8890,29 +10564,10 @@ def newtonsfractal(bmp: array,
         byref modified unsigned byte array
         list of roots
     """
-    tol = 10e-3
-    maxcolors = getmaxcolors(bmp)
-    mcolor = maxcolors - 1
-    roots = []
-    for (x, y, r) in iternewtonsfractal(x1, y1,
-                     x2, y2, d, domain, maxiter):
-        rt, c = r
-        if rt != None:
-            flag = False
-            for tst_rt in roots:
-                if abs(tst_rt - rt) < tol:
-                    rt = tst_rt
-                    flag = True
-                    break
-            if not flag:
-                roots.append(rt)
-            if bmp[bmpcolorbits] == 24:
-                c = colormix(((255 - c) * 20) % 256,
-                    RGBfactorslist[roots.index(rt)])
-            else:
-                c = mcolor - c % maxcolors
-            plotxybit(bmp, x, y, c)
-    return roots
+    return _plotnewtonsfractalrows(bmp,
+        list(itermultifractalrows(x1, y1, x2, y2,
+            d, newtonrows, domain, maxiter)),
+        RGBfactorslist)
 
 
 def mandelbrot(bmp: array,
@@ -8940,8 +10595,8 @@ def mandelbrot(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, 2,
-        itermultibrot, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, 2,
+        multibrotrows, domain,
         RGBfactors, maxiter)
 
 
@@ -8972,8 +10627,8 @@ def multibrot(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        itermultibrot, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        multibrotrows, domain,
         RGBfactors, maxiter)
 
 
@@ -9004,8 +10659,8 @@ def multicircle(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        itermulticircle, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        multicirclerows, domain,
         RGBfactors, maxiter)
 
 
@@ -9036,8 +10691,8 @@ def xorfractal(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        iterxorfractal, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        xorrows, domain,
         RGBfactors, maxiter)
 
 
@@ -9068,8 +10723,8 @@ def xordivfractal(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        iterxordivfractal, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        xordivrows, domain,
         RGBfactors, maxiter)
 
 
@@ -9100,8 +10755,8 @@ def tetrationfractal(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        itertetration, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        tetrationrows, domain,
         RGBfactors, maxiter)
 
 
@@ -9132,8 +10787,8 @@ def sinjulia(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, c,
-        itersinjulia, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, c,
+        sinjuliarows, domain,
         RGBfactors, maxiter)
 
 
@@ -9164,8 +10819,8 @@ def cosjulia(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, c,
-        itercosjulia, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, c,
+        cosjuliarows, domain,
         RGBfactors, maxiter)
 
 
@@ -9196,8 +10851,8 @@ def spiraljulia(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, c,
-        iterspiraljulia, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, c,
+        spiraljuliarows, domain,
         RGBfactors, maxiter)
 
 
@@ -9228,8 +10883,8 @@ def lambdafractal(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, c,
-        iterlamdbafractal, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, c,
+        lambdarows, domain,
         RGBfactors, maxiter)
 
 
@@ -9241,7 +10896,8 @@ def savelambdafractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Lambda fractal to a file
 
     Args:
@@ -9261,6 +10917,9 @@ def savelambdafractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9273,7 +10932,8 @@ def savelambdafractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -9284,7 +10944,8 @@ def savetetrationfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Tetration Fractal to a file
 
     Args:
@@ -9304,6 +10965,9 @@ def savetetrationfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9316,7 +10980,8 @@ def savetetrationfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -9327,7 +10992,8 @@ def savexorfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Xor Fractal to a file
 
     Args:
@@ -9347,6 +11013,9 @@ def savexorfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9359,7 +11028,8 @@ def savexorfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -9370,7 +11040,8 @@ def savexordivfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Xor int div Fractal to a file
 
     Args:
@@ -9390,6 +11061,9 @@ def savexordivfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9402,7 +11076,8 @@ def savexordivfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -9413,7 +11088,8 @@ def savesinjulia2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Sin(z) Julia Set to a file
 
     Args:
@@ -9433,6 +11109,9 @@ def savesinjulia2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9445,7 +11124,8 @@ def savesinjulia2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -9456,7 +11136,8 @@ def savespiraljulia2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Spiral Julia Set to a file
 
     Args:
@@ -9476,6 +11157,9 @@ def savespiraljulia2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9488,7 +11172,8 @@ def savespiraljulia2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -9499,7 +11184,8 @@ def savecosjulia2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Cos(z) Julia Set to a file
 
     Args:
@@ -9519,6 +11205,9 @@ def savecosjulia2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9531,7 +11220,8 @@ def savecosjulia2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 def julia(bmp: array,
@@ -9561,8 +11251,8 @@ def julia(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractalcomplexpar(bmp, x1, y1, x2, y2, c, 2,
-        itermultijulia, domain,
+    plotmultifractalcomplexparrows(bmp, x1, y1, x2, y2, c, 2,
+        multijuliarows, domain,
         RGBfactors, maxiter)
 
 
@@ -9595,8 +11285,8 @@ def multijulia(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractalcomplexpar(bmp, x1, y1, x2, y2, c, d,
-        itermultijulia, domain,
+    plotmultifractalcomplexparrows(bmp, x1, y1, x2, y2, c, d,
+        multijuliarows, domain,
         RGBfactors, maxiter)
 
 
@@ -9625,8 +11315,8 @@ def tricorn(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, 2,
-        itermulticorn, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, 2,
+        multicornrows, domain,
         RGBfactors, maxiter)
 
 
@@ -9657,8 +11347,8 @@ def multicorn(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        itermulticorn, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        multicornrows, domain,
         RGBfactors, maxiter)
 
 
@@ -9689,8 +11379,8 @@ def barnsleytree(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        iterbarnsleytree, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        barnsleytreerows, domain,
         RGBfactors, maxiter)
 
 
@@ -9721,8 +11411,8 @@ def marekdragon(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    plotmultifractal(bmp, x1, y1, x2, y2, d,
-        itermarekdragon, domain,
+    plotmultifractalrows(bmp, x1, y1, x2, y2, d,
+        marekdragonrows, domain,
         RGBfactors, maxiter)
 
 
@@ -9753,10 +11443,11 @@ def IFS(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    for (px, py) in iterIFS(IFStransparam,
+    pts = list(iterIFS(IFStransparam,
         x1, y1, x2, y2, xscale, yscale,
-        xoffset, yoffset, maxiter):
-        plotxybit(bmp, px, py, color)
+        xoffset, yoffset, maxiter))
+    plotxybits(bmp, [p[0] for p in pts],
+                    [p[1] for p in pts], color)
 
 
 def plotflower(bmp: array,
@@ -9786,13 +11477,161 @@ def plotflower(bmp: array,
     maxcolors = getmaxcolors(bmp)
     mcolor = maxcolors - 1
     lum1, dlum = range2baseanddelta(lumrange)
-    for (x, y) in iterflower(cx, cy, r, petals, angrot):
+    pts = list(iterflower(cx, cy, r, petals, angrot))
+    clist = []
+    for (x, y) in pts:
         c = colormix(setmax(abs(int(lum1 + dlum * (distance([x, y], [cx, cy]) / r))),255), RGBfactors)
         if bmp[bmpcolorbits] != 24:
             c = mcolor - c % maxcolors
-        plotxybit(bmp, x, y, c)
+        clist.append(c)
+    plotxybits(bmp, [p[0] for p in pts],
+                    [p[1] for p in pts], clist)
+
+
+_fractaljob = None
+
+
+def _setfractaljob(job: tuple):
+    """Hands a fractal job to
+    a worker process
+
+    Args:
+        job: (f, x, y, bitdepth,
+              args, shared memory name)
+    """
+    global _fractaljob
+    _fractaljob = job
+
+
+def _fractalband(ys: int, ye: int):
+    """Renders a band of rows of the
+    fractal job of a worker process
+
+    Args:
+        ys, ye: rows ys to ye - 1
+                are rendered
+
+    Returns:
+        the scanlines of a Newtons Fractal
+        or None if the band was written
+        to shared memory else the offset
+        and bytes of the band
+    """
+    (f, x, y, bits, args, shmname) = _fractaljob
+    if f == newtonsfractal:
+        # roots are numbered over the whole
+        # bitmap so only the iterations are
+        # done here
+        (d, domain, _, maxiter) = args
+        return [(rx, ry + ys, row) for (rx, ry, row) in
+                itermultifractalrows(0, -ys, x, y - ys,
+                    d, newtonrows, domain, maxiter,
+                    (x, ye - ys))]
+    band = newBMP(x, ye - ys, bits)
+    f(band, 0, -ys, x, y - ys, *args)
+    buf = band[_hdsz(band):]
+    s = (y - ye) * _xbytes(x, bits)
+    if shmname is None:
+        return (s, buf.tobytes())
+    shm = SharedMemory(shmname)
+    shm.buf[s: s + len(buf)] = buf
+    shm.close()
+
 
+def _newfractalpool(workers: int, job: tuple):
+    """Makes a process pool whose
+    workers all get a fractal job
 
+    Args:
+        workers: number of processes
+        job    : see _setfractaljob
+
+    Returns:
+        ProcessPoolExecutor or None if
+        the job can not be sent to
+        a worker process
+    """
+    if 'fork' in get_all_start_methods():
+        ctx = get_context('fork')
+    else:
+        try:
+            dumps(job)
+        except Exception:
+            return None
+        ctx = get_context()
+    return ProcessPoolExecutor(workers,
+            mp_context=ctx,
+            initializer=_setfractaljob,
+            initargs=(job,))
+
+
+def plotfractalinparallel(bmp: array,
+        f: Callable,
+        args: tuple,
+        workers: int = 0):
+    """Draws a fractal over a whole
+    bitmap in bands of rows that
+    are rendered by worker processes
+
+    Args:
+        bmp    : unsigned
+                 byte array
+                 with bmp format
+        f      : fractal function
+                 like mandelbrot
+        args   : parameters of f
+                 after x1, y1, x2, y2
+        workers: number of worker
+                 processes
+                 0 for one per cpu
+                 1 draws without
+                 worker processes
+
+    Returns:
+        byref modified unsigned byte array
+        and the return value of f
+    """
+    (x, y) = getmaxxy(bmp)
+    workers = min(workers or cpu_count() or 1, y)
+    if workers < 2:
+        return f(bmp, 0, 0, x, y, *args)
+    n = min(y, workers * 4)
+    bands = [(y * i // n, y * (i + 1) // n)
+                for i in range(n)]
+    hd = _hdsz(bmp)
+    shm = None
+    if SharedMemory is not None and f != newtonsfractal:
+        shm = SharedMemory(create=True, size=len(bmp) - hd)
+    job = (f, x, y, bmp[bmpcolorbits], args,
+           None if shm is None else shm.name)
+    pool = _newfractalpool(workers, job)
+    if pool is None:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        return f(bmp, 0, 0, x, y, *args)
+    try:
+        with pool:
+            results = list(pool.map(_fractalband,
+                *zip(*bands)))
+        if f == newtonsfractal:
+            return _plotnewtonsfractalrows(bmp,
+                [r for rows in results for r in rows],
+                args[2])
+        for r in results:
+            if r is not None:
+                (s, buf) = r
+                bmp[hd + s: hd + s + len(buf)] = \
+                    array('B', buf)
+        if shm is not None:
+            memoryview(bmp)[hd:] = shm.buf[:len(bmp) - hd]
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+@functimer
 def savefractal2file(
         file: str,
         x: int, y: int,
@@ -9800,7 +11639,8 @@ def savefractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Fractal to a file
 
     Args:
@@ -9820,16 +11660,20 @@ def savefractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
     """
     bmp = newBMP(x, y, bitdepth)
-    f(bmp, 0, 0, x, y,
-    domain, rgbfactors, maxiter)
+    plotfractalinparallel(bmp, f,
+        (domain, rgbfactors, maxiter), workers)
     saveBMP(file, bmp)
 
 
+@functimer
 def savemultifractal2file(
         file: str,
         x: int, y: int,
@@ -9838,7 +11682,8 @@ def savemultifractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Multi Fractal to a file
 
     Args:
@@ -9859,13 +11704,16 @@ def savemultifractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
     """
     bmp = newBMP(x, y, bitdepth)
-    f(bmp, 0, 0, x, y, d,
-    domain, rgbfactors, maxiter)
+    plotfractalinparallel(bmp, f,
+        (d, domain, rgbfactors, maxiter), workers)
     saveBMP(file, bmp)
 
 
@@ -9876,7 +11724,8 @@ def savemandelbrotfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Mandelbrot Fractal to a file
 
     Args:
@@ -9895,6 +11744,9 @@ def savemandelbrotfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9906,7 +11758,8 @@ def savemandelbrotfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -9917,7 +11770,8 @@ def savemultibrotfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Multibrot Fractal to a file
 
     Args:
@@ -9937,6 +11791,9 @@ def savemultibrotfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9949,7 +11806,8 @@ def savemultibrotfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 
@@ -9961,7 +11819,8 @@ def savemulticirclefractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Multicircle Fractal to a file
 
     Args:
@@ -9981,6 +11840,9 @@ def savemulticirclefractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -9993,7 +11855,8 @@ def savemulticirclefractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -10003,7 +11866,8 @@ def savetricornfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Tricorn Fractal to a file
 
     Args:
@@ -10022,6 +11886,9 @@ def savetricornfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -10033,7 +11900,8 @@ def savetricornfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -10044,7 +11912,8 @@ def savemulticornfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Multicorn Fractal to a file
 
     Args:
@@ -10064,6 +11933,9 @@ def savemulticornfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -10076,7 +11948,8 @@ def savemulticornfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -10087,7 +11960,8 @@ def savebarnsleytreefractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Barnsley Tree Fractal to a file
 
     Args:
@@ -10107,6 +11981,9 @@ def savebarnsleytreefractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -10119,7 +11996,8 @@ def savebarnsleytreefractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -10130,7 +12008,8 @@ def savemarekdragon2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Marek Dragon Fractal to a file
 
     Args:
@@ -10150,6 +12029,9 @@ def savemarekdragon2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -10162,9 +12044,11 @@ def savemarekdragon2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
+@functimer
 def savefractalwithparam2file(
         file: str,
         x: int, y: int,
@@ -10173,7 +12057,8 @@ def savefractalwithparam2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Fractal with a parameter to a file
 
     Args:
@@ -10194,13 +12079,16 @@ def savefractalwithparam2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
     """
     bmp = newBMP(x, y, bitdepth)
-    retval = f(bmp, 0, 0, x, y, p,
-    domain, rgbfactors, maxiter)
+    retval = plotfractalinparallel(bmp, f,
+        (p, domain, rgbfactors, maxiter), workers)
     saveBMP(file, bmp)
     return retval
 
@@ -10213,7 +12101,8 @@ def savejuliafractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Julia Fractal to a file
 
     Args:
@@ -10233,6 +12122,9 @@ def savejuliafractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -10245,7 +12137,8 @@ def savejuliafractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -10257,7 +12150,8 @@ def savemultijuliafractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Multi Julia Fractal to a file
 
     Args:
@@ -10278,13 +12172,16 @@ def savemultijuliafractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
     """
     bmp = newBMP(x, y, bitdepth)
-    multijulia(bmp, 0, 0, x, y, c, d,
-    domain, rgbfactors, maxiter)
+    plotfractalinparallel(bmp, multijulia,
+        (c, d, domain, rgbfactors, maxiter), workers)
     saveBMP(file, bmp)
 
 
@@ -10296,7 +12193,8 @@ def savenewtonsfractal2file(
         domain: list[float, float, float, float],
         rgbfactors: list[float, float, float],
         bitdepth: int = 24,
-        maxiter: int = 255):
+        maxiter: int = 255,
+        workers: int = 1):
     """Saves a Newtons Fractal to a file
 
     Args:
@@ -10317,6 +12215,9 @@ def savenewtonsfractal2file(
                   (1, 4, 8, 24) bits
         maxiter : optional parameter
                   to set maximum iteration
+        workers : optional number of
+                  worker processes
+                  0 for one per cpu
 
     Returns:
         a bitmap file
@@ -10329,7 +12230,8 @@ def savenewtonsfractal2file(
         domain,
         rgbfactors,
         bitdepth,
-        maxiter)
+        maxiter,
+        workers)
 
 
 @functimer
@@ -10510,17 +12412,19 @@ def piechart(bmp: array,
 
     """
     alist, big = genpiechartdata(dataandcolorlist)
-    if big > -1: #for speed more computions in drawarc
-            circle(bmp, x, y, r,
-                alist[big][2], True)
-    for a in alist:
-        if a[4] < 50:
-            drawarc(bmp, x, y, r,
-                a[0], a[1], a[2],
-                True, a[2], True)
+    if alist == []:
+        return [alist, big]
+    spans = [[] for a in alist]
+    for s in itersectorspans(x, y, r,
+            [a[0] for a in alist] + [alist[-1][1]],
+            *getmaxxy(bmp)):
+        spans[s[3]].append(s[:3])
+    for (a, s) in zip(alist, spans):
+        fillspans(bmp, s, a[2])
     return [alist, big]
 
 
+@functimer
 @func24bitonlyandentirerectinboundary
 def _usebyrefnopar24bitfn2reg(
         bmp: array, x1: int, y1: int,
@@ -10552,6 +12456,7 @@ def _usebyrefnopar24bitfn2reg(
         offset += r
 
 
+@functimer
 @func24bitonlyandentirerectinboundary
 def _usebyref24btfn2reg(bmp: array,
         x1: int, y1: int,
@@ -10585,6 +12490,7 @@ def _usebyref24btfn2reg(bmp: array,
         offset += r
 
 
+@functimer
 @func24bitonlyandentirerectinboundary
 def _use24bitfn2reg(bmp: array,
         x1: int, y1: int,
@@ -10691,11 +12597,42 @@ def horizontalbrightnessgradto24bitregion(
         l += dl
 
 
+def _pastecircspans(bmp: array,
+        x: int, y: int, r: int,
+        spans: dict):
+    """Pastes rows of pixels into the
+        lines of a circular region
+        in a 24-bit bitmap
+
+    Args:
+        bmp    : unsigned byte array
+                 with 24-bit bmp format
+        x, y, r: center (x, y)
+                 and radius r
+        spans  : {y: unsigned byte array
+                  of the BGR pixels from
+                  x - r to x + r - 1}
+
+    Returns:
+        byref modified unsigned byte array
+    """
+    (_, my, _, w, hd, _, _) = _bmpmeta(bmp)
+    s0 = hd + 3 * (x - r)
+    for (v0, v1) in itercirclepartlineedge(r):
+        (i, j) = (3 * (r - v0), 3 * (r + v0))
+        for Y in mirror(y, v1):
+            s = s0 + (my - 1 - Y) * w
+            bmp[s + i: s + j] = spans[Y][i: j]
+
+
 @func24bitonlyandentirecircleinboundary
 def magnifyNtimescircregion(bmp: array,
         x: int, y: int, r: int, n: int):
     """Magnify a circular region in a bitmap file by int n
 
+    Only the rows of the region are read
+    and each one is magnified once
+
     Args:
         bmp    : unsigned byte array
                  with bmp format
@@ -10707,17 +12644,22 @@ def magnifyNtimescircregion(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    nx = x * n
-    ny = y * n
-    b = resizeNtimesbigger(bmp, n)
-    c = _BMoffsethd
-    for (v0, v1) in itercirclepartlineedge(r):
-        x1, x2 = mirror(x, v0)
-        y1, y2 = mirror(y, v1)
-        x3, x4 = mirror(nx, v0)
-        y3, y4 = mirror(ny, v1)
-        bmp[c(bmp, x1, y1): c(bmp, x2, y1)], bmp[c(bmp, x1, y2): c(bmp, x2, y2)] = \
-        b[c(b, x3, y3): c(b, x4, y3)], b[c(b, x3, y4): c(b, x4, y4)]
+    if r < 1:
+        return
+    (_, my, _, w, hd, _, _) = _bmpmeta(bmp)
+    xs = [3 * ((X - x) // n + r)
+          for X in range(x - r, x + r)]
+    rows = {}
+    spans = {}
+    for Y in range(y - r, y + r + 1):
+        sy = y + (Y - y) // n
+        if sy not in rows:
+            s = hd + (my - 1 - sy) * w + 3 * (x - r)
+            src = bmp[s: s + 6 * r].tobytes()
+            rows[sy] = array('B', b''.join(
+                src[i: i + 3] for i in xs))
+        spans[Y] = rows[sy]
+    _pastecircspans(bmp, x, y, r, spans)
 
 
 @func24bitonlyandentirecircleinboundary
@@ -10725,6 +12667,12 @@ def pixelizenxncircregion(bmp: array,
         x: int, y: int, r: int, n: int):
     """Pixelize a circular region in a BMP by n
 
+    The n by n areas are laid out like
+    the ones of pixelizenxn but only
+    the areas under the region are
+    averaged (areas cut by the edge of
+    the bitmap average what is left)
+
     Args:
         bmp    : unsigned byte array
                  with bmp format
@@ -10736,13 +12684,32 @@ def pixelizenxncircregion(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    b = pixelizenxn(bmp, n)
-    c = _BMoffsethd
-    for (v0, v1) in itercirclepartlineedge(r):
-        x1, x2 = mirror(x, v0)
-        y1, y2 = mirror(y, v1)
-        bmp[c(bmp, x1, y1): c(bmp, x2, y1)], bmp[c(bmp, x1, y2): c(bmp,x2,y2)]= \
-        b[c(b, x1, y1): c(b, x2, y1)], b[c(b, x1, y2): c(b, x2, y2)]
+    if r < 1:
+        return
+    (mx, my, _, w, hd, _, _) = _bmpmeta(bmp)
+    off = my % n
+    x1 = (x - r) // n * n
+    x2 = min(((x + r - 1) // n + 1) * n, mx)
+    (i, j) = (3 * (x - r - x1), 3 * (x + r - x1))
+    rows = {}
+    spans = {}
+    for Y in range(y - r, y + r + 1):
+        by = Y // n * n + off
+        if by not in rows:
+            ys = range(min(by, my - 1), min(by + n, my))
+            acc = [sum(v) for v in zip(*[bmp[s: s + 3 * (x2 - x1)]
+                   for s in (hd + (my - 1 - sy) * w + 3 * x1
+                             for sy in ys)])]
+            row = array('B')
+            for k in range(0, x2 - x1, n):
+                e = min(k + n, x2 - x1)
+                m = len(ys) * (e - k)
+                f = 1 / n ** 2 if m == n * n else 1 / m
+                row += array('B', [round(sum(acc[3 * k + ch: 3 * e: 3]) * f)
+                                   for ch in range(3)] * (e - k))
+            rows[by] = row[i: j]
+        spans[Y] = rows[by]
+    _pastecircspans(bmp, x, y, r, spans)
 
 
 @func24bitonly
@@ -10788,11 +12755,65 @@ def resizeNtimessmaller(
     return nbmp
 
 
+def resize(bmp: array,
+        newx: int, newy: int,
+        filter: str = 'bicubic') -> array:
+    """Resize a whole image to any size
+        with a resampling filter
+
+    Args:
+        bmp       : unsigned byte array
+                    with bmp format
+        newx, newy: new size
+        filter    : 'box'      -> average
+                                  of the
+                                  pixels
+                                  covered
+                    'bilinear' -> tent
+                    'bicubic'  -> sharper
+                    'lanczos'  -> sharpest
+                                  (3 lobes)
+
+    Returns:
+        unsigned byte array with
+        bitmap layout (1, 4 and
+        8-bit images are resampled
+        in 24-bit color and matched
+        back to their palette)
+    """
+    if filter not in resamplefilters:
+        print(sysmsg['invalidfilter'])
+        return None
+    if newx < 1 or newy < 1:
+        print(sysmsg['invalidsize'])
+        return None
+    (mx, my, bits, _, _, _, _) = _bmpmeta(bmp)
+    nbmp = newBMP(newx, newy, bits)
+    rows = resampleBGRrows(_iterBGRrowsdown(bmp),
+                mx, my, newx, newy, filter)
+    if bits < 24:
+        copyRGBpal(bmp, nbmp)
+        rows = quantizeBGRbufs(rows, newx,
+                    getallRGBpal(nbmp), bits)
+    (_, _, _, stride, hdsz, _, _) = _bmpmeta(nbmp)
+    s = hdsz + (newy - 1) * stride
+    for buf in rows:
+        nbmp[s: s + len(buf)] = array('B', buf)
+        s -= stride
+    return nbmp
+
+
+@func24bitonly
 def pixelizenxn(bmp: array,
         n: int) -> array:
     """Pixelize a whole image with n by n areas
     in which colors are averaged
 
+    Each n rows are averaged and
+    widened back as they are read
+    instead of making an n times
+    smaller copy first
+
     Args:
         bmp: unsigned byte array
              with bmp format
@@ -10801,8 +12822,28 @@ def pixelizenxn(bmp: array,
     Returns:
         byref modified unsigned byte array
     """
-    return resizeNtimesbigger(
-           resizeNtimessmaller(bmp, n), n)
+    (mx, my) = getmaxxy(bmp)
+    (nx, ny) = (mx // n, my // n)
+    nbmp = newBMP(nx * n, ny * n, 24)
+    w = 3 * nx
+    r = _xchrcnt(nbmp)
+    offset = _BMoffset(nbmp, 0, ny * n - 1)
+    bufl = []
+    for buf in itercopyrect(bmp,
+                    0, 0, mx - 1, my - 1):
+        if ny == 0:
+            break
+        bufl.append(buf)
+        if len(bufl) == n:
+            sbuf = resizesmaller24bitbuf(bufl)[:w]
+            sbuf += array('B', [0] * (w - len(sbuf)))
+            nbuf = resizebufNtimesbigger(sbuf, n, 24)
+            for _ in range(n):
+                BMPbitBLTput(nbmp, offset, nbuf)
+                offset += r
+            bufl = []
+            ny -= 1
+    return nbmp
 
 
 def adjustcolordicttopal(
@@ -10871,18 +12912,14 @@ def _cmpimglines(bmp: array,
         x1: int, y1: int,
         x2: int, y2: int,
         func: Callable):
-    offset = _BMoffset(bmp, x1, y2)
-    r = _xchrcnt(bmp)
-    oldbuf = []
-    for buf in itercopyrect(
-                    bmp, x1, y1, x2, y2):
-        if oldbuf != []:
-            BMPbitBLTput(bmp,
-                offset, array('B', func(buf, oldbuf)))
-            offset += r
+    n = adjustxbufsize(bmp, x1, x2)
+    v = RegionView(bmp, x1, y1, x2, y2)
+    oldbuf = v[-1][:n].tobytes()
+    for i in range(len(v) - 2, -1, -1):
+        buf = v[i][:n].tobytes()
+        v[i + 1][:n] = bytes(func(buf, oldbuf))
         oldbuf = buf
-    BMPbitBLTput(bmp, offset,
-        array('B', func(buf, oldbuf)))
+    v[0][:n] = bytes(func(oldbuf, oldbuf))
 
 
 def outlineregion(bmp: array,
@@ -10991,6 +13028,7 @@ def fern(bmp: array, x1: int, y1: int,
         color, 100000)
 
 
+@functimer
 @checklink
 def _usebyreffnwithpar2regnsv(
         ExistingBMPfile: str,
@@ -11024,6 +13062,7 @@ def _usebyreffnwithpar2regnsv(
      ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _use24btbyrefclrfn2regnsv(
         ExistingBMPfile: str,
@@ -11062,6 +13101,7 @@ def _use24btbyrefclrfn2regnsv(
           ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usebyref24btfn2regnsv(
         ExistingBMPfile: str,
@@ -11098,6 +13138,7 @@ def _usebyref24btfn2regnsv(
         ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usebyreffn2regnsv(
         ExistingBMPfile: str,
@@ -11131,6 +13172,7 @@ def _usebyreffn2regnsv(
       ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usefn2regsv(
         ExistingBMPfile: str,
@@ -11164,6 +13206,96 @@ def _usefn2regsv(
           ExistingBMPfile, NewBMPfile))
 
 
+def _readBMPhdr(f) -> array:
+    """Reads the header and palette
+        of an open bitmap file
+
+    Args:
+        f: bitmap file opened
+           for binary reading
+           at its start
+
+    Returns:
+        unsigned byte array with
+        the bmp header and palette
+        or None if not a bitmap
+    """
+    b = f.read(54)
+    if len(b) < 54 or b[:2] != b'BM':
+        print(sysmsg['notBMP'])
+        return None
+    hd = array('B', b)
+    hd.frombytes(f.read(_hdsz(hd) - 54))
+    return hd
+
+
+@checklink
+def _streamrows2file(
+        ExistingBMPfile: str,
+        NewBMPfile: str,
+        hdfunc: Callable = None,
+        flip: bool = False,
+        blocksize: int = 1 << 20) -> int:
+    """Copies a bitmap file a block of rows
+    at a time so that the whole image is
+    never held in memory
+
+    Args:
+        ExistingBMPfile: Whole path to
+                         existing file
+        NewBMPfile     : New file to
+                         save changes in
+        hdfunc         : called as hdfunc(hd)
+                         with the header
+                         and palette of the
+                         new file to modify
+                         byref and returns
+                         a function called
+                         as rowfunc(row) on
+                         each row (padding
+                         included) that
+                         returns the new row
+                         or None
+        flip           : True -> row order
+                         is reversed
+        blocksize      : bytes read at once
+
+    Returns:
+        bit depth of the bitmap
+        or 0 if not a bitmap
+    """
+    with open(ExistingBMPfile, 'rb') as fi:
+        hd = _readBMPhdr(fi)
+        if hd is None:
+            return 0
+        (_, y, bits, stride, _, _, _) = _bmpmeta(hd)
+        hdsz = len(hd)
+        rowfunc = None if hdfunc is None \
+                  else hdfunc(hd)
+        n = max(1, blocksize // stride)
+        with open(NewBMPfile, 'wb') as fo:
+            fo.write(hd)
+            for ys in range(0, y, n):
+                k = min(n, y - ys)
+                if flip:
+                    fi.seek(hdsz + (y - ys - k) * stride)
+                block = array('B', fi.read(k * stride))
+                rows = range(0, len(block), stride)
+                if flip:
+                    rows = reversed(rows)
+                for s in rows:
+                    row = block[s: s + stride]
+                    fo.write(row if rowfunc is None
+                             else rowfunc(row))
+            fi.seek(hdsz + y * stride)
+            fo.write(fi.read(
+                max(0, _flsz(hd) - hdsz - y * stride)))
+    countprofile(getmaxx(hd) * y,
+                 _flsz(hd), _flsz(hd))
+    return bits
+
+
+@functimer
 @checklink
 def _usebyreffnsv(
         ExistingBMPfile: str,
@@ -11190,6 +13322,7 @@ def _usebyreffnsv(
         ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usebyreffnwithparnsv(
         ExistingBMPfile: str,
@@ -11203,6 +13336,7 @@ def _usebyreffnwithparnsv(
     ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usefnsv(
         ExistingBMPfile: str,
@@ -11228,6 +13362,7 @@ def _usefnsv(
     ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _use24btfnwithparnsv(
         ExistingBMPfile: str,
@@ -11259,6 +13394,7 @@ def _use24btfnwithparnsv(
           ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usefn2circreg(
         ExistingBMPfile: str,
@@ -11289,6 +13425,7 @@ def _usefn2circreg(
          ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usefnwithpar2circreg(
         ExistingBMPfile: str,
@@ -11323,6 +13460,7 @@ def _usefnwithpar2circreg(
             NewBMPfile))
 
 
+@functimer
 @checklink
 def _use24btclrfntocircregion(
         ExistingBMPfile: str,
@@ -11356,6 +13494,7 @@ def _use24btclrfntocircregion(
             ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _use24btclrfnwithpar2circreg(
         ExistingBMPfile: str,
@@ -11392,6 +13531,7 @@ def _use24btclrfnwithpar2circreg(
             ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _useclradjfn(ExistingBMPfile: str,
         NewBMPfile: str,
@@ -11412,36 +13552,39 @@ def _useclradjfn(ExistingBMPfile: str,
     Returns:
         new bitmap file
     """
-    bmp = loadBMP(ExistingBMPfile)
-    if bmp[bmpcolorbits] != 24:
-        setbmppal(bmp,[func(c, funcparam)
-              for c in getallRGBpal(bmp)])
-    else:
-        if func.__name__ == 'colorfilter':
-            colorfilterto24bitimage(
-                bmp, funcparam)
-        elif func.__name__ == 'brightnessadjust':
-            brightnesseadjto24bitimage(
-                bmp, funcparam)
-        elif func.__name__ == 'gammacorrect':
-            gammaadjto24bitimage(
-                bmp, funcparam)
-        elif func.__name__ == 'thresholdadjust':
-            thresholdadjto24bitimage(
-                bmp, funcparam)
-        else:
-            for v in iterimageRGB(bmp,
-                        sysmsg['coloradj'], '*',
-                        sysmsg['done']):
-                plotRGBxybitvec(
-                    bmp, v[0],
-                    func(v[1],funcparam))
-        saveBMP(NewBMPfile,bmp)
+    bgrfunc = {'colorfilter': colorfiltertoBGRbuf,
+               'brightnessadjust': applybrightnessadjtoBGRbuf,
+               'gammacorrect': gammaBGRbuf,
+               'thresholdadjust': applythresholdadjtoBGRbuf
+               }.get(func.__name__)
+
+    def _adj(hd: array):
+        if hd[bmpcolorbits] != 24:
+            setbmppal(hd, [func(c, funcparam)
+                  for c in getallRGBpal(hd)])
+            return None
+        w = getmaxx(hd) * 3
+
+        def _row(row: array) -> array:
+            if bgrfunc is None:
+                for i in range(0, w, 3):
+                    (r, g, b) = func([row[i + 2],
+                        row[i + 1], row[i]], funcparam)
+                    row[i: i + 3] = array('B', [b, g, r])
+            else:
+                row[:w] = bgrfunc(row[:w], funcparam)
+            return row
+
+        return _row
+
+    if _streamrows2file(ExistingBMPfile,
+            NewBMPfile, _adj) > 0:
         print(sysmsg['savesingleparamfunc'] %
             (func.__name__, str(funcparam),
             ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _use24btclrfn(ExistingBMPfile: str,
         NewBMPfile: str,
@@ -11475,6 +13618,7 @@ def _use24btclrfn(ExistingBMPfile: str,
           ExistingBMPfile, NewBMPfile))
 
 
+@functimer
 @checklink
 def _usenoparclradjfn(
         ExistingBMPfile: str,
@@ -11494,22 +13638,27 @@ def _usenoparclradjfn(
     Returns:
         new bitmap file
     """
-    bmp = loadBMP(ExistingBMPfile)
-    if bmp[bmpcolorbits] != 24:
-        setbmppal(bmp,
-            [func(c) for c in getallRGBpal(bmp)])
-    else:
-        if func.__name__ == 'monochrome':
-            monofilterto24bitimage(bmp)
-        else:
-            for v in iterimageRGB(
-                        bmp,
-                        sysmsg['coloradj'],
-                        '*',
-                        sysmsg['done']):
-                plotRGBxybitvec(bmp, v[0],
-                                func(v[1]))
-        saveBMP(NewBMPfile, bmp)
+    def _adj(hd: array):
+        if hd[bmpcolorbits] != 24:
+            setbmppal(hd,
+                [func(c) for c in getallRGBpal(hd)])
+            return None
+        w = getmaxx(hd) * 3
+
+        def _row(row: array) -> array:
+            if func.__name__ == 'monochrome':
+                row[:w] = monochromefiltertoBGRbuf(row[:w])
+            else:
+                for i in range(0, w, 3):
+                    (r, g, b) = func([row[i + 2],
+                        row[i + 1], row[i]])
+                    row[i: i + 3] = array('B', [b, g, r])
+            return row
+
+        return _row
+
+    if _streamrows2file(ExistingBMPfile,
+            NewBMPfile, _adj) > 0:
         print(sysmsg['savenoparamfunc'] %
              (func.__name__, ExistingBMPfile,
                              NewBMPfile))
@@ -11620,7 +13769,9 @@ def reduce24bitimagebits(
         NewBMPfile: str, newbits: int,
         similaritythreshold: float,
         usemonopal: bool,
-        RGBfactors: list[float, float, float] = None):
+        RGBfactors: list[float, float, float] = None,
+        dither: str = 'none',
+        progress: Callable = None):
     """Reduce bits used to encode color in a 24-bit BMP
 
     Args:
@@ -11643,6 +13794,15 @@ def reduce24bitimagebits(
                              used only if
                              usemonopal
                              is True
+        dither             : 'none',
+                             'floydsteinberg'
+                             or 'ordered'
+        progress           : progress
+                             reporter
+                             (default the
+                             one set by
+                             setprogress-
+                             reporter)
     Returns:
         new bitmap file
 
@@ -11651,25 +13811,16 @@ def reduce24bitimagebits(
     if sbmp[bmpcolorbits] != 24:
         print(sysmsg['not24bit'])
     else:
-        bmp = CopyBMPxydim2newBMP(
-                sbmp, newbits)
-        if newbits > 1:
-            if usemonopal:
-                newpal = setBMP2monochrome(
-                            bmp, RGBfactors)
-            else:
-                newpal = setnewpalfromsourcebmp(
-                            sbmp, bmp,
-                            similaritythreshold)
-        for v in iterimageRGB(sbmp,
-                    sysmsg['colorquant'],
-                    '*',
-                    sysmsg['done']):
-                if newbits == 1:
-                    c = probplotRGBto1bit(v[1], 2)
-                else:
-                    c = matchRGBtopal(v[1], newpal)
-                intplotvecxypoint(bmp, v[0], c)
+        report = getprogressreporter(progress)
+        my = getmaxy(sbmp)
+        if report is not None:
+            report(sysmsg['colorquant'], 0, my)
+        bmp = quantize24bitimage(sbmp,
+                newbits, dither,
+                similaritythreshold,
+                usemonopal, RGBfactors)
+        if report is not None:
+            report(sysmsg['done'], my, my)
         saveBMP(NewBMPfile, bmp)
         print(sysmsg['savemod'] % (
                  Existing24BMPfile,
@@ -11712,11 +13863,11 @@ def imgregionbyRGB2file(
         new bitmap file
     """
     bmp = loadBMP(ExistingBMPfile)
-    edge = getimageregionbyRGB(
+    edge = getimageregionmasks(
             bmp, rgb, similaritythreshold)
     if showedgeonly:
         bmp = copyBMPhdr(bmp)
-    plotxypointlist(bmp,
+    plotmasks(bmp,
         edge, edgeradius, edgecolor)
     saveBMP(NewBMPfile,bmp)
     print(sysmsg['savemod'] % (
@@ -11724,6 +13875,7 @@ def imgregionbyRGB2file(
 
 
 @functimer
+@checklink
 def invertbits2file(
         ExistingBMPfile: str,
         NewBMPfile: str):
@@ -11738,11 +13890,18 @@ def invertbits2file(
     Returns:
         new bitmap file
     """
-    _usebyreffnsv(ExistingBMPfile,
-        NewBMPfile, invertimagebits)
+    def _inv(hd: array):
+        return _invertrowbytes
+
+    if _streamrows2file(ExistingBMPfile,
+            NewBMPfile, _inv) > 0:
+        print(sysmsg['savefunc'] %
+            ('invertimagebits',
+            ExistingBMPfile, NewBMPfile))
 
 
 @functimer
+@checklink
 def flipvertical2file(
     ExistingBMPfile: str,
     NewBMPfile: str):
@@ -11757,8 +13916,11 @@ def flipvertical2file(
     Returns:
         new bitmap file
     """
-    _usebyreffnsv(ExistingBMPfile,
-        NewBMPfile, flipvertical)
+    if _streamrows2file(ExistingBMPfile,
+            NewBMPfile, flip=True) > 0:
+        print(sysmsg['savefunc'] %
+            ('flipvertical',
+            ExistingBMPfile, NewBMPfile))
 
 
 @functimer
@@ -12510,6 +14672,39 @@ def resizeNtimessmaller2file(
         resizeNtimessmaller, n)
 
 
+@functimer
+@checklink
+def resize2file(
+        ExistingBMPfile: str,
+        NewBMPfile: str,
+        newx: int, newy: int,
+        filter: str = 'bicubic'):
+    """Resize a bitmap file to any size
+
+    Args:
+        ExistingBMPfile: Whole path to
+                         existing file
+        NewBMPfile     : New file to
+                         save changes in
+        newx, newy     : new size
+        filter         : 'box',
+                         'bilinear',
+                         'bicubic' or
+                         'lanczos'
+
+    Returns:
+        new bitmap file
+    """
+    nbmp = resize(loadBMP(ExistingBMPfile),
+                  newx, newy, filter)
+    if nbmp is not None:
+        saveBMP(NewBMPfile, nbmp)
+        print(sysmsg['savesingleparamfunc'] %
+            (resize.__name__,
+            f'{newx}, {newy}, {filter}',
+            ExistingBMPfile, NewBMPfile))
+
+
 @functimer
 def resizeNtimesbigger2file(
         ExistingBMPfile: str,
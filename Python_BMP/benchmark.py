@@ -0,0 +1,832 @@
+"""
+ Benchmark module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+
+ Usage:
+    python -m Python_BMP.benchmark --list
+    python -m Python_BMP.benchmark
+        --sizes 64x48,256x192 --bits 1,24
+        --json now.json --baseline old.json
+"""
+
+import csv
+import gc
+import json
+import platform
+from argparse import ArgumentParser
+from array import array
+from contextlib import redirect_stdout
+from fnmatch import fnmatch
+from importlib.util import find_spec
+from inspect import signature
+from os import devnull, path
+from statistics import mean, median
+from tempfile import TemporaryDirectory
+from time import perf_counter, process_time, strftime
+from typing import Callable
+
+from . import BITMAPlib
+from .BITMAPlib import(
+    IFS,
+    RGB2int,
+    clearmeshcache,
+    cubevert,
+    cylindervertandsurface,
+    filledcircle,
+    filledrect,
+    fractaldomainparamdict,
+    funcparamdict,
+    getIFSparams,
+    getRGBfactors,
+    getshapesidedict,
+    icosahedvertandsurface,
+    line,
+    loadBMP,
+    newBMP,
+    plot3Dsolid,
+    plotpolyfill,
+    plotstring,
+    plotxybit,
+    rotvec3D,
+    saveBMP,
+    savebarnsleytreefractal2file,
+    savecosjulia2file,
+    savehilbertcurve2file,
+    savejuliafractal2file,
+    savekochsnowflake2file,
+    savelambdafractal2file,
+    savemandelbrotfractal2file,
+    savemarekdragon2file,
+    savemultibrotfractal2file,
+    savemulticirclefractal2file,
+    savemulticornfractal2file,
+    savemultijuliafractal2file,
+    savenewtonsfractal2file,
+    savesinjulia2file,
+    savespiraljulia2file,
+    savetetrationfractal2file,
+    savetricornfractal2file,
+    savexordivfractal2file,
+    savexorfractal2file,
+    spherevertandsurface,
+    surfplot3Dvertandsurface,
+    thickroundline,
+    )
+
+from .fonts import font8x8
+
+
+resultfields = ['name', 'kind', 'x', 'y', 'bits',
+                'repeats', 'min', 'median', 'mean',
+                'max', 'cpu', 'mpixpersec', 'error']
+
+defaultsizes = [(64, 48), (256, 192)]
+
+defaultbits = [1, 4, 8, 24]
+
+_fractalmaxiter = 64
+
+_benchmarks = {}
+
+
+def addbenchmark(name: str, kind: str,
+        setup: Callable):
+    """Registers a named benchmark
+
+    Args:
+        name : unique name of the
+               benchmark
+        kind : 'micro' or 'macro'
+        setup: function
+               (x, y, bits, workdir)
+               that prepares the data
+               outside of the timing
+               and returns the zero
+               argument function
+               to time
+
+    Returns:
+        None
+    """
+    _benchmarks[name] = (kind, setup)
+
+
+def listbenchmarks(pattern: str = '*'
+        ) -> list[str]:
+    """Names of the registered benchmarks
+
+    Args:
+        pattern: shell style wildcard
+                 to select benchmarks
+                 by name
+
+    Returns:
+        sorted list of names
+    """
+    return sorted(n for n in _benchmarks
+                  if fnmatch(n, pattern))
+
+
+def _benchcolor(bits: int, i: int) -> int:
+    """A distinct color for a bit depth
+
+    Args:
+        bits: bit depth (1, 4, 8, 24)
+        i   : color number
+
+    Returns:
+        int color
+    """
+    if bits == 24:
+        return RGB2int((i * 97) & 255,
+                       (i * 57) & 255,
+                       (i * 31) & 255)
+    return 1 + i % ((1 << bits) - 1)
+
+
+def samplebmp(x: int, y: int,
+        bits: int) -> array:
+    """Makes a busy test image
+        to feed the benchmarks
+
+    Args:
+        x, y: size of the image
+        bits: bit depth (1, 4, 8, 24)
+
+    Returns:
+        unsigned byte array
+        with bmp format
+    """
+    bmp = newBMP(x, y, bits)
+    filledrect(bmp, x >> 3, y >> 3,
+               x * 3 >> 2, y * 3 >> 2,
+               _benchcolor(bits, 1))
+    r = min(x, y) >> 2
+    for i in range(8):
+        filledcircle(bmp,
+            (x * (i + 1)) // 9,
+            (y * ((i & 3) + 1)) // 5,
+            r - i * r // 9,
+            _benchcolor(bits, i + 2))
+    for i in range(1, x - 1, 4):
+        line(bmp, i, 1, x - 1 - i, y - 2,
+             _benchcolor(bits, i))
+    return bmp
+
+
+def _inmemory(draw: Callable) -> Callable:
+    """Wraps a drawing function
+        into a benchmark setup
+        on a new bitmap
+
+    Args:
+        draw: function
+              (bmp, x, y, bits)
+
+    Returns:
+        setup function for
+        addbenchmark
+    """
+    def setup(x: int, y: int, bits: int,
+              workdir: str) -> Callable:
+        bmp = newBMP(x, y, bits)
+        return lambda: draw(bmp, x, y, bits)
+    return setup
+
+
+def _plotpixels(bmp: array,
+        x: int, y: int, bits: int):
+    c = _benchcolor(bits, 3)
+    for j in range(0, y, 2):
+        for i in range(j & 2, x, 4):
+            plotxybit(bmp, i, j, c)
+
+
+def _lines(bmp: array,
+        x: int, y: int, bits: int):
+    for i in range(1, x - 1, 4):
+        line(bmp, i, 1, x - 1 - i, y - 2,
+             _benchcolor(bits, i))
+    for j in range(1, y - 1, 4):
+        line(bmp, 1, j, x - 2, y - 1 - j,
+             _benchcolor(bits, j))
+
+
+def _thicklines(bmp: array,
+        x: int, y: int, bits: int):
+    p = max(min(x, y) >> 5, 2)
+    for i in range(0, x, 16):
+        thickroundline(bmp,
+            [i, p], [x - 1 - i, y - 1 - p],
+            p, _benchcolor(bits, i))
+
+
+def _filledcircles(bmp: array,
+        x: int, y: int, bits: int):
+    r = min(x, y) >> 1
+    for i in range(8):
+        filledcircle(bmp, x >> 1, y >> 1,
+                     r - i * r // 8,
+                     _benchcolor(bits, i))
+
+
+def _polyfill(bmp: array,
+        x: int, y: int, bits: int):
+    (cx, cy) = (x >> 1, y >> 1)
+    star = [[cx, 0], [cx + x // 8, cy - y // 8],
+            [x - 1, cy], [cx + x // 8, cy + y // 8],
+            [cx, y - 1], [cx - x // 8, cy + y // 8],
+            [0, cy], [cx - x // 8, cy - y // 8]]
+    plotpolyfill(bmp, star, _benchcolor(bits, 5))
+
+
+def _text(bmp: array,
+        x: int, y: int, bits: int):
+    s = 'abcdefghijklmnopqrstuvwxyz\n' + \
+        '0123456789\'":;.,?!~`@#$%^&()' + \
+        '[]{}_*+-/=<>\n' + \
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    plotstring(bmp, 0, 0, s, 1, 0, 0,
+               _benchcolor(bits, 7), font8x8)
+    plotstring(bmp, 0, y >> 1, s, 2, 1, 0,
+               _benchcolor(bits, 9), font8x8)
+
+
+def _fern(bmp: array,
+        x: int, y: int, bits: int):
+    IFS(bmp, getIFSparams()['fern'],
+        0, 0, x - 1, y - 1,
+        y // 11, y // 11, x >> 1, 0,
+        _benchcolor(bits, 2), x * y >> 2)
+
+
+def _solid(vertandsides: Callable,
+        issolid: bool) -> Callable:
+    """Benchmark drawing of
+        a 3D solid
+
+    Args:
+        vertandsides: function (size)
+                      that returns the
+                      vertices and sides
+                      of the solid
+        issolid     : draw faces or
+                      only the outline
+
+    Returns:
+        drawing function for
+        _inmemory
+    """
+    cf = getRGBfactors()
+
+    def draw(bmp: array,
+            x: int, y: int, bits: int):
+        # time building the mesh on
+        # every run not a cache hit
+        clearmeshcache()
+        plot3Dsolid(bmp,
+            vertandsides(max(min(x, y) // 40, 1) * 5),
+            issolid, cf['brightyellow'],
+            True, _benchcolor(bits, 1),
+            rotvec3D(25, 40, 15), [0, 0, 100],
+            200, [x >> 1, y >> 1])
+    return draw
+
+
+def _loadBMP(x: int, y: int, bits: int,
+        workdir: str) -> Callable:
+    f = path.join(workdir, f'load{bits}.bmp')
+    saveBMP(f, samplebmp(x, y, bits))
+    return lambda: loadBMP(f)
+
+
+def _saveBMP(x: int, y: int, bits: int,
+        workdir: str) -> Callable:
+    f = path.join(workdir, f'save{bits}.bmp')
+    bmp = samplebmp(x, y, bits)
+    return lambda: saveBMP(f, bmp)
+
+
+def _fractal2file(func: Callable,
+        params: tuple) -> Callable:
+    """Benchmark of a save fractal
+        to file function
+
+    Args:
+        func  : the save*2file function
+                (file, x, y, ...,
+                 bitdepth, maxiter)
+        params: arguments between the
+                image size and bitdepth
+
+    Returns:
+        setup function for
+        addbenchmark
+    """
+    def setup(x: int, y: int, bits: int,
+              workdir: str) -> Callable:
+        f = path.join(workdir,
+                      f'{func.__name__}.bmp')
+        return lambda: func(f, x, y, *params,
+                            bitdepth=bits,
+                            maxiter=_fractalmaxiter)
+    return setup
+
+
+def _koch2file(x: int, y: int, bits: int,
+        workdir: str) -> Callable:
+    f = path.join(workdir, 'koch.bmp')
+    r = min(x, y) >> 1
+    return lambda: savekochsnowflake2file(f,
+                       r, 4, bitdepth=bits)
+
+
+def _hilbert2file(x: int, y: int, bits: int,
+        workdir: str) -> Callable:
+    f = path.join(workdir, 'hilbert.bmp')
+    return lambda: savehilbertcurve2file(f,
+                       x, y, 5, bitdepth=bits)
+
+
+def _filterargs(x: int, y: int) -> dict:
+    """Arguments for the 2file filters
+        by parameter name
+
+    Args:
+        x, y: size of the source image
+
+    Returns:
+        dict of parameter name: value
+    """
+    r = min(x, y) // 3
+    return {'x1': x >> 3, 'y1': y >> 3,
+            'x2': x * 7 >> 3, 'y2': y * 7 >> 3,
+            'x': x >> 1, 'y': y >> 1, 'r': r,
+            'n': 2, 'color': 1,
+            'percentadj': 20, 'gamma': 0.8,
+            'lumrange': [32, 224],
+            'rgbfactors': [1, 0.5, 0.25],
+            'newxycenterpoint': [r, r],
+            'intmagfactor': 2, 'intpixsize': 4,
+            'similaritythreshold': 10,
+            'edgeradius': 1, 'edgecolor': 1,
+            'rgb': [255, 255, 255],
+            'showedgeonly': False}
+
+
+def _filter2file(func: Callable,
+        params: list[str]) -> Callable:
+    """Benchmark of a 2file filter
+
+    Args:
+        func  : the *2file function
+                (ExistingBMPfile,
+                 NewBMPfile, ...)
+        params: names of its
+                other parameters
+
+    Returns:
+        setup function for
+        addbenchmark
+    """
+    def setup(x: int, y: int, bits: int,
+              workdir: str) -> Callable:
+        src = path.join(workdir, f'src{bits}.bmp')
+        if not path.isfile(src):
+            saveBMP(src, samplebmp(x, y, bits))
+        f = path.join(workdir,
+                      f'{func.__name__}.bmp')
+        a = _filterargs(x, y)
+        args = [a[p] for p in params]
+        return lambda: func(src, f, *args)
+    return setup
+
+
+def _iterfilters2file():
+    """Finds the 2file filters
+        that can be benchmarked
+
+    Yields:
+        (name, function,
+         list of parameter names)
+    """
+    known = _filterargs(1, 1)
+    for name in sorted(vars(BITMAPlib)):
+        func = getattr(BITMAPlib, name)
+        if name[0] == '_' or \
+            not name.endswith('2file') or \
+            not callable(func):
+            continue
+        params = list(signature(func).parameters)
+        if params[:2] == ['ExistingBMPfile',
+                          'NewBMPfile'] and \
+            all(p in known for p in params[2:]):
+            yield (name, func, params[2:])
+
+
+def _registerbenchmarks():
+    """Registers the standard benchmarks
+
+    Returns:
+        None
+    """
+    for (name, draw) in (
+            ('plotxybit', _plotpixels),
+            ('line', _lines),
+            ('thickroundline', _thicklines),
+            ('filledcircle', _filledcircles),
+            ('plotpolyfill', _polyfill),
+            ('font.plotstring', _text)):
+        addbenchmark(name, 'micro', _inmemory(draw))
+    addbenchmark('io.loadBMP', 'micro', _loadBMP)
+    addbenchmark('io.saveBMP', 'micro', _saveBMP)
+    addbenchmark('fractal.IFSfern', 'macro',
+                 _inmemory(_fern))
+    addbenchmark('fractal.koch', 'macro', _koch2file)
+    addbenchmark('fractal.hilbert', 'macro',
+                 _hilbert2file)
+    cf = getRGBfactors()
+    domain = fractaldomainparamdict()['maxeqdim']
+    c = -0.70176 - 0.3842j
+    box = [-1.5, 1.5, -1.5, 1.5]
+    for (name, func, params) in (
+            ('mandelbrot', savemandelbrotfractal2file,
+             (domain, cf['brightgreen'])),
+            ('multibrot', savemultibrotfractal2file,
+             (5, domain, cf['cyan'])),
+            ('multicircle', savemulticirclefractal2file,
+             (2.5, [-20, 20, -20, 20], cf['blue'])),
+            ('julia', savejuliafractal2file,
+             (c, domain, cf['brightcyan'])),
+            ('multijulia', savemultijuliafractal2file,
+             (c, 5, domain, cf['green'])),
+            ('spiraljulia', savespiraljulia2file,
+             (2.2 + 0.33j, domain, cf['yellow'])),
+            ('sinjulia', savesinjulia2file,
+             (1 + 0.3j, box, cf['orange'])),
+            ('cosjulia', savecosjulia2file,
+             (1 + 0.3j, box, cf['brightred'])),
+            ('lambda', savelambdafractal2file,
+             (0.85 - 0.6j, [-.5, .5, -.5, .5],
+              cf['brightyellow'])),
+            ('tricorn', savetricornfractal2file,
+             (domain, cf['brightmagenta'])),
+            ('multicorn', savemulticornfractal2file,
+             (5, domain, cf['magenta'])),
+            ('barnsleytree', savebarnsleytreefractal2file,
+             (0.6 + 1.1j, box, cf['brightgreen'])),
+            ('marekdragon', savemarekdragon2file,
+             (0.6180339887, box, cf['brightwhite'])),
+            ('tetration', savetetrationfractal2file,
+             (10, [-5, 5, -5, 5], cf['brightorange'])),
+            ('xor', savexorfractal2file,
+             (97, [-200, 200, -200, 200], cf['brightwhite'])),
+            ('xordiv', savexordivfractal2file,
+             (13, [-200, 200, -200, 200], cf['brightwhite'])),
+            ('newtons', savenewtonsfractal2file,
+             (funcparamdict()[3], domain,
+              (cf['red'], cf['green'], cf['blue'])))):
+        addbenchmark(f'fractal.{name}', 'macro',
+                     _fractal2file(func, params))
+    sd = getshapesidedict()
+    for (name, vertandsides, issolid) in (
+            ('cube', lambda s: [cubevert(s), sd['cube']],
+             True),
+            ('icosahedron', icosahedvertandsurface, False),
+            ('sphere', lambda s: spherevertandsurface(
+                [5, 0, 0], s, 10), True),
+            ('cylinder', lambda s: cylindervertandsurface(
+                [1, 0, 0], s >> 1, s >> 1, 5), True),
+            ('surface', lambda s: surfplot3Dvertandsurface(
+                -s, -s, s, s, 5, lambda x, y: x & y),
+             True)):
+        addbenchmark(f'solid3D.{name}', 'macro',
+                     _inmemory(_solid(vertandsides,
+                                      issolid)))
+    for (name, func, params) in _iterfilters2file():
+        addbenchmark(f'filter.{name}', 'macro',
+                     _filter2file(func, params))
+
+
+def timefunc(func: Callable,
+        warmup: int = 1,
+        repeats: int = 3) -> dict:
+    """Times a function
+
+    Args:
+        func   : zero argument function
+        warmup : untimed calls made
+                 before timing
+        repeats: timed calls
+
+    Returns:
+        dict of wall clock seconds
+        'min', 'median', 'mean', 'max'
+        and median processor seconds
+        'cpu'
+    """
+    for _ in range(warmup):
+        func()
+    gc.collect()
+    wall = []
+    cpu = []
+    for _ in range(repeats):
+        w = perf_counter()
+        c = process_time()
+        func()
+        cpu.append(process_time() - c)
+        wall.append(perf_counter() - w)
+    return {'min': min(wall),
+            'median': median(wall),
+            'mean': mean(wall),
+            'max': max(wall),
+            'cpu': median(cpu)}
+
+
+def runbenchmarks(
+        patterns: list[str] = None,
+        sizes: list[tuple[int, int]] = None,
+        bits: list[int] = None,
+        warmup: int = 1,
+        repeats: int = 3,
+        workdir: str = None,
+        progress: Callable = None
+        ) -> list[dict]:
+    """Runs the benchmarks at each
+        image size and bit depth
+
+    Args:
+        patterns: shell style wildcards
+                  to select benchmarks
+                  (default all)
+        sizes   : list of (x, y)
+                  image sizes
+        bits    : list of bit depths
+        warmup  : untimed runs
+        repeats : timed runs
+        workdir : directory for the
+                  files the benchmarks
+                  write (default a
+                  temporary directory)
+        progress: optional function
+                  called with each
+                  result as it is made
+
+    Returns:
+        list of dict results with
+        the keys in resultfields
+        (times in seconds)
+    """
+    if workdir is None:
+        with TemporaryDirectory() as tmp:
+            return runbenchmarks(patterns,
+                sizes, bits, warmup, repeats,
+                tmp, progress)
+    names = sorted({n for p in patterns or ['*']
+                      for n in listbenchmarks(p)})
+    results = []
+    with open(devnull, 'w') as quiet:
+        for (x, y) in sizes or defaultsizes:
+            for b in bits or defaultbits:
+                for name in names:
+                    (kind, setup) = _benchmarks[name]
+                    r = {'name': name, 'kind': kind,
+                         'x': x, 'y': y, 'bits': b,
+                         'repeats': repeats}
+                    try:
+                        with redirect_stdout(quiet):
+                            t = timefunc(
+                                setup(x, y, b, workdir),
+                                warmup, repeats)
+                        r.update(t)
+                        r['mpixpersec'] = (x * y /
+                            t['median'] / 1e6
+                            if t['median'] > 0 else 0)
+                        r['error'] = ''
+                    except Exception as e:
+                        r['error'] = f'{type(e).__name__}: {e}'
+                    results.append(r)
+                    if progress is not None:
+                        progress(r)
+    return results
+
+
+def benchmarkenv() -> dict:
+    """Describes the machine
+        the benchmarks ran on
+
+    Returns:
+        dict
+    """
+    return {'python': platform.python_version(),
+            'implementation':
+                platform.python_implementation(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'numpy': find_spec('numpy') is not None,
+            'created': strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def saveresultsJSON(file: str,
+        results: list[dict]):
+    """Saves benchmark results
+        as JSON
+
+    Args:
+        file   : new JSON file
+        results: list of dict from
+                 runbenchmarks
+
+    Returns:
+        a JSON file
+    """
+    with open(file, 'w') as f:
+        json.dump({'env': benchmarkenv(),
+                   'results': results}, f,
+                  indent=1)
+
+
+def saveresultsCSV(file: str,
+        results: list[dict]):
+    """Saves benchmark results
+        as CSV
+
+    Args:
+        file   : new CSV file
+        results: list of dict from
+                 runbenchmarks
+
+    Returns:
+        a CSV file
+    """
+    with open(file, 'w', newline='') as f:
+        w = csv.DictWriter(f, resultfields,
+                           extrasaction='ignore')
+        w.writeheader()
+        w.writerows(results)
+
+
+def loadresults(file: str) -> list[dict]:
+    """Loads benchmark results
+        saved as JSON or CSV
+
+    Args:
+        file: JSON or CSV file
+
+    Returns:
+        list of dict results
+    """
+    with open(file, newline='') as f:
+        if not file.lower().endswith('.csv'):
+            return json.load(f)['results']
+        results = []
+        for r in csv.DictReader(f):
+            for k in ('x', 'y', 'bits', 'repeats'):
+                r[k] = int(r[k])
+            for k in ('min', 'median', 'mean',
+                      'max', 'cpu', 'mpixpersec'):
+                r[k] = float(r[k]) if r[k] else 0
+            results.append(r)
+        return results
+
+
+def compareresults(results: list[dict],
+        baseline: list[dict],
+        tolerance: float = 0.15
+        ) -> list[dict]:
+    """Compares benchmark results
+        to a baseline by the fastest
+        of the timed runs which is
+        the least noisy measure
+
+    Args:
+        results  : list of dict from
+                   runbenchmarks
+        baseline : earlier results
+        tolerance: allowed slowdown
+                   (0.15 = 15% slower)
+                   before a result
+                   counts as a
+                   regression
+
+    Returns:
+        list of dict with keys
+        'name', 'x', 'y', 'bits',
+        'baseline', 'time', 'ratio'
+        and 'regressed' for each
+        result found in both
+    """
+    key = lambda r: (r['name'], r['x'],
+                     r['y'], r['bits'])
+    base = {key(r): r for r in baseline
+            if not r.get('error')}
+    cmp = []
+    for r in results:
+        b = base.get(key(r))
+        if b is None or r.get('error') or \
+            b['min'] <= 0:
+            continue
+        ratio = r['min'] / b['min']
+        cmp.append({'name': r['name'],
+                    'x': r['x'], 'y': r['y'],
+                    'bits': r['bits'],
+                    'baseline': b['min'],
+                    'time': r['min'],
+                    'ratio': ratio,
+                    'regressed':
+                        ratio > 1 + tolerance})
+    return cmp
+
+
+def _printresult(r: dict):
+    s = f"{r['name']:<44} {r['x']:>5}x{r['y']:<5} " + \
+        f"{r['bits']:>2}-bit "
+    if r['error']:
+        print(f"{s} {r['error']}")
+    else:
+        print(f"{s} {r['median'] * 1000:>10.2f} ms " +
+              f"{r['mpixpersec']:>8.3f} Mpix/s")
+
+
+def main(argv: list[str] = None) -> int:
+    """Command line benchmark runner
+
+    Args:
+        argv: command line arguments
+              (default sys.argv)
+
+    Returns:
+        exit status
+        (1 if any benchmark is slower
+         than the baseline allows)
+    """
+    a = ArgumentParser(prog='python -m Python_BMP.benchmark',
+        description='Benchmarks Python_BMP')
+    a.add_argument('patterns', nargs='*',
+        help='wildcards of benchmark names to run')
+    a.add_argument('--list', action='store_true',
+        help='list the benchmarks and exit')
+    a.add_argument('--sizes',
+        default=','.join(f'{x}x{y}' for (x, y)
+                         in defaultsizes),
+        help='image sizes like 64x48,256x192')
+    a.add_argument('--bits',
+        default=','.join(map(str, defaultbits)),
+        help='bit depths like 1,4,8,24')
+    a.add_argument('--warmup', type=int, default=1)
+    a.add_argument('--repeats', type=int, default=3)
+    a.add_argument('--json', help='save results as JSON')
+    a.add_argument('--csv', help='save results as CSV')
+    a.add_argument('--baseline',
+        help='JSON or CSV results to compare against')
+    a.add_argument('--tolerance', type=float, default=0.15,
+        help='allowed slowdown vs the baseline')
+    opts = a.parse_args(argv)
+    if opts.list:
+        for p in opts.patterns or ['*']:
+            for n in listbenchmarks(p):
+                print(f'{n:<44} {_benchmarks[n][0]}')
+        return 0
+    sizes = [tuple(int(v) for v in s.split('x'))
+             for s in opts.sizes.split(',')]
+    bits = [int(b) for b in opts.bits.split(',')]
+    results = runbenchmarks(opts.patterns, sizes, bits,
+                            opts.warmup, opts.repeats,
+                            progress=_printresult)
+    if opts.json:
+        saveresultsJSON(opts.json, results)
+    if opts.csv:
+        saveresultsCSV(opts.csv, results)
+    if opts.baseline:
+        cmp = compareresults(results,
+                  loadresults(opts.baseline),
+                  opts.tolerance)
+        slow = [c for c in cmp if c['regressed']]
+        for c in slow:
+            print(f"Regression {c['name']} " +
+                  f"{c['x']}x{c['y']} {c['bits']}-bit: " +
+                  f"{c['baseline'] * 1000:.2f} ms -> " +
+                  f"{c['time'] * 1000:.2f} ms " +
+                  f"({c['ratio']:.2f}x)")
+        print(f'{len(slow)} of {len(cmp)} results ' +
+              'slower than the baseline allows')
+        return int(len(slow) > 0)
+    return 0
+
+
+_registerbenchmarks()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -15,9 +15,13 @@ Bit rotation and buffer flipping mod
 """
 
 from array import array
-from .mathlib import rotatebits
 from .colors import RGB2BGRbuf
 
+_bitrevtable = bytes(int(f'{i:08b}'[::-1], 2)
+                     for i in range(256))
+_nibbleswaptable = bytes(((i & 15) << 4) | (i >> 4)
+                         for i in range(256))
+
 
 def rotatebitsinbuf(
         buf: array) -> array:
@@ -30,8 +34,8 @@ def rotatebitsinbuf(
     Returns:
         unsigned byte array
     """
-    return array('B', [rotatebits(b)
-                       for b in buf])
+    return array('B', bytes(buf).translate(
+                                _bitrevtable))
 
 
 def flipnibbleinbuf(
@@ -44,8 +48,128 @@ def flipnibbleinbuf(
     Returns:
         unsigned byte array
     """
-    return array('B', [(b >> 4) + ((b % 16) << 4)
-                    for b in buf])
+    return array('B', bytes(buf).translate(
+                                _nibbleswaptable))
+
+
+def _runbits(bits: int, x1: int, x2: int
+        ) -> tuple[int, int, int, int]:
+    """Locates a run of 1 or 4-bit pixels
+
+    Returns:
+        (first byte, last byte,
+         first bit, last bit)
+        with the bits counted from
+        the top bit of the first byte
+    """
+    ppb = 8 // bits
+    b1 = x1 // ppb
+    return (b1, x2 // ppb,
+            (x1 - b1 * ppb) * bits,
+            (x2 - b1 * ppb + 1) * bits - 1)
+
+
+def _bitmask(nbits: int, lo: int, hi: int) -> int:
+    """Mask of the bits lo to hi counted
+        from the top of an nbits wide int
+    """
+    if hi < lo:
+        return 0
+    return ((1 << (hi - lo + 1)) - 1) << (nbits - 1 - hi)
+
+
+def fliprunbuf(buf: array, bits: int,
+        x1: int, x2: int,
+        trans: str = 'F') -> array:
+    """Reverses a run of pixels in a row
+        in one pass whatever the bit depth
+
+    Args:
+        buf   : unsigned byte array
+                with a row of pixels
+        bits  : (1, 4, 8, 24) bits
+        x1, x2: first and last pixel
+                of the run
+        trans : single letter
+                transform code
+                'F' -> flip
+                'L' -> mirror left
+                'R' -> mirror right
+
+    Returns:
+        unsigned byte array
+    """
+    n = x2 - x1 + 1
+    h = n >> 1
+    if bits >= 8:
+        bpp = bits >> 3
+        s = x1 * bpp
+        run = bytearray(buf[s: s + n * bpp])
+        rev = run[::-1]
+        if bits == 24:
+            rev[0::3], rev[2::3] = rev[2::3], rev[0::3]
+        if trans == 'L':
+            rev[:(n - h) * bpp] = run[:(n - h) * bpp]
+        elif trans == 'R':
+            rev[h * bpp:] = run[h * bpp:]
+        buf = array('B', buf)
+        buf[s: s + n * bpp] = array('B', rev)
+        return buf
+    (b1, b2, a, b) = _runbits(bits, x1, x2)
+    run = bytes(buf[b1: b2 + 1])
+    nbits = len(run) << 3
+    v = int.from_bytes(run, 'big')
+    rev = int.from_bytes(run.translate(
+            _bitrevtable if bits == 1
+            else _nibbleswaptable)[::-1], 'big')
+    d = a + b + 1 - nbits
+    rev = rev >> d if d >= 0 else rev << -d
+    if trans == 'L':
+        a += (n - h) * bits
+    elif trans == 'R':
+        b = a + h * bits - 1
+    m = _bitmask(nbits, a, b)
+    buf = array('B', buf)
+    buf[b1: b2 + 1] = array('B',
+        ((v & ~m) | (rev & m)).to_bytes(len(run), 'big'))
+    return buf
+
+
+def swaprunbufs(buf1: array, buf2: array,
+        bits: int, x1: int, x2: int
+        ) -> tuple[array, array]:
+    """Swaps a run of pixels between
+        two rows in one pass whatever
+        the bit depth
+
+    Args:
+        buf1, buf2: unsigned byte arrays
+                    with rows of pixels
+        bits      : (1, 4, 8, 24) bits
+        x1, x2    : first and last pixel
+                    of the run
+
+    Returns:
+        (unsigned byte array,
+         unsigned byte array)
+    """
+    buf1 = array('B', buf1)
+    buf2 = array('B', buf2)
+    if bits >= 8:
+        bpp = bits >> 3
+        (s, e) = (x1 * bpp, (x2 + 1) * bpp)
+        buf1[s: e], buf2[s: e] = buf2[s: e], buf1[s: e]
+        return (buf1, buf2)
+    (b1, b2, a, b) = _runbits(bits, x1, x2)
+    n = b2 - b1 + 1
+    m = _bitmask(n << 3, a, b)
+    v1 = int.from_bytes(buf1[b1: b2 + 1], 'big')
+    v2 = int.from_bytes(buf2[b1: b2 + 1], 'big')
+    buf1[b1: b2 + 1] = array('B',
+        ((v1 & ~m) | (v2 & m)).to_bytes(n, 'big'))
+    buf2[b1: b2 + 1] = array('B',
+        ((v2 & ~m) | (v1 & m)).to_bytes(n, 'big'))
+    return (buf1, buf2)
 
 
 def flip24bitbuf(buf: array) -> array:
@@ -203,6 +203,112 @@ def pack4bitbuf(
     return retval
 
 
+def unpack1bitbuf(buf: list[int]
+                   ) -> list[int]:
+    """Unpacks a 1-bit buffer
+        into a list of ones and zeros
+        (most significant bit first)
+
+    Args:
+        buf: unsigned byte array
+
+    Returns:
+        list
+    """
+    retval = []
+    for b in buf:
+        retval += [(b >> 7) & 1, (b >> 6) & 1,
+                   (b >> 5) & 1, (b >> 4) & 1,
+                   (b >> 3) & 1, (b >> 2) & 1,
+                   (b >> 1) & 1, b & 1]
+    return retval
+
+
+def pack1bitbuf(
+        unpackedbuf: list[int]
+                ) -> list[int]:
+    """Packs a list of ones and zeros
+        into a list of bytes
+        (most significant bit first)
+
+    Args:
+        unpackedbuf: list of ones
+                     and zeros
+
+    Returns:
+        list
+    """
+    retval = []
+    j = len(unpackedbuf)
+    for i in range(0, j, 8):
+        b = 0
+        for bit in unpackedbuf[i: i + 8]:
+            b = (b << 1) + bit
+        retval += [b << (8 - min(8, j - i))]
+    return retval
+
+
+_nibbletables = (bytes(i >> 4 for i in range(256)),
+                 bytes(i & 15 for i in range(256)))
+_bittables = tuple(bytes((i >> (7 - j)) & 1
+                            for i in range(256))
+                   for j in range(8))
+_hinibbletable = bytes((i & 15) << 4 for i in range(256))
+_bintable = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def unpackrowindices(row: bytes,
+        bits: int, mx: int) -> bytes:
+    """Unpacks the palette indices
+        in a row of a 1, 4 or 8-bit
+        bitmap, one byte per pixel
+
+    Args:
+        row : raw row of pixel data
+        bits: bit depth
+        mx  : pixels in the row
+
+    Returns:
+        bytes
+    """
+    row = bytes(row)
+    if bits == 8:
+        return row[:mx]
+    t = _nibbletables if bits == 4 else _bittables
+    n = len(t)
+    buf = bytearray(len(row) * n)
+    for (i, table) in enumerate(t):
+        buf[i::n] = row.translate(table)
+    return bytes(buf[:mx])
+
+
+def packrowindices(idx: bytes,
+        bits: int) -> bytes:
+    """Packs palette indices, one byte
+        per pixel, into a row of a 1,
+        4 or 8-bit bitmap
+
+    Args:
+        idx : bytes of indices
+        bits: bit depth
+
+    Returns:
+        bytes (without row padding)
+    """
+    idx = bytes(idx)
+    if bits == 8 or not idx:
+        return idx
+    ppb = 8 // bits
+    n = -len(idx) % ppb
+    if bits == 4:
+        v = int.from_bytes(idx[0::2].translate(
+                _hinibbletable), 'big') | \
+            int.from_bytes(idx[1::2] + bytes(n), 'big')
+    else:
+        v = int(idx.translate(_bintable), 2) << n
+    return v.to_bytes((len(idx) + n) // ppb, 'big')
+
+
 def resize4bitbufNtimesbigger(
         buf: array, n: int
         ) -> array:
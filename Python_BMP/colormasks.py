@@ -0,0 +1,408 @@
+"""
+ Color mask module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+
+ Works on whole rows of pixel data
+ split into red, green and blue planes
+ (or NumPy arrays when installed)
+ A mask is a list of ints one per row
+ where bit x is set if pixel x of the
+ row is selected
+"""
+
+from itertools import islice
+from math import sqrt
+from operator import add, sub
+from re import finditer
+from .bufresize import unpackrowindices
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+_maxsqdist = 3 * 255 * 255
+_rowblockpixels = 1 << 18
+_sq = [i * i for i in range(256)] + \
+      [i * i for i in range(256, 0, -1)]
+_bintable = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def sqdistlimit(threshold: float,
+        inclusive: bool) -> int:
+    """Gets the largest squared distance
+        between two int colors that
+        is still within a threshold
+
+    Args:
+        threshold: color distance
+        inclusive: True  -> distance
+                            <= threshold
+                   False -> distance
+                            < threshold
+
+    Returns:
+        int (-1 if no distance is
+        within the threshold)
+    """
+    if threshold < 0:
+        return -1
+    s = int(min(threshold, 442) ** 2) + 1
+    s = min(s, _maxsqdist)
+    while s > -1 and (sqrt(s) > threshold
+            if inclusive else sqrt(s) >= threshold):
+        s -= 1
+    return s
+
+
+def boolbits(flags: list[bool]) -> int:
+    """Packs a sequence of flags into
+        the bits of an int
+
+    Args:
+        flags: bools or ones and zeros
+               (flag x -> bit x)
+
+    Returns:
+        int
+    """
+    s = bytes(flags).translate(_bintable)[::-1]
+    return int(s, 2) if s else 0
+
+
+def iterbitspans(mask: int):
+    """Yields the runs of set bits in an int
+
+    Args:
+        mask: int
+
+    Yields:
+        (first bit: int, last bit: int)
+    """
+    s = bin(mask)[:1:-1]
+    for m in finditer('1+', s):
+        yield (m.start(), m.end() - 1)
+
+
+def itermaskbits(mask: int):
+    """Yields the set bits in an int
+
+    Args:
+        mask: int
+
+    Yields:
+        bit: int
+    """
+    for (x1, x2) in iterbitspans(mask):
+        yield from range(x1, x2 + 1)
+
+
+def palRGBplanes(pal: list) -> tuple:
+    """Makes the lookup tables that turn
+        palette indices into red, green
+        and blue planes
+
+    Args:
+        pal: [(r, g, b), ...]
+
+    Returns:
+        (red table, green table,
+         blue table) 256 bytes each
+    """
+    pal = (list(pal) + [(0, 0, 0)] * 256)[:256]
+    return tuple(bytes(c[i] for c in pal)
+                 for i in range(3))
+
+
+def rowRGBplanes(row: bytes,
+        bits: int, mx: int,
+        palplanes: tuple = None) -> tuple:
+    """Splits a row of pixel data into
+        red, green and blue planes
+
+    Args:
+        row      : raw row of pixel data
+        bits     : bit depth
+        mx       : pixels in the row
+        palplanes: tables made by
+                   palRGBplanes for
+                   1, 4 and 8-bit rows
+
+    Returns:
+        (red: bytes, green: bytes,
+         blue: bytes)
+    """
+    if bits == 24:
+        row = bytes(row[:3 * mx])
+        return (row[2::3], row[1::3], row[0::3])
+    idx = unpackrowindices(row, bits, mx)
+    return tuple(idx.translate(t)
+                 for t in palplanes)
+
+
+def _sqdiffsums(p0: tuple, p1: tuple):
+    """Squared color distances of
+        two sets of planes
+    """
+    (r, g, b) = (map(_sq.__getitem__,
+                     map(sub, c0, c1))
+                 for (c0, c1) in zip(p0, p1))
+    return map(add, map(add, r, g), b)
+
+
+def pairdistmask(p0: tuple, p1: tuple,
+        limit: int) -> int:
+    """Finds the pixels in two sets
+        of planes that are further
+        apart in color than a limit
+
+    Args:
+        p0, p1: (red, green, blue)
+                planes of equal size
+        limit : squared distance
+                made by sqdistlimit
+
+    Returns:
+        int mask
+    """
+    return boolbits(map(limit.__lt__,
+                        _sqdiffsums(p0, p1)))
+
+
+def _isintrgb(rgb: list) -> bool:
+    return all(isinstance(c, int) for c in rgb)
+
+
+def _npRGBblock(rows: list, bits: int,
+        mx: int, pal: any) -> any:
+    """Decodes rows of pixel data into
+        a NumPy array of int colors
+        with shape (rows, mx, 3)
+    """
+    a = _np.frombuffer(b''.join(rows),
+            dtype=_np.uint8).reshape(len(rows), -1)
+    if bits == 24:
+        a = a[:, :3 * mx].reshape(len(rows),
+                                  mx, 3)[..., ::-1]
+        return a.astype(_np.int32)
+    if bits == 4:
+        a = _np.stack((a >> 4, a & 15),
+                      axis=2).reshape(len(rows), -1)
+    elif bits == 1:
+        a = _np.unpackbits(a, axis=1)
+    return pal[a[:, :mx]]
+
+
+def _npbits(flags: any) -> list[int]:
+    """Packs the rows of a NumPy bool
+        array into int masks
+    """
+    return [int.from_bytes(r.tobytes(), 'little')
+            for r in _np.packbits(flags, axis=1,
+                                  bitorder='little')]
+
+
+def _npblocks(rows, bits: int, mx: int,
+        pal: list, overlap: int = 0):
+    """Yields blocks of decoded rows as
+        NumPy arrays where each block
+        repeats the last overlap rows
+        of the one before it
+    """
+    pal = _np.array((list(pal) + [(0, 0, 0)] * 256)[:256],
+                    dtype=_np.int32) \
+          if bits < 24 else None
+    n = max(_rowblockpixels // max(mx, 1), 1)
+    rows = iter(rows)
+    last = None
+    while True:
+        block = [bytes(r) for r in islice(rows, n)]
+        if not block:
+            break
+        a = _npRGBblock(block, bits, mx, pal)
+        if last is not None:
+            a = _np.concatenate((last, a))
+        if overlap > 0:
+            last = a[-overlap:]
+        yield a
+
+
+def colordistmasks(rows, bits: int,
+        mx: int, pal: list,
+        rgb: list[int, int, int],
+        similaritythreshold: float
+        ) -> list[int]:
+    """Finds the pixels closer in color
+        to rgb than a threshold
+
+    Args:
+        rows     : raw rows of
+                   pixel data
+        bits     : bit depth
+        mx       : pixels per row
+        pal      : [(r, g, b), ...]
+                   palette for 1, 4
+                   and 8-bit rows
+        rgb      : (r: byte,
+                    g: byte,
+                    b: byte)
+        similaritythreshold:
+                   how close to the
+                   color a pixel is
+                   before it is
+                   selected
+
+    Returns:
+        list of int masks
+        one per row
+    """
+    if _isintrgb(rgb):
+        limit = sqdistlimit(
+                    similaritythreshold, False) + 1
+    else:
+        limit = similaritythreshold ** 2
+    if _np is not None:
+        masks = []
+        c = _np.array(rgb)
+        for a in _npblocks(rows, bits, mx, pal):
+            masks += _npbits(
+                ((a - c) ** 2).sum(axis=2) < limit)
+        return masks
+    isin = limit.__gt__
+    tables = [[(v - c) ** 2 for v in range(256)]
+              for c in rgb]
+    palplanes = palRGBplanes(pal) \
+                if bits < 24 else None
+    masks = []
+    for row in rows:
+        (r, g, b) = (map(t.__getitem__, p)
+                     for (t, p) in zip(tables,
+                        rowRGBplanes(row, bits,
+                                     mx, palplanes)))
+        masks.append(boolbits(map(isin,
+            map(add, map(add, r, g), b))))
+    return masks
+
+
+def _pairmasks(rows, bits: int, mx: int,
+        pal: list, limit: int) -> tuple:
+    """Finds the pixels that differ
+        from their right, lower,
+        lower right and lower left
+        neighbors
+
+    Returns:
+        (right, lower, lower right,
+         lower left) lists of int
+        masks where bit x of the
+        lower left mask is set
+        when pixels (x + 1, y) and
+        (x, y + 1) differ
+    """
+    (H, V, D, A) = ([], [], [], [])
+    if _np is not None:
+        skip = 0
+        for a in _npblocks(rows, bits, mx,
+                           pal, 1):
+            f = _np.zeros(a.shape[:2], dtype=bool)
+            f[:, :-1] = ((a[:, 1:] - a[:, :-1])
+                         ** 2).sum(axis=2) > limit
+            H += _npbits(f[skip:])
+            skip = 1
+            for (m, u, v) in ((V, a[1:], a[:-1]),
+                (D, a[1:, 1:], a[:-1, :-1]),
+                (A, a[:-1, 1:], a[1:, :-1])):
+                f = _np.zeros((len(a) - 1, mx), dtype=bool)
+                f[:, :u.shape[1]] = \
+                    ((u - v) ** 2).sum(axis=2) > limit
+                m += _npbits(f)
+        return (H, V, D, A)
+    palplanes = palRGBplanes(pal) \
+                if bits < 24 else None
+    p0 = None
+    for row in rows:
+        p1 = rowRGBplanes(row, bits, mx, palplanes)
+        H.append(pairdistmask(
+            [p[1:] for p in p1],
+            [p[:-1] for p in p1], limit))
+        if p0 is not None:
+            V.append(pairdistmask(p0, p1, limit))
+            D.append(pairdistmask(
+                [p[:-1] for p in p0],
+                [p[1:] for p in p1], limit))
+            A.append(pairdistmask(
+                [p[1:] for p in p0],
+                [p[:-1] for p in p1], limit))
+        p0 = p1
+    return (H, V, D, A)
+
+
+def edgemasks(rows, bits: int, mx: int,
+        pal: list,
+        similaritythreshold: float
+        ) -> list[int]:
+    """Finds the edges in rows of pixels
+        the same way as visiting every
+        pixel and selecting the first
+        neighbor that differs from it
+        by more than a threshold
+
+    Args:
+        rows     : raw rows of
+                   pixel data
+                   from the top
+        bits     : bit depth
+        mx       : pixels per row
+        pal      : [(r, g, b), ...]
+                   palette for 1, 4
+                   and 8-bit rows
+        similaritythreshold:
+                   how different a
+                   neighbor has to
+                   be to be an edge
+
+    Returns:
+        list of int masks
+        one per row
+    """
+    (H, V, D, A) = _pairmasks(rows, bits, mx, pal,
+        sqdistlimit(similaritythreshold, True))
+    my = len(H)
+    V.append(0)
+    D.append(0)
+    A.append(0)
+    full = (1 << mx) - 1
+    fromx2 = full & ~3
+    edges = [0] * my
+    for y in range(my):
+        if y > 1:
+            (n, nw, ne) = (V[y - 1],
+                (D[y - 1] << 1) & fromx2, A[y - 1])
+        else:
+            n = nw = ne = 0
+        left = full
+        for (m, dy, dx) in (
+                (n, -1, 0), (V[y], 1, 0),
+                (nw, -1, -1),
+                ((H[y] << 1) & fromx2, 0, -1),
+                ((A[y] << 1) & fromx2, 1, -1),
+                (ne, -1, 1), (H[y], 0, 1),
+                (D[y], 1, 1)):
+            m &= left
+            if m:
+                left ^= m
+                edges[y + dy] |= m << 1 if dx > 0 \
+                            else m >> 1 if dx < 0 \
+                            else m
+    return edges
@@ -0,0 +1,280 @@
+"""
+ Color quantization module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+"""
+
+from array import array
+from collections import Counter
+from typing import Iterable
+
+from .bufresize import(
+    pack1bitbuf,
+    pack4bitbuf
+    )
+
+from .colors import matchRGBtopalfunc
+
+
+_bayer4x4 = ((0, 8, 2, 10),
+             (12, 4, 14, 6),
+             (3, 11, 1, 9),
+             (15, 7, 13, 5))
+
+
+def colorhistfromBGRbufs(
+        bufs: Iterable[array]) -> Counter:
+    """Counts the colors in rows
+        of 24-bit BGR pixel data
+
+    Args:
+        bufs: iterable of unsigned
+              byte arrays holding
+              whole BGR pixels
+
+    Returns:
+        Counter of (r, g, b): count
+    """
+    hist = Counter()
+    for buf in bufs:
+        hist.update(zip(buf[2::3],
+                        buf[1::3],
+                        buf[0::3]))
+    return hist
+
+
+def _colorboxspread(items: list) -> tuple:
+    """Finds the widest channel
+        of a box of colors
+
+    Args:
+        items: list of
+               ((r, g, b), count)
+
+    Returns:
+        (range of widest channel,
+         channel, items)
+    """
+    spread = channel = 0
+    for ch in range(3):
+        vals = [i[0][ch] for i in items]
+        d = max(vals) - min(vals)
+        if d > spread:
+            spread = d
+            channel = ch
+    return (spread, channel, items)
+
+
+def _colorboxmean(items: list) -> list:
+    """Count weighted mean
+        of a box of colors
+
+    Args:
+        items: list of
+               ((r, g, b), count)
+
+    Returns:
+        [r: byte, g: byte, b: byte]
+    """
+    n = sum(i[1] for i in items)
+    return [(sum(i[0][ch] * i[1]
+                 for i in items) + (n >> 1)) // n
+            for ch in range(3)]
+
+
+def mediancutpal(hist: dict,
+        colors: int,
+        minspread: int = 0) -> list:
+    """Creates a palette by median cut
+        of a color histogram
+
+    Args:
+        hist     : dict of
+                   (r, g, b): count
+        colors   : number of
+                   palette entries
+        minspread: boxes of colors
+                   narrower than
+                   this are not split
+
+    Returns:
+        list[[r: byte, g: byte, b: byte]]
+        with colors entries
+        (unused entries are black)
+    """
+    boxes = []
+    if len(hist) > 0:
+        boxes.append(
+            _colorboxspread(list(hist.items())))
+    while 0 < len(boxes) < colors:
+        i = max(range(len(boxes)),
+                key=lambda j: boxes[j][0])
+        (spread, ch, items) = boxes[i]
+        if spread == 0 or spread < minspread:
+            break
+        items.sort(key=lambda j: j[0][ch])
+        half = sum(j[1] for j in items) / 2
+        n = k = 0
+        while k < len(items) - 2 and \
+            n + items[k][1] < half:
+            n += items[k][1]
+            k += 1
+        boxes[i: i + 1] = [
+            _colorboxspread(items[:k + 1]),
+            _colorboxspread(items[k + 1:])]
+    pal = sorted(_colorboxmean(b[2]) for b in boxes)
+    return pal + [[0, 0, 0]] * (colors - len(pal))
+
+
+def _packindexbuf(idx: list,
+        bits: int) -> array:
+    """Packs a row of palette indices
+
+    Args:
+        idx : list of int color vals
+        bits: bit depth (1, 4, 8)
+
+    Returns:
+        unsigned byte array
+    """
+    if bits == 4:
+        if len(idx) & 1:
+            idx.append(0)
+        idx = pack4bitbuf(idx)
+    elif bits == 1:
+        idx = pack1bitbuf(idx)
+    return array('B', idx)
+
+
+def _ditherspread(bits: int) -> int:
+    """Range of the ordered dither
+        offsets for a bit depth
+
+    Args:
+        bits: bit depth (1, 4, 8)
+
+    Returns:
+        int
+    """
+    return {1: 255, 4: 96, 8: 40}[bits]
+
+
+def _lum1bit(r: int, g: int, b: int) -> int:
+    """Luminance scaled by 1000
+
+    Args:
+        r, g, b: color values
+
+    Returns:
+        int
+    """
+    return r * 299 + g * 587 + b * 114
+
+
+def quantizeBGRbufs(bufs: Iterable[array],
+        x: int, pal: list, bits: int,
+        dither: str = 'none'):
+    """Converts rows of 24-bit BGR
+        pixel data to packed rows of
+        palette indices
+
+    Args:
+        bufs  : iterable of unsigned
+                byte arrays holding
+                x BGR pixels in
+                top to bottom order
+        x     : pixels per row
+        pal   : the bmp palette
+                to match
+                (for 1-bit index 1
+                must be the brighter
+                color)
+        bits  : bit depth (1, 4, 8)
+        dither: 'none',
+                'floydsteinberg'
+                or 'ordered'
+
+    Yields:
+        unsigned byte array of
+        packed color vals per row
+    """
+    if bits == 1:
+        match = None
+    else:
+        palmatch = matchRGBtopalfunc(pal)
+        cache = {}
+
+        def match(r: int, g: int, b: int) -> int:
+            k = (r, g, b)
+            c = cache.get(k)
+            if c is None:
+                c = cache[k] = palmatch([r, g, b])
+            return c
+
+    spread = _ditherspread(bits)
+    w = 3 * (x + 2)
+    nxt = [0] * w
+    for y, buf in enumerate(bufs):
+        if dither == 'floydsteinberg':
+            (cur, nxt) = (nxt, [0] * w)
+            idx = []
+            for i in range(x):
+                j = 3 * i
+                e = j + 3
+                r = min(max(buf[j + 2] +
+                    ((cur[e] + 8) >> 4), 0), 255)
+                g = min(max(buf[j + 1] +
+                    ((cur[e + 1] + 8) >> 4), 0), 255)
+                b = min(max(buf[j] +
+                    ((cur[e + 2] + 8) >> 4), 0), 255)
+                if match is None:
+                    c = int(_lum1bit(r, g, b) >= 127500)
+                    q = 255 * c
+                    errs = (r - q, g - q, b - q)
+                else:
+                    c = match(r, g, b)
+                    p = pal[c]
+                    errs = (r - p[0], g - p[1], b - p[2])
+                idx.append(c)
+                for ch, d in enumerate(errs):
+                    if d != 0:
+                        cur[e + ch + 3] += 7 * d
+                        nxt[e + ch - 3] += 3 * d
+                        nxt[e + ch] += 5 * d
+                        nxt[e + ch + 3] += d
+        elif dither == 'ordered':
+            row = _bayer4x4[y & 3]
+            offs = [(row[i & 3] * 2 - 15) * spread >> 5
+                    for i in range(4)]
+            idx = []
+            for i, (b, g, r) in enumerate(zip(buf[0::3],
+                                               buf[1::3],
+                                               buf[2::3])):
+                o = offs[i & 3]
+                r = min(max(r + o, 0), 255)
+                g = min(max(g + o, 0), 255)
+                b = min(max(b + o, 0), 255)
+                idx.append(
+                    int(_lum1bit(r, g, b) >= 127500)
+                    if match is None else match(r, g, b))
+        elif match is None:
+            idx = [int(_lum1bit(r, g, b) >= 127500)
+                   for (b, g, r) in zip(buf[0::3],
+                                        buf[1::3],
+                                        buf[2::3])]
+        else:
+            idx = [match(r, g, b)
+                   for (b, g, r) in zip(buf[0::3],
+                                        buf[1::3],
+                                        buf[2::3])]
+        yield _packindexbuf(idx, bits)
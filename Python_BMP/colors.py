@@ -14,8 +14,11 @@
  -----------------------------------
 """
 
+from operator import add, lshift
 from random import randint
+from typing import Callable
 from array import array
+from itertools import repeat
 from .conditionaltools import iif
 from .bmppal import(
     bmpstdpal,
@@ -23,7 +26,6 @@ from .bmppal import(
     )
 
 from .mathlib import(
-    addvect,
     distance,
     intscalarmulvect,
     intsetminmaxvec,
@@ -265,14 +267,10 @@ def matchRGBtodefault4bitpal(
     return color
 
 
-def matchRGBtopal(RGB: list,
-                  pal: list) -> int:
-    """Color matching from a 24-bit
-        palette to any 1, 4 or 8-bit
-        palette using Euclidean
-        distance minimization
-        in an rgb colorspace for
-        the closest color match
+def _matchRGBtopalsearch(RGB: list,
+                         pal: list) -> int:
+    """Linear search of a palette for the
+        closest color match to RGB
 
     Args:
         RGB: color byte values
@@ -282,7 +280,7 @@ def matchRGBtopal(RGB: list,
         pal: the bmp palette to match
 
     Returns:
-        int color val (4-bit)
+        int color val
     """
     c = i = 0
     d = 442
@@ -299,6 +297,128 @@ def matchRGBtopal(RGB: list,
     return c
 
 
+def _palmatchcells(pal: list) -> list:
+    """Lists the palette entries that could
+        be the closest match to any color in
+        each 32x32x32 cell of the rgb cube
+
+    Args:
+        pal: the bmp palette to match
+
+    Returns:
+        list of 512 tuples of
+        (index, r, g, b) in palette order
+    """
+    entries = [(i, p[0], p[1], p[2])
+               for i, p in enumerate(pal)
+               if p != [0,0,0]]
+    if entries == []:
+        return [()] * 512
+    near = [[], [], []]
+    far = [[], [], []]
+    for axis in range(3):
+        vals = [e[axis + 1] for e in entries]
+        for lo in range(0, 256, 32):
+            hi = lo + 31
+            near[axis].append(
+                [(lo - v) ** 2 if v < lo else
+                 (v - hi) ** 2 if v > hi else 0
+                 for v in vals])
+            far[axis].append(
+                [max(v - lo, hi - v) ** 2
+                 for v in vals])
+    cells = []
+    for r in range(8):
+        for g in range(8):
+            for b in range(8):
+                bound = min(map(sum, zip(far[0][r],
+                                         far[1][g],
+                                         far[2][b])))
+                cells.append(tuple(e for e, d in
+                    zip(entries, map(sum, zip(near[0][r],
+                                              near[1][g],
+                                              near[2][b])))
+                    if d <= bound))
+    return cells
+
+
+_palmatchcache = {}
+
+
+def matchRGBtopalfunc(pal: list) -> Callable:
+    """Gets a function that matches colors
+        to a palette like matchRGBtopal
+        using a lookup table built once
+        and cached for each palette
+
+    Args:
+        pal: the bmp palette to match
+
+    Returns:
+        function that takes a
+        [r: byte, g: byte, b: byte]
+        color and returns the
+        closest int color val
+    """
+    key = tuple(map(tuple, pal))
+    f = _palmatchcache.get(key)
+    if f is not None:
+        return f
+    pal = [p[:] for p in pal]
+    cells = _palmatchcells(pal)
+    memo = {}
+
+    def match(RGB: list) -> int:
+        k = tuple(RGB)
+        c = memo.get(k)
+        if c is not None:
+            return c
+        if len(k) != 3 or k == (0, 0, 0) or \
+            not all(type(v) == int and 0 <= v < 256
+                    for v in k):
+            return _matchRGBtopalsearch(RGB, pal)
+        (r, g, b) = k
+        c = 0
+        d = 195076
+        for i, pr, pg, pb in cells[
+                (r >> 5) << 6 | (g >> 5) << 3 | b >> 5]:
+            e = (r - pr) ** 2 + (g - pg) ** 2 + (b - pb) ** 2
+            if e < d:
+                c = i
+                d = e
+        if len(memo) > 65535:
+            memo.clear()
+        memo[k] = c
+        return c
+
+    if len(_palmatchcache) > 15:
+        _palmatchcache.clear()
+    _palmatchcache[key] = match
+    return match
+
+
+def matchRGBtopal(RGB: list,
+                  pal: list) -> int:
+    """Color matching from a 24-bit
+        palette to any 1, 4 or 8-bit
+        palette using Euclidean
+        distance minimization
+        in an rgb colorspace for
+        the closest color match
+
+    Args:
+        RGB: color byte values
+             [r: byte,
+              g: byte,
+              b: byte]
+        pal: the bmp palette to match
+
+    Returns:
+        int color val (4-bit)
+    """
+    return matchRGBtopalfunc(pal)(RGB)
+
+
 def RGBtoRGBfactorsandlum(
         rgb: list[int, int, int]
         ) -> list[list[float, float,
@@ -557,6 +677,72 @@ def colorfilter(
             rgb, rgbfactors), 0, 255)
 
 
+_lutcache = {}
+
+
+def _cachedlut(key: tuple,
+        func: Callable,
+        size: int = 256) -> bytes:
+    """Gets a byte lookup table of
+        func(i) for i in range(size)
+        building it only once for
+        each key
+
+    Args:
+        key : hashable name and
+              parameters of func
+        func: maps an int index
+              to a byte value
+        size: number of entries
+              256 for a byte to
+              byte table and 65536
+              for a table indexed
+              by (lum << 8) + byte
+
+    Returns:
+        bytes usable with
+        bytes.translate when
+        size is 256
+    """
+    t = _lutcache.get(key)
+    if t is None:
+        if len(_lutcache) > 63:
+            _lutcache.clear()
+        t = _lutcache[key] = \
+            array('B', map(func, range(size))).tobytes()
+    return t
+
+
+def _applylumlut(buf: array, lut: bytes):
+    """Applies a table indexed by
+        (lum << 8) + byte to the
+        BGR pixels of a buffer where
+        lum is the brightest channel
+        of each pixel
+
+    Args:
+        buf: unsigned byte array
+             holding BGR data
+        lut: 65536 entry table
+             (entries where byte
+             exceeds lum are
+             never read)
+
+    Returns:
+        byref unsigned byte array
+    """
+    m = len(buf) - len(buf) % 3
+    hi = list(map(lshift,
+             map(max, buf[0: m: 3],
+                      buf[1: m: 3],
+                      buf[2: m: 3]),
+             repeat(8)))
+    get = lut.__getitem__
+    for ch in range(3):
+        buf[ch: m: 3] = array('B',
+            map(get, map(add, hi, buf[ch: m: 3])))
+
+
 def applymonochromefiltertoBGRbuf(
         buf: array):
     """Apply a monochrome filter to a
@@ -630,11 +816,13 @@ def applycolorfiltertoBGRbuf(
         holding color BGR data
     """
     m = len(buf) - 1
-    buf[0 : m - 2 : 3], buf[1 : m - 1 : 3], buf[2:m:3] = (
-        array('B', intscalarmulvect(buf[: m - 2 : 3], rgbfactors[2])),
-        array('B', intscalarmulvect(buf[1 : m - 1 : 3], rgbfactors[1])),
-        array('B', intscalarmulvect(buf[2:m:3], rgbfactors[0])),
-    )
+    for ch, f in ((0, rgbfactors[2]),
+                  (1, rgbfactors[1]),
+                  (2, rgbfactors[0])):
+        lut = _cachedlut(('scale', f),
+                lambda v: round(v * f))
+        buf[ch: m - 2 + ch: 3] = array('B',
+            bytes(buf[ch: m - 2 + ch: 3]).translate(lut))
 
 
 def colorfiltertoBGRbuf(
@@ -678,18 +866,14 @@ def applygammaBGRbuf(
         holding gamma adjusted
         BGR data
     """
-    imax = len(buf)
-    for i in range(0, imax, 3):
-        lum = max(buf[i: i + 3])
-        if lum == 0:
-            lum = 1
+    def _gamma(i: int) -> int:
+        lum = (i >> 8) or 1
         f = int(((lum / 255) ** gamma) * 255) / \
                   lum
-        j = i + 1
-        k = i + 2
-        buf[i] = int(buf[i] * f) & 0xff
-        buf[j] = int(buf[j] * f) & 0xff
-        buf[k] = int(buf[k] * f) & 0xff
+        return int((i & 0xff) * f) & 0xff
+
+    _applylumlut(buf,
+        _cachedlut(('gamma', gamma), _gamma, 65536))
 
 
 def gammaBGRbuf(
@@ -777,8 +961,9 @@ def invertbitsinbuffer(buf: array
     Returns:
         bit flipped unsigned byte array
     """
-    return array('B', [b ^ 0xFF
-                   for b in buf])
+    return array('B', bytes(buf).translate(
+        _cachedlut(('invert',),
+            lambda v: v ^ 0xFF)))
 
 
 def applybrightnessadjtoBGRbuf(
@@ -801,8 +986,10 @@ def applybrightnessadjtoBGRbuf(
         holding brightness adjusted
         BGR data
     """
-    return array('B',setminmaxvec(addvect(buf,
-            intscalarmulvect(buf, percentadj / 100)), 0, 255))
+    f = percentadj / 100
+    return array('B', bytes(buf).translate(
+        _cachedlut(('brightness', f),
+            lambda v: setminmax(v + round(v * f), 0, 255))))
 
 
 def applythresholdadjtoBGRbuf(
@@ -825,21 +1012,24 @@ def applythresholdadjtoBGRbuf(
     """
     lummin = lumrange[0] & 0xff
     lummax = lumrange[1] & 0xff
-    m = len(buf)
-    for i in range(0, m, 3):
-        lum = max(buf[i:i+3])
-        f = 1
-        if lummin > lummax:
-            lummin, lummax = lummax, lummin
+    if lummin > lummax:
+        lummin, lummax = lummax, lummin
+
+    def _threshold(i: int) -> int:
+        lum = i >> 8
+        c = i & 0xff
+        if c > lum:
+            return 0
         if lum > 0:
             if lum < lummin:
-                f = lummin / lum
+                return int(lummin / lum * c)
             if lum > lummax:
-                f = lummax / lum
-        if f != 1:
-            buf[i] = int(f * buf[i])
-            buf[i + 1] = int(f * buf[i + 1])
-            buf[i + 2] = int(f * buf[i + 2])
+                return int(lummax / lum * c)
+        return c
+
+    _applylumlut(buf, _cachedlut(
+        ('threshold', lummin, lummax),
+        _threshold, 65536))
     return buf
 
 
@@ -883,6 +1073,25 @@ def makeBGRbuf(bbuf: array,
     return array('B', buf)
 
 
+def intlist2BGRbuf(clist: list[int]
+                   ) -> array:
+    """Converts a list of int colors
+        to a BGR buffer
+
+    Args:
+        clist: list of int color values
+
+    Returns:
+        unsigned byte array
+        holding BGR data
+    """
+    buf = array('B', bytes(len(clist) * 3))
+    buf[0::3] = array('B', [c & 0xff for c in clist])
+    buf[1::3] = array('B', [(c >> 8) & 0xff for c in clist])
+    buf[2::3] = array('B', [(c >> 16) & 0xff for c in clist])
+    return buf
+
+
 def RGB2HSL(r: int, g: int, b: int
            ) -> list[int, int, int]:
     """Converts an RGB value to HSL
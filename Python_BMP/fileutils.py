@@ -17,6 +17,8 @@
  -----------------------------------
 """
 
+from array import array
+from mmap import mmap
 from os.path import isfile
 from typing import Callable
 from .messages import sysmsg
@@ -62,3 +64,18 @@ def checklinks(func: Callable):
         else:
             print(sysmsg['filenotexist'])
     return(callf)
+
+
+class BMPmap(mmap):
+    """Memory mapped bitmap file
+        that reads slices as unsigned
+        byte arrays so functions that
+        take a bitmap in an unsigned
+        byte array can draw on it
+    """
+
+    def __getitem__(self, key):
+        v = super().__getitem__(key)
+        if isinstance(key, slice):
+            return array('B', v)
+        return v
@@ -18,7 +18,6 @@ from random import random
 from typing import Callable
 from .primitives2D import (
     sortrecpoints,
-    iif,
     isinrectbnd,
     regpolygonvert
     )
@@ -41,7 +40,13 @@ from .mathlib import (
     sign
     )
 
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
 _2pij = 2 * pi * 1j
+_rowblockpixels = 1 << 18
 
 def getIFSparams() -> dict:
     return {'fern':(((0, 0, 0, .16, 0, 0),
@@ -128,10 +133,14 @@ def iterIFS(
     (p0, p1, p2) = p[0:3]
     for _ in range(maxiter):
         j = random()
-        (a, b, c, d, e, f) = \
-            af[iif(j < p0, 0,
-               iif(j < p1, 1,
-               iif(j < p2, 2, 3)))]
+        if j < p0:
+            (a, b, c, d, e, f) = af[0]
+        elif j < p1:
+            (a, b, c, d, e, f) = af[1]
+        elif j < p2:
+            (a, b, c, d, e, f) = af[2]
+        else:
+            (a, b, c, d, e, f) = af[3]
         nx = a * x + b * y + e
         y  = c * x + d * y + f
         x = nx
@@ -528,6 +537,528 @@ def itermultifractalcomplexpar(
             yield (x, y, func(P, Q, c, d, maxiter))
 
 
+def isinmandelbrotbulb(P: float, Q: float) -> bool:
+    """Checks if a point is inside the main
+    cardioid or the period-2 bulb of the
+    Mandelbrot set (these never escape)
+
+    Args:
+        P : real part as float
+        Q : imaginary part as float
+
+    Returns:
+        True if inside the cardioid or bulb
+    """
+    x = P - 0.25
+    q = x * x + Q * Q
+    if q * (q + x) < 0.25 * Q * Q:
+        return True
+    x = P + 1
+    return x * x + Q * Q < 0.0625
+
+
+def _isnpexponent(d: any) -> bool:
+    """Checks if NumPy can iterate z**d
+    with the same results as Python
+
+    Args:
+        d : exponent
+
+    Returns:
+        True if NumPy is installed and
+        d is a small positive integer
+    """
+    return _np is not None and \
+        isinstance(d, (int, float)) and \
+        not isinstance(d, bool) and \
+        0 < d <= 100 and d == int(d)
+
+
+def _npcpowu(zr: any, zi: any, n: int) -> tuple:
+    """Raises arrays of complex numbers
+    split into real and imaginary parts
+    to a positive int power with the
+    same multiplication order that
+    Python uses for complex ** int
+
+    Args:
+        zr : real parts (numpy array)
+        zi : imaginary parts (numpy array)
+        n  : positive int exponent
+
+    Returns:
+        (real parts, imaginary parts)
+    """
+    rr = ri = None
+    mask = 1
+    while mask <= n:
+        if n & mask:
+            if rr is None: # 1 * p only flips signs of zeros
+                rr, ri = zr, zi
+            else:
+                rr, ri = rr * zr - ri * zi, \
+                         rr * zi + ri * zr
+        mask <<= 1
+        if mask <= n:
+            zr, zi = zr * zr - zi * zi, \
+                     zr * zi + zi * zr
+    return (rr, ri)
+
+
+def _npescapetime(zr: any, zi: any,
+        cr: any, ci: any,
+        d: int, maxiter: int,
+        conj: bool = False,
+        juliatest: bool = False,
+        active: any = None,
+        start: int = 0,
+        state: bool = False) -> any:
+    """Iterates z = z**d + c for many points
+    in lockstep and records the iteration
+    where each point escapes
+
+    Args:
+        zr, zi   : start values of z
+                   (numpy arrays)
+        cr, ci   : c as numpy arrays
+                   or as floats
+        d        : positive int exponent
+        maxiter  : when to break
+                   color compute
+        conj     : use conjugate of z
+                   (Multicorn)
+        juliatest: escape if z * conj(z) > 4
+                   instead of abs(z) > 2
+        active   : optional mask of points
+                   to iterate (others are
+                   set to maxiter)
+        start    : iterations already
+                   done to get z
+        state    : also return the points
+                   that did not escape
+
+    Returns:
+        numpy int array of escape iterations
+        or if state is True
+        (escape iterations,
+         indices of the points that
+         did not escape, their real
+         parts, their imaginary parts)
+    """
+    counts = _np.full(zr.size, maxiter, dtype=_np.int64)
+    idx = _np.arange(zr.size)
+    carr = _np.ndim(cr) > 0
+    if active is not None:
+        idx = idx[active]
+        zr = zr[active]
+        zi = zi[active]
+        if carr:
+            cr = cr[active]
+            ci = ci[active]
+    for i in range(start, maxiter):
+        if idx.size == 0:
+            break
+        if conj:
+            zi = -zi
+        zr, zi = _npcpowu(zr, zi, d)
+        zr = zr + cr
+        zi = zi + ci
+        if juliatest:
+            esc = zr * zr - zi * -zi > 4
+        else:
+            esc = _np.hypot(zr, zi) > 2
+        if esc.any():
+            counts[idx[esc]] = i
+            keep = ~esc
+            idx = idx[keep]
+            zr = zr[keep]
+            zi = zi[keep]
+            if carr:
+                cr = cr[keep]
+                ci = ci[keep]
+    if state:
+        return (counts, idx, zr, zi)
+    return counts
+
+
+def escapetimestate(
+        z: list[complex],
+        c: any,
+        d: float,
+        start: int, maxiter: int,
+        conj: bool = False,
+        juliatest: bool = False) -> tuple:
+    """Iterates z = z**d + c from where
+    an earlier run stopped and keeps
+    the last z of the points that did
+    not escape so it can be continued
+    again with a higher maxiter
+
+    Args:
+        z        : z of each point after
+                   start iterations
+                   (0 or the point itself
+                   when start is 0)
+        c        : c of each point as a
+                   list or one complex
+                   number for all of them
+        d        : exponent
+        start    : iterations already done
+        maxiter  : when to break
+                   color compute
+        conj     : use conjugate of z
+                   (Multicorn)
+        juliatest: escape if z * conj(z) > 4
+                   instead of abs(z) > 2
+
+    Returns:
+        ([i: int, ...] escape iteration of
+                       each point or -1
+                       if it did not escape,
+         [z: complex, ...] z of each point
+                       after its last
+                       iteration)
+    """
+    carr = isinstance(c, (list, tuple))
+    if _isnpexponent(d) and len(z) > 0:
+        a = _np.array(z, dtype=complex)
+        if carr:
+            b = _np.array(c, dtype=complex)
+            (cr, ci) = (b.real.copy(), b.imag.copy())
+        else:
+            (cr, ci) = (float(c.real), float(c.imag))
+        (counts, idx, zr, zi) = _npescapetime(
+            a.real.copy(), a.imag.copy(), cr, ci,
+            int(d), maxiter, conj, juliatest,
+            start=start, state=True)
+        counts[idx] = -1
+        z = list(z)
+        for (k, r, i) in zip(idx.tolist(),
+                zr.tolist(), zi.tolist()):
+            z[k] = complex(r, i)
+        return (counts.tolist(), z)
+    counts = []
+    last = []
+    for (k, zk) in enumerate(z):
+        ck = c[k] if carr else c
+        i = -1
+        for j in range(start, maxiter):
+            if conj:
+                zk = zk.conjugate()
+            zk = zk**d + ck
+            if (zk * zk.conjugate()).real > 4 \
+                if juliatest else abs(zk) > 2:
+                i = j
+                break
+        counts.append(i)
+        last.append(zk)
+    return (counts, last)
+
+
+def _npgrid(Plist: list[float],
+            Qlist: list[float]) -> tuple:
+    """Makes flat numpy arrays of the real
+    and imaginary parts of a block of
+    scanlines
+
+    Args:
+        Plist: real parts of a scanline
+        Qlist: imaginary part of each
+               scanline
+
+    Returns:
+        (real parts, imaginary parts)
+    """
+    return (_np.tile(_np.array(Plist, dtype=float), len(Qlist)),
+            _np.repeat(_np.array(Qlist, dtype=float), len(Plist)))
+
+
+def multibrotrows(
+        Plist: list[float],
+        Qlist: list[float],
+        d: float, maxiter: int
+        ) -> list[list[int]]:
+    """Multibrot Function applied
+    to whole scanlines at once
+
+    Args:
+        Plist  : real parts of a scanline
+        Qlist  : imaginary part of
+                 each scanline
+        d      : exponent
+        maxiter: when to break
+                 color compute
+
+    Returns:
+        [[int, ...], ...] one list per scanline
+    """
+    if _isnpexponent(d):
+        (cr, ci) = _npgrid(Plist, Qlist)
+        active = None
+        if d == 2:
+            x = cr - 0.25
+            q = x * x + ci * ci
+            b = cr + 1
+            active = ~((q * (q + x) < 0.25 * ci * ci) |
+                       (b * b + ci * ci < 0.0625))
+        z = _np.zeros(cr.size)
+        return _npescapetime(z, z, cr, ci, int(d), maxiter,
+                    active=active).reshape(
+                    len(Qlist), len(Plist)).tolist()
+    bulb = d == 2
+    return [[maxiter if bulb and isinmandelbrotbulb(P, Q) else
+             multibrot(P, Q, d, maxiter) for P in Plist]
+                                         for Q in Qlist]
+
+
+def multicornrows(
+        Plist: list[float],
+        Qlist: list[float],
+        d: float, maxiter: int
+        ) -> list[list[int]]:
+    """Multicorn Function applied
+    to whole scanlines at once
+
+    Args:
+        Plist  : real parts of a scanline
+        Qlist  : imaginary part of
+                 each scanline
+        d      : exponent
+        maxiter: when to break
+                 color compute
+
+    Returns:
+        [[int, ...], ...] one list per scanline
+    """
+    if _isnpexponent(d):
+        (cr, ci) = _npgrid(Plist, Qlist)
+        z = _np.zeros(cr.size)
+        return _npescapetime(z, z, cr, ci, int(d), maxiter,
+                    conj=True).reshape(
+                    len(Qlist), len(Plist)).tolist()
+    return [[multicorn(P, Q, d, maxiter) for P in Plist]
+                                         for Q in Qlist]
+
+
+def multijuliarows(
+        Plist: list[float],
+        Qlist: list[float],
+        c: complex,
+        d: float, maxiter: int
+        ) -> list[list[int]]:
+    """Multijulia Function applied
+    to whole scanlines at once
+
+    Args:
+        Plist  : real parts of a scanline
+        Qlist  : imaginary part of
+                 each scanline
+        c      : complex number
+        d      : exponent
+        maxiter: when to break
+                 color compute
+
+    Returns:
+        [[int, ...], ...] one list per scanline
+    """
+    if _isnpexponent(d):
+        (zr, zi) = _npgrid(Plist, Qlist)
+        return _npescapetime(zr, zi, float(c.real), float(c.imag),
+                    int(d), maxiter, juliatest=True).reshape(
+                    len(Qlist), len(Plist)).tolist()
+    return [[multijulia(P, Q, c, d, maxiter) for P in Plist]
+                                             for Q in Qlist]
+
+
+def newtonrows(
+        Plist: list[float],
+        Qlist: list[float],
+        d: list[Callable, Callable],
+        maxiter: int) -> list[list[tuple]]:
+    """Newton Function applied
+    to whole scanlines at once
+
+    Args:
+        Plist  : real parts of a scanline
+        Qlist  : imaginary part of
+                 each scanline
+        d      : function and derivative pair
+        maxiter: when to break
+                 color compute
+
+    Returns:
+        [[(root, iteration), ...], ...]
+        one list per scanline
+    """
+    f, fp = d
+    return [[newtonmethod(complex(P, Q), f, fp, maxiter)
+                for P in Plist] for Q in Qlist]
+
+
+def pointfunc2rowfunc(func: Callable) -> Callable:
+    """Makes a fractal scanline function
+    from a fractal point function
+
+    Args:
+        func: fractal function like
+              func(P, Q, d, maxiter)
+
+    Returns:
+        function like
+        func(Plist, Qlist, d, maxiter)
+        that returns one list per scanline
+    """
+    def rowfunc(Plist: list[float],
+                Qlist: list[float],
+                d: any, maxiter: int
+                ) -> list[list]:
+        return [[func(P, Q, d, maxiter) for P in Plist]
+                                        for Q in Qlist]
+    rowfunc.__name__ = rowfunc.__qualname__ = \
+        f'{func.__name__}rows'
+    return rowfunc
+
+
+tetrationrows = pointfunc2rowfunc(tetrationfn)
+sinjuliarows = pointfunc2rowfunc(sinjulia)
+cosjuliarows = pointfunc2rowfunc(cosjulia)
+spiraljuliarows = pointfunc2rowfunc(spiraljulia)
+lambdarows = pointfunc2rowfunc(lambdafn)
+multicirclerows = pointfunc2rowfunc(multicircle)
+xorrows = pointfunc2rowfunc(xorfn)
+xordivrows = pointfunc2rowfunc(xordivfn)
+barnsleytreerows = pointfunc2rowfunc(barnsleytree)
+_marekdragonrows = pointfunc2rowfunc(marekdragon)
+
+
+def marekdragonrows(
+        Plist: list[float],
+        Qlist: list[float],
+        d: float, maxiter: int
+        ) -> list[list[int]]:
+    """Marek Dragon Function applied
+    to whole scanlines at once
+
+    Args:
+        Plist  : real parts of a scanline
+        Qlist  : imaginary part of
+                 each scanline
+        d      : irrational number
+        maxiter: when to break
+                 color compute
+
+    Returns:
+        [[int, ...], ...] one list per scanline
+    """
+    return _marekdragonrows(Plist, Qlist,
+                exp(_2pij * d), maxiter)
+
+
+def _iterfractalrowblocks(
+        x1: int, y1: int,
+        x2: int, y2: int,
+        domain: list[float, float, float, float],
+        func: Callable,
+        clip: list[int, int] = None):
+    """Yields the scanlines of a fractal
+    computed a block of rows at a time
+
+    Args:
+        x1, y1, x2, y2: rectangular area
+                        to draw in
+        domain        : coordinates in real
+                        and imaginary plane
+        func          : function that maps
+                        (Plist, Qlist) to
+                        a list of rows
+        clip          : optional (maxx, maxy)
+                        pixels outside of
+                        0 <= x < maxx and
+                        0 <= y < maxy are
+                        not computed
+
+    Yields:
+        (x: int, y: int, [c, ...])
+    """
+    (Pmap, Qmap) = mapfractaldomain(x1, y1, x2, y2, domain)
+    if clip is not None:
+        (mx, my) = clip
+        Pmap = [v for v in Pmap if -1 < v[1] < mx]
+        Qmap = [v for v in Qmap if -1 < v[1] < my]
+    if len(Pmap) > 0:
+        x = Pmap[0][1]
+        P = [p for (p, _) in Pmap]
+        n = max(1, _rowblockpixels // len(P))
+        for i in range(0, len(Qmap), n):
+            blk = Qmap[i: i + n]
+            for ((_, y), row) in zip(blk,
+                    func(P, [q for (q, _) in blk])):
+                yield (x, y, row)
+
+
+def itermultifractalrows(
+        x1: int, y1: int,
+        x2: int, y2: int,
+        d: any,
+        func: Callable,
+        domain: list[float, float, float, float],
+        maxiter: int,
+        clip: list[int, int] = None):
+    """Yields a Multi Fractal one scanline at a time
+
+    Args:
+        x1, y1, x2, y2: rectangular area
+                        to draw in
+        d             : any paramater
+        func          : fractal scanline function
+                        like multibrotrows
+        domain        : coordinates in real
+                        and imaginary plane
+        maxiter       : when to break
+                        color compute
+        clip          : optional (maxx, maxy)
+                        screen limits
+
+    Yields:
+        (x: int, y: int, [c: int, ...])
+    """
+    return _iterfractalrowblocks(x1, y1, x2, y2, domain,
+        lambda P, Q: func(P, Q, d, maxiter), clip)
+
+
+def itermultifractalcomplexparrows(
+        x1: int, y1: int,
+        x2: int, y2: int,
+        c: complex,
+        d: float,
+        func: Callable,
+        domain: list[float, float, float, float],
+        maxiter: int,
+        clip: list[int, int] = None):
+    """Yields a Multi Fractal with a complex number
+    parameter one scanline at a time
+
+    Args:
+        x1, y1, x2, y2: rectangular area
+                        to draw in
+        c             : complex number
+        d             : power to raise z to
+        func          : fractal scanline function
+                        like multijuliarows
+        domain        : coordinates in real
+                        and imaginary plane
+        maxiter       : when to break
+                        color compute
+        clip          : optional (maxx, maxy)
+                        screen limits
+
+    Yields:
+        (x: int, y: int, [c: int, ...])
+    """
+    return _iterfractalrowblocks(x1, y1, x2, y2, domain,
+        lambda P, Q: func(P, Q, c, d, maxiter), clip)
+
+
 def itermandelbrot(
         x1: int, y1: int,
         x2: int, y2: int,
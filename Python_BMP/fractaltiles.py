@@ -0,0 +1,409 @@
+"""
+ Fractal tile cache module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+
+ A fractal view is cut into square
+ tiles of _tilesize pixels laid on a
+ grid that only depends on the domain
+ and the zoom level so views that are
+ panned or drawn again share tiles
+    zoom level 0 -> the real axis of
+                    the domain spans
+                    basesize pixels
+    zoom level n -> 2 ** n times that
+ Pixel (x, y) of a zoom level maps to
+ (Pmin + x * s, Qmin + y * s) like
+ mapfractaldomain does for a view
+"""
+
+from collections import OrderedDict
+from hashlib import sha1
+from marshal import dumps, loads
+from os import listdir, makedirs, path, remove
+from typing import Callable
+from .fractals import (
+    escapetimestate,
+    isinmandelbrotbulb,
+    multibrotrows,
+    multicornrows,
+    multijuliarows
+    )
+
+_tilesize = 64
+
+# (use conjugate of z, z starts at the
+#  point and c is a parameter) for the
+# scanline functions whose tiles can
+# be iterated further later on
+_resumablerowfuncs = {
+    multibrotrows: (False, False),
+    multicornrows: (True, False),
+    multijuliarows: (False, True)}
+
+
+class FractalTileCache:
+    """A least recently used cache of
+        fractal tiles kept in memory
+        or in files in a directory
+    """
+
+    def __init__(self,
+            maxtiles: int = 256,
+            directory: str = None):
+        """Makes an empty tile cache
+
+        Args:
+            maxtiles : the least recently
+                       used tiles are
+                       dropped when there
+                       are more than this
+            directory: keep the tiles in
+                       files here (they
+                       are found again
+                       by later caches
+                       in the directory)
+                       instead of memory
+        """
+        self.maxtiles = maxtiles
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._tiles = OrderedDict()
+        if directory is not None:
+            makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def _file(self, key: tuple) -> str:
+        return path.join(self.directory,
+            sha1(repr(key).encode()).hexdigest() + '.tile')
+
+    def get(self, key: tuple) -> any:
+        """Gets a tile and marks it as
+            the most recently used
+
+        Args:
+            key: tuple of the fractal
+                 function, parameters,
+                 zoom level and tile
+                 x and y
+
+        Returns:
+            the tile or None if it
+            is not in the cache
+        """
+        if self.directory is None:
+            tile = self._tiles.get(key)
+        else:
+            try:
+                with open(self._file(key), 'rb') as f:
+                    tile = loads(f.read())
+            except (OSError, EOFError, ValueError, TypeError):
+                tile = None
+        if tile is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+        else:
+            self._tiles[key] = None
+            self._evict()
+        return tile
+
+    def put(self, key: tuple, tile: any):
+        """Adds or replaces a tile and
+            drops the least recently
+            used ones over maxtiles
+
+        Args:
+            key : see get
+            tile: any value marshal
+                  can serialize
+        """
+        if self.directory is None:
+            self._tiles[key] = tile
+        else:
+            with open(self._file(key), 'wb') as f:
+                f.write(dumps(tile))
+            self._tiles[key] = None
+        self._tiles.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        while len(self._tiles) > max(self.maxtiles, 0):
+            (key, _) = self._tiles.popitem(last=False)
+            if self.directory is not None:
+                try:
+                    remove(self._file(key))
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Drops every tile (and the
+            tile files in the directory)
+        """
+        self._tiles.clear()
+        if self.directory is not None:
+            for f in listdir(self.directory):
+                if f.endswith('.tile'):
+                    try:
+                        remove(path.join(self.directory, f))
+                    except OSError:
+                        pass
+
+
+_fractaltilecache = FractalTileCache()
+
+
+def setfractaltilecache(
+        cache: FractalTileCache
+        ) -> FractalTileCache:
+    """Sets the tile cache used when
+        none is passed to the tile
+        renderers
+
+    Args:
+        cache: FractalTileCache
+
+    Returns:
+        the previous cache
+    """
+    global _fractaltilecache
+    old = _fractaltilecache
+    _fractaltilecache = cache
+    return old
+
+
+def getfractaltilecache(
+        cache: FractalTileCache = None
+        ) -> FractalTileCache:
+    """Gets the tile cache to use
+
+    Args:
+        cache: cache passed to
+               a renderer or None
+
+    Returns:
+        the cache passed in else the
+        one set by setfractaltilecache
+    """
+    return _fractaltilecache \
+        if cache is None else cache
+
+
+def fractaltilegrid(
+        domain: list[float, float, float, float],
+        zoom: int,
+        basesize: int = 256) -> tuple:
+    """Gets where the pixels of a
+        zoom level are in the
+        complex plane
+
+    Args:
+        domain  : coordinates in real
+                  and imaginary plane
+        zoom    : zoom level
+        basesize: pixels the real axis
+                  of the domain spans
+                  at zoom level 0
+
+    Returns:
+        (Pmin: float, Qmin: float,
+         pixel size: float)
+    """
+    (Pmax, Pmin, _, Qmin) = domain
+    return (Pmin, Qmin,
+        (Pmax - Pmin) / (basesize * 2 ** zoom))
+
+
+def _funcname(func: Callable) -> str:
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def _resumetile(tile: tuple,
+        P: list[float], Q: list[float],
+        d: any, c: complex,
+        func: Callable,
+        maxiter: int) -> tuple:
+    """Computes a tile of a resumable
+        fractal or iterates the points
+        of a cached tile that had not
+        escaped up to a higher maxiter
+
+    Returns:
+        (maxiter,
+         [i, ...] escape iteration of
+                  each pixel or -1,
+         [k, ...] pixels that are
+                  still iterating,
+         [z, ...] their z)
+    """
+    (conj, julia) = _resumablerowfuncs[func]
+    n = len(P)
+    if tile is None:
+        bulb = func == multibrotrows and d == 2
+        counts = [-1] * (n * len(Q))
+        live = [k for (k, (q, p)) in enumerate(
+                    (q, p) for q in Q for p in P)
+                if not (bulb and isinmandelbrotbulb(p, q))]
+        z = [complex(P[k % n], Q[k // n]) if julia
+             else 0j for k in live]
+        start = 0
+    else:
+        (start, counts, live, z) = tile
+        if start >= maxiter:
+            return tile
+        counts = list(counts)
+    pts = c if julia else \
+          [complex(P[k % n], Q[k // n]) for k in live]
+    (esc, z) = escapetimestate(z, pts, d,
+        start, maxiter, conj, julia)
+    (keep, zkeep) = ([], [])
+    for (k, i, zk) in zip(live, esc, z):
+        if i < 0:
+            keep.append(k)
+            zkeep.append(zk)
+        else:
+            counts[k] = i
+    return (maxiter, counts, keep, zkeep)
+
+
+def fractaltile(
+        tx: int, ty: int,
+        zoom: int,
+        d: any,
+        func: Callable,
+        domain: list[float, float, float, float],
+        maxiter: int,
+        c: complex = None,
+        basesize: int = 256,
+        cache: FractalTileCache = None
+        ) -> list[list]:
+    """Gets a tile of a fractal from the
+        cache or computes it
+
+    The tiles of multibrotrows,
+    multicornrows and multijuliarows
+    keep the points that had not escaped
+    so a higher maxiter only iterates
+    those further. Tiles of any other
+    scanline function are cached for
+    each maxiter
+
+    Args:
+        tx, ty  : tile on the grid of
+                  the zoom level
+        zoom    : zoom level
+        d       : any parameter
+        func    : fractal scanline
+                  function like
+                  multibrotrows
+        domain  : coordinates in real
+                  and imaginary plane
+        maxiter : when to break
+                  color compute
+        c       : complex number for
+                  functions like
+                  multijuliarows
+        basesize: pixels the real axis
+                  spans at zoom 0
+        cache   : FractalTileCache
+                  (default the one set
+                  by setfractaltilecache)
+
+    Returns:
+        [[c, ...], ...] _tilesize
+        rows of _tilesize values
+    """
+    cache = getfractaltilecache(cache)
+    (Pmin, Qmin, s) = fractaltilegrid(
+                        domain, zoom, basesize)
+    t = _tilesize
+    P = [Pmin + x * s for x in range(tx * t, tx * t + t)]
+    Q = [Qmin + y * s for y in range(ty * t, ty * t + t)]
+    key = (_funcname(func), d, c, tuple(domain),
+           basesize, zoom, tx, ty)
+    if func not in _resumablerowfuncs:
+        key += (maxiter,)
+        rows = cache.get(key)
+        if rows is None:
+            rows = func(P, Q, d, maxiter) if c is None \
+                   else func(P, Q, c, d, maxiter)
+            cache.put(key, rows)
+        return rows
+    tile = cache.get(key)
+    new = _resumetile(tile, P, Q, d, c, func, maxiter)
+    if new is not tile:
+        cache.put(key, new)
+    counts = new[1]
+    return [[maxiter if i < 0 or i >= maxiter else i
+                for i in counts[k: k + t]]
+                    for k in range(0, t * t, t)]
+
+
+def itertiledfractalrows(
+        x: int, y: int,
+        width: int, height: int,
+        zoom: int,
+        d: any,
+        func: Callable,
+        domain: list[float, float, float, float],
+        maxiter: int,
+        c: complex = None,
+        basesize: int = 256,
+        cache: FractalTileCache = None):
+    """Yields a view of a fractal one
+        scanline at a time built from
+        cached tiles
+
+    Args:
+        x, y         : top left pixel of
+                       the view on the grid
+                       of the zoom level
+        width, height: size of the view
+        zoom         : zoom level
+        d            : any parameter
+        func         : fractal scanline
+                       function like
+                       multibrotrows
+        domain       : coordinates in real
+                       and imaginary plane
+        maxiter      : when to break
+                       color compute
+        c            : complex number for
+                       functions like
+                       multijuliarows
+        basesize     : pixels the real
+                       axis spans at zoom 0
+        cache        : FractalTileCache
+
+    Yields:
+        (x: int, y: int, [c, ...])
+        in view coordinates
+    """
+    t = _tilesize
+    txs = range(x // t, (x + width - 1) // t + 1)
+    for ty in range(y // t, (y + height - 1) // t + 1):
+        tiles = [fractaltile(tx, ty, zoom, d, func,
+                    domain, maxiter, c, basesize, cache)
+                 for tx in txs]
+        for r in range(max(y, ty * t),
+                min(y + height, ty * t + t)):
+            row = []
+            for tile in tiles:
+                row += tile[r - ty * t]
+            s = x - txs[0] * t
+            yield (0, r - y, row[s: s + width])
@@ -34,4 +34,8 @@ sysmsg={'notBMP':'Error: Not a BMP file!',
         'notrect':'Error: Region is not rectangular!',
         'filedirnotexist':'Error: File or dirextory does not exist!',
         'filenotexist':'Error: Not a file or file does not exist!',
-        'inttypereq':'Error: Parameter(s) must be int'}
+        'inttypereq':'Error: Parameter(s) must be int',
+        'invalidfilter':'Error: Unknown resampling filter!',
+        'invalidsize':'Error: Width and height must be at least 1!',
+        'invalidshading':'Error: Shading must be flat or gouraud!',
+        'invalidzbuffer':'Error: Depth buffer does not match the bitmap size!'}
@@ -14,15 +14,23 @@
 """
 
 
+from bisect import bisect_right
+
 from math import(
     sin,
     cos,
     tanh,
     radians,
-    comb
+    comb,
+    atan2,
+    ceil,
+    inf,
+    pi,
+    sqrt
     )
 
 from numbers import Number
+from typing import Callable
 
 from .conditionaltools import(
     iif,
@@ -43,6 +51,7 @@ from .mathlib import (
     roundvectlist,
     scalarmulvect,
     setmax,
+    setmin,
     sign,
     subvect,
     vmag
@@ -283,6 +292,26 @@ def iterellipse(x: int, y: int,
         yield from mirror1stquad(x,y,p)
 
 
+def ellipserowhalfwidths(b: int,
+        a: int) -> list[int]:
+    """Half widths of the rows
+    of a filled ellipse the way
+    iterellipsepart traces it
+
+    Args:
+        b, a: major and minor axes
+
+    Returns:
+        list[int] indexed by the
+        row distance from the center
+    """
+    w = [0] * (b + 1)
+    for (x, y) in iterellipsepart(b, a):
+        if x > w[y]:
+            w[y] = x
+    return w
+
+
 def iterellipserot(x: int, y: int,
                    b: int, a: int,
                    degrot: float):
@@ -326,6 +355,251 @@ def itercircle(x: int, y: int,
         yield from mirror1stquad(x, y, p)
 
 
+def circlerowhalfwidths(r: int) -> list[int]:
+    """Half widths of the rows
+    of a filled circle the way
+    itercirclepartlineedge traces it
+
+    Args:
+        r: int radius
+
+    Returns:
+        list[int] indexed by the
+        row distance from the center
+    """
+    w = [0] * (r + 1)
+    for (x, y) in itercirclepartlineedge(r):
+        w[y] = x
+    return w
+
+
+def iterpenspans(pnts: list[list[int, int]],
+        penradius: int,
+        xmax: int, ymax: int
+        ) -> list[int, int, int]:
+    """Yields the horizontal spans
+    covered by a round pen stamped
+    at every point in pnts with
+    each covered pixel in one span
+
+    Args:
+        pnts     : [[x: int, y: int], ...]
+                   pen centers
+        penradius: int radius of pen
+        xmax,ymax: spans are clipped
+                   to 0 <= x < xmax
+                   and 0 <= y < ymax
+
+    Yields:
+        [y: int, xstart: int, xend: int]
+        in top to bottom order
+    """
+    w = circlerowhalfwidths(penradius)
+    cols = {}
+    for (x, y) in pnts:
+        if y not in cols:
+            cols[y] = set()
+        cols[y].add(x)
+    rows = {}
+    for (cy, xs) in cols.items():
+        xs = sorted(xs)
+        xs.append(None)
+        x1 = x2 = xs[0]
+        for x in xs[1:]:
+            if x == x2 + 1:
+                x2 = x
+                continue
+            for d in range(-penradius, penradius + 1):
+                y = cy + d
+                if 0 <= y < ymax:
+                    v = w[abs(d)]
+                    if y not in rows:
+                        rows[y] = []
+                    rows[y].append((x1 - v, x2 + v))
+            x1 = x2 = x
+    xmax -= 1
+    for y in sorted(rows):
+        spans = sorted(rows[y])
+        (x1, x2) = spans[0]
+        for (s, e) in spans[1:]:
+            if s > x2 + 1:
+                if x2 >= 0 and x1 <= xmax:
+                    yield [y, setmin(x1, 0),
+                              setmax(x2, xmax)]
+                x1 = s
+            if e > x2:
+                x2 = e
+        if x2 >= 0 and x1 <= xmax:
+            yield [y, setmin(x1, 0),
+                      setmax(x2, xmax)]
+
+
+def itersectorspans(x: int, y: int,
+        r: int, degangles: list[float],
+        xmax: int, ymax: int
+        ) -> list[int, int, int, int]:
+    """Yields the horizontal spans
+    of a filled circle split into
+    sectors in one pass over its rows
+
+    Args:
+        x, y     : int centerpoint
+                   coordinates
+        r        : int radius
+        degangles: ascending angles in
+                   degrees clockwise from
+                   12 o'clock where sector
+                   i goes from degangles[i]
+                   to degangles[i + 1]
+        xmax,ymax: spans are clipped
+                   to 0 <= x < xmax
+                   and 0 <= y < ymax
+
+    Yields:
+        [y: int, xstart: int,
+         xend: int, sector: int]
+        pixels outside the sectors
+        are left out
+    """
+    angles = [radians(a) for a in degangles]
+    n = len(angles) - 1
+    rays = [(sin(a), -cos(a)) for a in angles]
+    hw = circlerowhalfwidths(r)
+    for py in range(setmin(y - r, 0),
+                    setmax(y + r + 1, ymax)):
+        dy = py - y
+        w = hw[abs(dy)]
+        lo = setmin(x - w, 0)
+        hi = setmax(x + w + 1, xmax)
+        if lo >= hi:
+            continue
+        # pixels go to the piece of the
+        # row their centers fall in so
+        # the sector of a piece can be
+        # found from its middle
+        cuts = {lo, hi, x, x + 1}
+        for (sx, sy) in rays:
+            if sy != 0 and dy * sy > 0:
+                cuts.add(x + dy / sy * sx)
+        cuts = sorted(c for c in cuts if lo <= c <= hi)
+        span = None
+        for (c1, c2) in zip(cuts, cuts[1:]):
+            x1 = ceil(c1)
+            x2 = ceil(c2) - 1
+            if x1 > x2:
+                continue
+            a = atan2((c1 + c2) / 2 - x, -dy)
+            if a < 0:
+                a += 2 * pi
+            i = bisect_right(angles, a) - 1
+            if i >= n:
+                i = -1
+            if span is not None:
+                if span[3] == i:
+                    span[2] = x2
+                    continue
+                if span[3] > -1:
+                    yield span
+            span = [py, x1, x2, i]
+        if span is not None and span[3] > -1:
+            yield span
+
+
+def segdistsqrfunc(
+        segs: list[list[list[int, int]]],
+        penradius: int) -> Callable:
+    """Makes a function that gives
+    the squared distances of a run
+    of pixels to the nearest of
+    a list of line segments
+
+    Args:
+        segs     : [[p1, p2], ...]
+                   line segments with
+                   [x: int, y: int]
+                   endpoints
+        penradius: only rows within
+                   this distance
+                   of a segment
+                   are looked up
+
+    Returns:
+        function(y, x1, x2) that
+        returns a list of floats
+        for pixels x1 to x2 in row y
+        (inf or a distance past
+        penradius for pixels that
+        are further than penradius
+        from every segment)
+    """
+    r = penradius + 1
+    rows = {}
+    for (p1, p2) in segs:
+        (ax, ay) = p1
+        (ux, uy) = subvect(p2, p1)
+        seg = (ax, ay, ux, uy, ux * ux + uy * uy)
+        for y in range(min(ay, ay + uy) - r,
+                       max(ay, ay + uy) + r + 1):
+            if y not in rows:
+                rows[y] = []
+            rows[y].append(seg)
+
+    def distsqr(y: int, x1: int, x2: int) -> list[float]:
+        dists = [inf] * (x2 - x1 + 1)
+        for (ax, ay, ux, uy, l2) in rows.get(y, []):
+            ey = y - ay
+            # only the pixels near the part
+            # of the segment within r rows
+            # of y can be within r of it
+            if uy == 0:
+                (t1, t2) = (0, 1)
+            else:
+                (t1, t2) = sorted(((ey - r) / uy,
+                                   (ey + r) / uy))
+                (t1, t2) = (max(t1, 0), min(t2, 1))
+            (xa, xb) = sorted((ax + ux * t1, ax + ux * t2))
+            for x in range(max(x1, int(xa) - r),
+                           min(x2, ceil(xb) + r) + 1):
+                ex = x - ax
+                t = ex * ux + ey * uy
+                if t <= 0:
+                    d = ex * ex + ey * ey
+                elif t >= l2:
+                    ex -= ux
+                    d = ex * ex + (ey - uy) ** 2
+                else:
+                    d = (ex * uy - ey * ux) ** 2 / l2
+                if d < dists[x - x1]:
+                    dists[x - x1] = d
+        return dists
+
+    return distsqr
+
+
+def circledistsqrfunc(x: int, y: int,
+        r: int) -> Callable:
+    """Makes a function that gives
+    the squared distances of a run
+    of pixels to a circle
+
+    Args:
+        x, y: int centerpoint
+              coordinates
+        r   : int radius
+
+    Returns:
+        function(y, x1, x2) that
+        returns a list of floats
+        for pixels x1 to x2 in row y
+    """
+    def distsqr(py: int, x1: int, x2: int) -> list[float]:
+        dy = (py - y) ** 2
+        return [(sqrt((px - x) ** 2 + dy) - r) ** 2
+                for px in range(x1, x2 + 1)]
+
+    return distsqr
+
+
 def _bezierblend(i: int, n: int, u: int):
     return comb(n, i) * (u ** i) * \
               ((1 - u) ** (n - i))
@@ -13,8 +13,19 @@
  -----------------------------------
 """
 
-from time import process_time_ns
+import json
+import logging
+from contextlib import contextmanager
+from time import perf_counter_ns, process_time_ns
 from functools import wraps
+from typing import Callable
+
+
+_profilesink = None
+
+_profilestack = []
+
+profilecounters = ('pixels', 'bytesread', 'byteswritten')
 
 
 def elaspedtimeinseconds(inittime):
@@ -54,8 +65,92 @@ def hhmmsselaspedtime(inittime: int
     ) + str(ns)
 
 
+def setprofilesink(sink: Callable = None
+        ) -> Callable:
+    """Turns profiling of the functions
+        decorated with functimer on
+        for every call or off
+
+    Args:
+        sink: function called with the
+              record of each profiled
+              call like statssink,
+              loggingsink or printsink
+              (None -> profiling off)
+
+    Returns:
+        the previous sink or None
+    """
+    global _profilesink
+    old = _profilesink
+    _profilesink = sink
+    return old
+
+
+def getprofilesink() -> Callable:
+    """Gets the sink that profiled
+        calls are sent to
+
+    Returns:
+        sink function or None
+        if profiling is off
+    """
+    return _profilesink
+
+
+@contextmanager
+def profiling(sink: Callable):
+    """Profiles only the calls made
+        in a with block
+
+        with profiling(statssink(st)):
+            invertbits2file(f1, f2)
+
+    Args:
+        sink: function called with the
+              record of each profiled
+              call
+
+    Yields:
+        the sink
+    """
+    old = setprofilesink(sink)
+    try:
+        yield sink
+    finally:
+        setprofilesink(old)
+
+
+def countprofile(pixels: int = 0,
+        bytesread: int = 0,
+        byteswritten: int = 0):
+    """Adds to the counters of the
+        profiled calls in progress
+        (does nothing if profiling
+        is off)
+
+    Args:
+        pixels      : pixels processed
+        bytesread   : bytes read
+        byteswritten: bytes written
+
+    Returns:
+        None
+    """
+    for r in _profilestack:
+        r['pixels'] += pixels
+        r['bytesread'] += bytesread
+        r['byteswritten'] += byteswritten
+
+
 def functimer(func):
     """Function timer Decorator
+        that sends the wall and
+        processor time and the
+        counters of each call to
+        the profile sink
+        (costs one test when
+        profiling is off)
 
     Args:
         function
@@ -66,10 +161,115 @@ def functimer(func):
     """
     @wraps(func)
     def callf(*args, **kwargs):
-        print((f'Applying {func.__name__}' + ' please wait...'))
-        inittime = process_time_ns()
-        r = func(*args, **kwargs)
-        print("Done in: " + \
-               hhmmsselaspedtime(inittime))
-        return(r)
+        sink = _profilesink
+        if sink is None:
+            return func(*args, **kwargs)
+        r = {'func': func.__name__,
+             'pixels': 0, 'bytesread': 0,
+             'byteswritten': 0}
+        _profilestack.append(r)
+        initcpu = process_time_ns()
+        inittime = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            r['wall'] = (perf_counter_ns() -
+                         inittime) / 1000000000
+            r['cpu'] = (process_time_ns() -
+                        initcpu) / 1000000000
+            _profilestack.pop()
+            sink(r)
     return(callf)
+
+
+def printsink(r: dict):
+    """Profile sink that prints
+        the time of each call
+
+    Args:
+        r: record of a profiled call
+
+    Returns:
+        None
+    """
+    print(f"{r['func']} done in: " +
+          f"{r['wall']:.6f}s " +
+          f"(cpu {r['cpu']:.6f}s)")
+
+
+def loggingsink(logger: logging.Logger = None,
+        level: int = logging.INFO
+        ) -> Callable:
+    """Makes a profile sink that logs
+        each call
+
+    Args:
+        logger: logger to use
+                (default the logger
+                of this module)
+        level : logging level
+
+    Returns:
+        sink function
+    """
+    log = logger or logging.getLogger(__name__)
+
+    def sink(r: dict):
+        log.log(level,
+            '%s wall %.6fs cpu %.6fs '
+            'pixels %d read %d written %d',
+            r['func'], r['wall'], r['cpu'],
+            r['pixels'], r['bytesread'],
+            r['byteswritten'])
+    return sink
+
+
+def statssink(stats: dict) -> Callable:
+    """Makes a profile sink that adds
+        up the calls of each function
+
+    Args:
+        stats: dict to hold the totals
+               keyed by function name
+               each a dict with
+               'calls', 'wall',
+               'maxwall', 'cpu',
+               'maxcpu', 'pixels',
+               'bytesread' and
+               'byteswritten'
+
+    Returns:
+        sink function
+    """
+    def sink(r: dict):
+        s = stats.get(r['func'])
+        if s is None:
+            s = stats[r['func']] = \
+                dict.fromkeys(('calls', 'wall',
+                    'maxwall', 'cpu', 'maxcpu') +
+                    profilecounters, 0)
+        s['calls'] += 1
+        s['wall'] += r['wall']
+        s['cpu'] += r['cpu']
+        s['maxwall'] = max(s['maxwall'], r['wall'])
+        s['maxcpu'] = max(s['maxcpu'], r['cpu'])
+        for k in profilecounters:
+            s[k] += r[k]
+    return sink
+
+
+def saveprofilestats2JSON(file: str,
+        stats: dict):
+    """Saves the totals gathered
+        by a statssink as JSON
+
+    Args:
+        file : new JSON file
+        stats: dict from statssink
+
+    Returns:
+        a JSON file
+    """
+    with open(file, 'w') as f:
+        json.dump(stats, f, indent=1,
+                  sort_keys=True)
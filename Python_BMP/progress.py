@@ -0,0 +1,213 @@
+"""
+ Progress reporting module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+
+ A progress reporter is a function
+ called as reporter(msg, done, total)
+    done == 0     -> process starts
+                     msg is the
+                     wait message
+    done < total  -> rows processed
+                     msg is the row
+                     indicator
+    done == total -> process ends
+                     msg is the
+                     finish message
+ Nothing is reported (and nothing is
+ written to the terminal) when no
+ reporter is set which is the default
+"""
+
+import logging
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable
+
+
+_progressreporter = None
+
+
+def setprogressreporter(
+        reporter: Callable = None
+        ) -> Callable:
+    """Sets the progress reporter used
+        by the image iterators when
+        none is passed to them
+
+    Args:
+        reporter: function called as
+                  reporter(msg, done,
+                  total) like the ones
+                  made by printprogress
+                  (None -> quiet)
+
+    Returns:
+        the previous reporter or None
+    """
+    global _progressreporter
+    old = _progressreporter
+    _progressreporter = reporter
+    return old
+
+
+def getprogressreporter(
+        reporter: Callable = None
+        ) -> Callable:
+    """Gets the progress reporter
+        to use for a call
+
+    Args:
+        reporter: reporter passed to
+                  the call or None
+
+    Returns:
+        the reporter passed in,
+        else the one set by
+        setprogressreporter,
+        else None
+    """
+    return _progressreporter \
+        if reporter is None else reporter
+
+
+@contextmanager
+def progressreporting(reporter: Callable):
+    """Reports progress only in
+        a with block
+
+    Args:
+        reporter: function called as
+                  reporter(msg, done,
+                  total)
+
+    Yields:
+        the reporter
+    """
+    old = setprogressreporter(reporter)
+    try:
+        yield reporter
+    finally:
+        setprogressreporter(old)
+
+
+def throttleprogress(reporter: Callable,
+        rows: int = 0,
+        interval: float = 0
+        ) -> Callable:
+    """Makes a reporter that passes on
+        the start and the end but
+        only some of the row updates
+
+    Args:
+        reporter: reporter to pass
+                  the updates on to
+        rows    : pass on an update
+                  only after this
+                  many more rows
+                  are done
+        interval: and only after this
+                  many seconds have
+                  passed since the
+                  last update
+
+    Returns:
+        reporter function
+    """
+    last = [0, 0.0]
+
+    def throttled(msg: str,
+            done: int, total: int):
+        if 0 < done < total:
+            if done - last[0] < rows:
+                return
+            t = perf_counter()
+            if t - last[1] < interval:
+                return
+            last[1] = t
+        else:
+            last[1] = perf_counter()
+        last[0] = done
+        reporter(msg, done, total)
+    return throttled
+
+
+def printprogress(rows: int = 1,
+        interval: float = 0,
+        file=None) -> Callable:
+    """Makes a reporter that prints
+        the wait message, the row
+        indicator for every update
+        and the finish message
+
+    Args:
+        rows    : rows per indicator
+        interval: least seconds
+                  between indicators
+        file    : where to print
+                  (default stdout)
+
+    Returns:
+        reporter function
+    """
+    def printer(msg: str,
+            done: int, total: int):
+        if done == 0:
+            if msg != '':
+                print(msg, file=file)
+        elif done < total:
+            print(msg, end='', file=file,
+                  flush=True)
+        else:
+            print('\n', file=file)
+            if msg != '':
+                print(msg, file=file)
+    return throttleprogress(printer,
+                            rows, interval)
+
+
+def loggingprogress(
+        logger: logging.Logger = None,
+        level: int = logging.INFO,
+        rows: int = 0,
+        interval: float = 1
+        ) -> Callable:
+    """Makes a reporter that logs
+        the messages and how many
+        rows are done
+
+    Args:
+        logger  : logger to use
+                  (default the logger
+                  of this module)
+        level   : logging level
+        rows    : least rows between
+                  updates
+        interval: least seconds
+                  between updates
+
+    Returns:
+        reporter function
+    """
+    log = logger or logging.getLogger(__name__)
+
+    def logrows(msg: str,
+            done: int, total: int):
+        if done == 0 or done >= total:
+            if msg != '':
+                log.log(level, msg)
+        else:
+            log.log(level, '%d of %d rows done',
+                    done, total)
+    return throttleprogress(logrows,
+                            rows, interval)
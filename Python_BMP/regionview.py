@@ -0,0 +1,173 @@
+"""
+ Rectangular region view module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+"""
+
+from array import array
+from .bmpconstants import(
+    bmpcolorbits,
+    bmpheadersizedict,
+    bmpx,
+    bmpy
+    )
+
+from .bufresize import(
+    packrowindices,
+    unpackrowindices
+    )
+
+
+class RegionView:
+    """A rectangular region of a bitmap
+        seen through a memoryview so
+        its rows can be read, written
+        and blitted without copies
+
+    Rows are numbered from the top of
+    the region down. Each row is the
+    run of bytes that holds the pixels
+    of the region (1 and 4-bit rows
+    may share their first and last
+    bytes with pixels outside it)
+    """
+
+    def __init__(self, bmp: array,
+            x1: int, y1: int,
+            x2: int, y2: int):
+        """Makes a view of a rectangle
+
+        Args:
+            bmp           : unsigned byte
+                            array with bmp
+                            format or a
+                            mapped bitmap
+            x1, y1, x2, y2: the rectangle
+                            (has to be in
+                            the bitmap)
+        """
+        (x1, x2) = (min(x1, x2), max(x1, x2))
+        (y1, y2) = (min(y1, y2), max(y1, y2))
+        self.buf = memoryview(bmp)
+        mx = int.from_bytes(self.buf[bmpx: bmpx + 4], 'little')
+        my = int.from_bytes(self.buf[bmpy: bmpy + 4], 'little')
+        bits = self.buf[bmpcolorbits]
+        r = ((mx * bits + 31) >> 5) << 2
+        s = (x1 * bits) >> 3
+        self.bits = bits
+        self.x = x1
+        self.y = y1
+        self.width = x2 - x1 + 1
+        self.height = y2 - y1 + 1
+        self.phase = (x1 * bits & 7) // bits \
+                     if bits < 8 else 0
+        self.rowbytes = ((x2 + 1) * bits + 7 >> 3) - s
+        self.stride = -r
+        self.offset = bmpheadersizedict[bits] + \
+                      (my - 1 - y1) * r + s
+
+    def __len__(self) -> int:
+        return self.height
+
+    def _rowoffset(self, i: int) -> int:
+        if i < 0:
+            i += self.height
+        if not 0 <= i < self.height:
+            raise IndexError(i)
+        return self.offset + i * self.stride
+
+    def __getitem__(self, i: int) -> memoryview:
+        """Gets row i as a memoryview
+            of the bitmap
+        """
+        s = self._rowoffset(i)
+        return self.buf[s: s + self.rowbytes]
+
+    def __setitem__(self, i: int, row: bytes):
+        """Overwrites row i with
+            the same number of bytes
+        """
+        s = self._rowoffset(i)
+        self.buf[s: s + self.rowbytes] = row
+
+    def __iter__(self):
+        """Yields the rows from the top
+            down as memoryviews
+        """
+        for s in range(self.offset,
+                self.offset + self.height * self.stride,
+                self.stride):
+            yield self.buf[s: s + self.rowbytes]
+
+    def pixelrow(self, i: int) -> bytes:
+        """Gets the pixels of row i
+            (BGR bytes for 24-bit and
+            one index per pixel for the
+            other bit depths)
+        """
+        row = self[i]
+        if self.bits >= 8:
+            return row.tobytes()
+        return unpackrowindices(row, self.bits,
+            self.phase + self.width)[self.phase:]
+
+    def setpixelrow(self, i: int, px: bytes):
+        """Sets the pixels of row i from
+            bytes laid out like the ones
+            from pixelrow leaving the
+            pixels outside the region as
+            they are
+        """
+        if self.bits >= 8:
+            self[i] = px
+            return
+        row = self[i]
+        n = len(row) * 8 // self.bits
+        idx = bytearray(unpackrowindices(
+                row, self.bits, n))
+        idx[self.phase: self.phase + self.width] = px
+        row[:] = packrowindices(idx, self.bits)
+
+    def tobytes(self) -> bytes:
+        """Copies the rows from the
+            top down into one buffer
+        """
+        return b''.join(self)
+
+    def blit(self, bmp: array,
+            x: int, y: int):
+        """Copies the region to (x, y) in
+            a bitmap of the same bit depth
+            with one slice assignment
+            per row
+
+        Args:
+            bmp : unsigned byte array
+                  with bmp format
+            x, y: where the top left
+                  corner goes (the
+                  whole region has to
+                  fit in the bitmap)
+        """
+        dst = RegionView(bmp, x, y,
+                x + self.width - 1,
+                y + self.height - 1)
+        rows = range(self.height)
+        if dst.buf.obj is self.buf.obj and y > self.y:
+            rows = reversed(rows)
+        if self.bits >= 8:
+            for i in rows:
+                dst[i] = self[i]
+        else:
+            for i in rows:
+                dst.setpixelrow(i, self.pixelrow(i))
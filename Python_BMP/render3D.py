@@ -0,0 +1,420 @@
+"""
+ Depth buffered 3D rendering module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+
+ Turns the vertices and sides of a
+ solid into spans of pixels on a
+ screen of mx by my pixels that are
+ nearer to the observer than what
+ was drawn there before
+    vertices are rotated, moved and
+    projected all at once like
+    perspective does one at a time
+    sides are cut into triangles
+    that are filled a row at a time
+ A depth buffer holds 1 / z of the
+ nearest surface drawn at each pixel
+ (0 where nothing is drawn) since
+ 1 / z changes linearly across the
+ screen and nearer surfaces have
+ larger values
+"""
+
+from array import array
+from math import ceil, sqrt
+from operator import gt
+from .colormasks import(
+    boolbits,
+    iterbitspans
+    )
+
+from .mathlib import(
+    getnormvec,
+    roundvect
+    )
+
+from .primitives2D import iterline
+from .solids3D import surfacetest
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+# how much further than the depth in
+# the buffer an outline pixel can be
+# and still be seen
+_outlinebias = 1 / 512
+
+
+def newzbuffer(mx: int, my: int) -> array:
+    """Makes an empty depth buffer
+
+    Args:
+        mx, my: size of the screen
+                (see getmaxxy)
+
+    Returns:
+        array('f') of mx * my zeros
+        one per pixel from the top
+        row down
+    """
+    return array('f', bytes(mx * my * 4))
+
+
+def _rotmove(px: any, py: any, pz: any,
+        rotvec: list, dispvec: list) -> tuple:
+    """Rotates and moves vertices
+        (floats or NumPy arrays)
+    """
+    ((sroll, croll),
+    (spitch, cpitch),
+    (syaw, cyaw)) = rotvec
+    x1 = -cyaw * px - syaw * pz
+    y1 = croll * py - sroll * x1
+    z1 = -syaw * px + cyaw * pz
+    return (croll * x1 + sroll * py + dispvec[0],
+            spitch * z1 + cpitch * y1 + dispvec[1],
+            cpitch * z1 - spitch * y1 + dispvec[2])
+
+
+def transformvertices(
+        vlist: list[list[float,
+                         float,
+                         float]],
+        rotvec: list[list[float, float],
+                     list[float, float],
+                     list[float, float]],
+        dispvec: list[float,
+                      float,
+                      float],
+        d: float) -> tuple:
+    """Rotates, moves and projects a
+        list of 3D vertices in one
+        step (same results as
+        perspective)
+
+    Args:
+        vlist  : list of 3D vertices
+        rotvec : 3D rotation vector
+        dispvec: 3D translation vector
+        d      : Distance of observer
+                 from the screen
+
+    Returns:
+        tuple ([(x, y, z), ...],
+               [(x, y), ...])
+        rotated and projected
+        vertices
+    """
+    if _np is None or len(vlist) == 0:
+        rot = [_rotmove(px, py, pz, rotvec, dispvec)
+               for (px, py, pz) in vlist]
+        return (rot, [(-d * x / z, -d * y / z)
+                      for (x, y, z) in rot])
+    (x, y, z) = _rotmove(*_np.array(vlist, dtype=float).T,
+                         rotvec, dispvec)
+    return (list(zip(x.tolist(), y.tolist(), z.tolist())),
+            list(zip((-d * x / z).tolist(),
+                     (-d * y / z).tolist())))
+
+
+def _cosz(n: list[float, float, float]) -> float:
+    """Cosine of the angle between
+        a normal and the z axis
+        (0 for a zero normal)
+    """
+    m = sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+    return n[2] / m if m > 0 else 0.0
+
+
+def sidelum(rot: list[list[float, float, float]],
+        side: list[int]) -> int:
+    """Gets the luminosity of a side
+        from its normal the way
+        plotpolyfillist does
+
+    Args:
+        rot : rotated vertices
+        side: list of vertex
+              indices
+
+    Returns:
+        int from -1 to 255
+    """
+    return int(_cosz(getnormvec(rot[side[0]],
+        rot[side[1]], rot[side[2]])) * 128) + 127
+
+
+def vertexlums(rot: list[list[float, float, float]],
+        sides: list[list[int]]) -> list[float]:
+    """Gets the luminosity at each vertex
+        from the average of the unit
+        normals of the sides around
+        it for Gouraud shading
+
+    Args:
+        rot  : rotated vertices
+        sides: lists of vertex
+               indices
+
+    Returns:
+        list of floats one
+        per vertex
+    """
+    norms = [[0.0, 0.0, 0.0] for _ in rot]
+    for side in sides:
+        n = getnormvec(rot[side[0]], rot[side[1]],
+                       rot[side[2]])
+        m = sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+        if m > 0:
+            for i in side:
+                v = norms[i]
+                v[0] += n[0] / m
+                v[1] += n[1] / m
+                v[2] += n[2] / m
+    return [_cosz(n) * 128 + 127 for n in norms]
+
+
+def iterztrianglespans(
+        v0: list[float, float, float, float],
+        v1: list[float, float, float, float],
+        v2: list[float, float, float, float],
+        zbuf: array, mx: int, my: int):
+    """Yields the spans of a triangle
+        that are nearer than what is
+        in a depth buffer and puts
+        their depth in the buffer
+
+    A pixel is in the triangle when its
+    center is inside or on a left or top
+    edge so triangles that share an
+    edge never cover the same pixel
+
+    Args:
+        v0, v1, v2: [x: float, y: float,
+                     1 / z: float,
+                     lum: float]
+                    screen position,
+                    depth and
+                    luminosity of the
+                    corners
+        zbuf      : depth buffer from
+                    newzbuffer
+        mx, my    : size of the screen
+
+    Yields:
+        (y: int, xstart: int, xend: int,
+         lum at xstart: float,
+         lum change per pixel: float)
+    """
+    ((x0, y0, w0, l0),
+     (x1, y1, w1, l1),
+     (x2, y2, w2, l2)) = (v0, v1, v2)
+    a = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+    if a == 0:
+        return
+    (ex1, ey1, ex2, ey2) = (x1 - x0, y1 - y0,
+                            x2 - x0, y2 - y0)
+    dwdx = ((w1 - w0) * ey2 - (w2 - w0) * ey1) / a
+    dwdy = ((w2 - w0) * ex1 - (w1 - w0) * ex2) / a
+    dldx = ((l1 - l0) * ey2 - (l2 - l0) * ey1) / a
+    dldy = ((l2 - l0) * ex1 - (l1 - l0) * ex2) / a
+    ((xa, ya), (xb, yb), (xc, yc)) = sorted(
+        ((x0, y0), (x1, y1), (x2, y2)),
+        key=lambda v: v[1])
+    mac = (xc - xa) / (yc - ya)
+    for y in range(max(ceil(ya), 0),
+                   min(ceil(yc), my)):
+        xl = xa + mac * (y - ya)
+        xr = xa + (xb - xa) * (y - ya) / (yb - ya) \
+             if y < yb else \
+             xb + (xc - xb) * (y - yb) / (yc - yb)
+        if xl > xr:
+            (xl, xr) = (xr, xl)
+        xs = max(ceil(xl), 0)
+        xe = min(ceil(xr), mx)
+        n = xe - xs
+        if n < 1:
+            continue
+        w = w0 + dwdx * (xs - x0) + dwdy * (y - y0)
+        l = l0 + dldx * (xs - x0) + dldy * (y - y0)
+        i = y * mx + xs
+        old = zbuf[i: i + n]
+        we = w + dwdx * (n - 1)
+        if max(old) < min(w, we):
+            zbuf[i: i + n] = array('f',
+                [w + dwdx * k for k in range(n)])
+            yield (y, xs, xe - 1, l, dldx)
+        elif min(old) < max(w, we):
+            new = [w + dwdx * k for k in range(n)]
+            for (s, e) in iterbitspans(
+                    boolbits(map(gt, new, old))):
+                zbuf[i + s: i + e + 1] = \
+                    array('f', new[s: e + 1])
+                yield (y, xs + s, xs + e,
+                       l + dldx * s, dldx)
+
+
+def iterzlinepixels(
+        p1: list[float, float, float],
+        p2: list[float, float, float],
+        zbuf: array, mx: int, my: int):
+    """Yields the pixels of a line that
+        are not behind what is in a
+        depth buffer (the buffer is
+        left as it is)
+
+    Args:
+        p1, p2: [x: float, y: float,
+                 1 / z: float]
+                endpoints
+        zbuf  : depth buffer from
+                newzbuffer
+        mx, my: size of the screen
+
+    Yields:
+        (x: int, y: int)
+    """
+    (u, v) = (roundvect(p1[:2]), roundvect(p2[:2]))
+    (dx, dy) = (v[0] - u[0], v[1] - u[1])
+    m = dx * dx + dy * dy
+    (w1, dw) = (p1[2], p2[2] - p1[2])
+    bias = 1 - _outlinebias
+    for (x, y) in iterline(u, v):
+        if -1 < x < mx and -1 < y < my:
+            t = ((x - u[0]) * dx + (y - u[1]) * dy) / m \
+                if m > 0 else 0
+            if w1 + dw * t >= zbuf[y * mx + x] * bias:
+                yield (x, y)
+
+
+def visiblesides(rot: list[list[float, float, float]],
+        sides: list[list[int]]) -> list[list[int]]:
+    """Gets the sides that face the
+        observer (see surfacetest)
+        and are in front of it
+
+    Args:
+        rot  : rotated vertices
+        sides: lists of vertex
+               indices
+
+    Returns:
+        list of sides
+    """
+    return [side for side in sides
+            if surfacetest(rot[side[0]], rot[side[1]],
+                           rot[side[2]]) <= 0 and
+               min(rot[i][2] for i in side) > 0]
+
+
+def screenvertices(
+        rot: list[list[float, float, float]],
+        proj: list[list[float, float]],
+        transvect: list[float, float]) -> list:
+    """Moves projected vertices to their
+        screen position and adds their
+        depth
+
+    Args:
+        rot      : rotated vertices
+        proj     : projected vertices
+        transvect: 2D translation
+                   vector for
+                   screen position
+
+    Returns:
+        [(x: float, y: float,
+          1 / z: float), ...]
+    """
+    (tx, ty) = transvect
+    return [(x + tx, y + ty, 1 / z if z > 0 else 0.0)
+            for ((x, y), (_, _, z)) in zip(proj, rot)]
+
+
+def iterzsolidspans(
+        scr: list[list[float, float, float]],
+        rot: list[list[float, float, float]],
+        sides: list[list[int]],
+        zbuf: array, mx: int, my: int,
+        gouraud: bool = False):
+    """Yields the spans of the sides of
+        a solid that are not hidden by
+        anything in a depth buffer
+
+    Args:
+        scr    : vertices from
+                 screenvertices
+        rot    : rotated vertices
+        sides  : sides from
+                 visiblesides
+        zbuf   : depth buffer from
+                 newzbuffer
+        mx, my : size of the screen
+        gouraud: True  -> blend the
+                          luminosity of
+                          the corners
+                 False -> one
+                          luminosity
+                          per side
+
+    Yields:
+        (y: int, xstart: int, xend: int,
+         lum at xstart: float,
+         lum change per pixel: float)
+    """
+    if gouraud:
+        lums = vertexlums(rot, sides)
+    for side in sides:
+        if gouraud:
+            v = [scr[i] + (lums[i],) for i in side]
+        else:
+            l = sidelum(rot, side)
+            v = [scr[i] + (l,) for i in side]
+        for k in range(1, len(v) - 1):
+            yield from iterztrianglespans(v[0], v[k],
+                v[k + 1], zbuf, mx, my)
+
+
+def iterzoutlinepixels(
+        scr: list[list[float, float, float]],
+        sides: list[list[int]],
+        zbuf: array, mx: int, my: int):
+    """Yields the pixels of the edges of
+        the sides of a solid that are
+        not hidden by anything in a
+        depth buffer
+
+    Args:
+        scr   : vertices from
+                screenvertices
+        sides : sides from
+                visiblesides
+        zbuf  : depth buffer from
+                newzbuffer
+        mx, my: size of the screen
+
+    Yields:
+        (x: int, y: int)
+    """
+    seen = set()
+    for side in sides:
+        for k in range(len(side)):
+            (i, j) = (side[k - 1], side[k])
+            e = (min(i, j), max(i, j))
+            if e not in seen:
+                seen.add(e)
+                yield from iterzlinepixels(scr[i],
+                    scr[j], zbuf, mx, my)
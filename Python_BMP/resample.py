@@ -0,0 +1,297 @@
+"""
+ Resampling module
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|   Contact primary author          |
+|   if you plan to use this         |
+|   in a commercial product at      |
+|   joelalcarez1975@gmail.com       |
+ -----------------------------------
+
+ Resizes rows of 24-bit BGR pixel data
+ to any size with a separable filter
+    blocks of source rows are
+    resampled across and kept in a
+    ring of as many rows as the
+    vertical filter needs, then each
+    output row is a weighted sum of
+    the rows in the ring
+ Without NumPy a column or a row of
+ samples is packed into one int with
+ a 4 byte field per sample so each
+ weighted sum is a few int multiplies
+ and adds over the whole column or row
+ Weights are ints scaled by
+ 1 << _weightbits and resampled rows
+ are clipped to bytes after each pass
+ so both ways give the same bytes
+"""
+
+from collections import deque
+from itertools import islice
+from math import pi, sin
+from operator import mul
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+_weightbits = 16
+_clipoffset = 1024
+_fieldbias = ((_clipoffset << _weightbits) +
+              (1 << (_weightbits - 1))).to_bytes(4, 'little')
+# top byte of a biased field -> mask that
+# keeps the byte below it when the sum is
+# in 0..255 and saturation when above
+_keepmask = bytes(255 if i == _clipoffset >> 8 else 0
+                  for i in range(256))
+_satmask = bytes(255 if i > _clipoffset >> 8 else 0
+                 for i in range(256))
+_blockbytes = 1 << 20
+
+
+def _boxfilter(x: float) -> float:
+    return 1.0 if -0.5 <= x < 0.5 else 0.0
+
+
+def _bilinearfilter(x: float) -> float:
+    x = abs(x)
+    return 1.0 - x if x < 1.0 else 0.0
+
+
+def _bicubicfilter(x: float) -> float:
+    a = -0.5
+    x = abs(x)
+    if x < 1.0:
+        return ((a + 2.0) * x - (a + 3.0)) * x * x + 1
+    if x < 2.0:
+        return (((x - 5.0) * x + 8.0) * x - 4.0) * a
+    return 0.0
+
+
+def _sinc(x: float) -> float:
+    if x == 0.0:
+        return 1.0
+    x *= pi
+    return sin(x) / x
+
+
+def _lanczosfilter(x: float) -> float:
+    return _sinc(x) * _sinc(x / 3.0) \
+           if -3.0 < x < 3.0 else 0.0
+
+
+# name: (support, filter function)
+resamplefilters = {
+    'box': (0.5, _boxfilter),
+    'bilinear': (1.0, _bilinearfilter),
+    'bicubic': (2.0, _bicubicfilter),
+    'lanczos': (3.0, _lanczosfilter)}
+
+
+def resampleweights(srcsize: int,
+        dstsize: int,
+        filter: str = 'bicubic'
+        ) -> list[tuple]:
+    """Precomputes the weights that
+        resample a line of pixels
+        to a new length
+
+    The filter is widened by the
+    resize ratio when shrinking so
+    every source pixel counts
+
+    Args:
+        srcsize: source pixels
+        dstsize: resampled pixels
+        filter : 'box', 'bilinear',
+                 'bicubic' or
+                 'lanczos'
+
+    Returns:
+        [(first source pixel: int,
+          [weight: int, ...]), ...]
+        one per resampled pixel with
+        weights that add up to
+        1 << _weightbits
+    """
+    (support, f) = resamplefilters[filter]
+    scale = srcsize / dstsize
+    fscale = max(scale, 1.0)
+    support *= fscale
+    one = 1 << _weightbits
+    table = []
+    for i in range(dstsize):
+        center = (i + 0.5) * scale
+        x1 = max(int(center - support + 0.5), 0)
+        x2 = min(int(center + support + 0.5), srcsize)
+        x2 = max(x2, x1 + 1)
+        w = [f((x - center + 0.5) / fscale)
+             for x in range(x1, x2)]
+        total = sum(w)
+        if total == 0:
+            w = [1.0] * len(w)
+            total = len(w)
+        w = [round(v * one / total) for v in w]
+        k = w.index(max(w))
+        w[k] += one - sum(w)
+        while len(w) > 1 and w[-1] == 0:
+            w.pop()
+        table.append((x1, w))
+    return table
+
+
+def _fieldint(buf: bytes) -> int:
+    """Packs bytes into an int with
+        a 4 byte field per byte
+    """
+    f = bytearray(len(buf) << 2)
+    f[0::4] = buf
+    return int.from_bytes(f, 'little')
+
+
+def _clipfields(v: int, n: int) -> bytes:
+    """Scales n fields of weighted
+        sums back and clips them
+        to bytes
+    """
+    f = (v + int.from_bytes(_fieldbias * n, 'little')
+         ).to_bytes(n << 2, 'little')
+    hi = f[3::4]
+    return ((int.from_bytes(f[2::4], 'little') &
+             int.from_bytes(hi.translate(_keepmask), 'little')) |
+            int.from_bytes(hi.translate(_satmask), 'little')
+            ).to_bytes(n, 'little')
+
+
+def _resamplerows(rows: list[bytes],
+        table: list[tuple]) -> list[bytes]:
+    """Resamples a block of BGR
+        rows across
+    """
+    w = len(rows[0])
+    n = len(rows)
+    blk = b''.join(rows)
+    cols = [_fieldint(blk[j::w]) for j in range(w)]
+    W = 3 * len(table)
+    out = bytearray(n * W)
+    i = 0
+    for (x1, wts) in table:
+        for c in range(3 * x1, 3 * x1 + 3):
+            out[i::W] = _clipfields(sum(map(mul, wts,
+                cols[c: c + 3 * len(wts): 3])), n)
+            i += 1
+    return [out[k: k + W] for k in range(0, n * W, W)]
+
+
+def _blendrows(rows, w: list[int],
+        n: int) -> bytes:
+    """Adds up packed rows of
+        n samples with weights
+    """
+    return _clipfields(sum(map(mul, w, rows)), n)
+
+
+def _npresamplerows(rows: list[bytes],
+        taps: list[tuple]) -> list:
+    a = _np.frombuffer(b''.join(rows), dtype=_np.uint8
+            ).reshape(len(rows), -1).astype(_np.int64)
+    acc = 0
+    for (idx, wts) in taps:
+        acc = acc + wts * a[:, idx]
+    return list(_npclip(acc))
+
+
+def _npclip(acc: any) -> any:
+    return _np.clip((acc + (1 << (_weightbits - 1)))
+                    >> _weightbits, 0, 255
+                    ).astype(_np.uint8)
+
+
+def _npblendrows(rows, w: list[int],
+        n: int) -> bytes:
+    acc = 0
+    for (v, row) in zip(w, rows):
+        acc = acc + v * row.astype(_np.int64)
+    return _npclip(acc).tobytes()
+
+
+def _nptaps(table: list[tuple],
+        srcsize: int) -> list[tuple]:
+    """Turns a weight table into one
+        (indices, weights) pair of
+        NumPy arrays per tap that
+        covers the three channels
+        of every resampled pixel
+    """
+    n = max(len(w) for (_, w) in table)
+    taps = []
+    for k in range(n):
+        (idx, wts) = ([], [])
+        for (x1, w) in table:
+            if k < len(w):
+                (s, v) = (3 * (x1 + k), w[k])
+            else:
+                (s, v) = (3 * (srcsize - 1), 0)
+            idx += [s, s + 1, s + 2]
+            wts += [v, v, v]
+        taps.append((_np.array(idx, dtype=_np.intp),
+                     _np.array(wts, dtype=_np.int64)))
+    return taps
+
+
+def resampleBGRrows(rows,
+        mx: int, my: int,
+        newx: int, newy: int,
+        filter: str = 'bicubic'):
+    """Resizes rows of 24-bit BGR pixel
+        data streaming the source rows
+        through a ring of resampled rows
+
+    Args:
+        rows      : iterable of my rows
+                    of BGR pixel data
+                    from the top
+                    (padding allowed)
+        mx, my    : source size
+        newx, newy: new size
+        filter    : 'box', 'bilinear',
+                    'bicubic' or
+                    'lanczos'
+
+    Yields:
+        bytes of newx BGR pixels
+        per row from the top
+    """
+    table = resampleweights(mx, newx, filter)
+    if _np is None:
+        (hpass, blend, pack) = (_resamplerows,
+                                _blendrows, _fieldint)
+    else:
+        table = _nptaps(table, mx)
+        (hpass, blend, pack) = (_npresamplerows,
+                                _npblendrows, None)
+    w = 3 * mx
+    n = max(_blockbytes // max(w, 1), 1)
+    rows = iter(rows)
+    ring = deque()
+    done = []
+    first = 0
+    for (y1, wts) in resampleweights(my, newy, filter):
+        while first + len(ring) < y1 + len(wts):
+            if not done:
+                done = hpass([bytes(r[:w]) for r in
+                              islice(rows, n)], table)
+                done.reverse()
+            r = done.pop()
+            ring.append(r if pack is None else pack(r))
+        while first < y1:
+            ring.popleft()
+            first += 1
+        yield blend(ring, wts, 3 * newx)
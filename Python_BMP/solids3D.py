@@ -18,6 +18,7 @@ from math import(
     radians
     )
 
+from functools import wraps
 from numbers import Number
 from typing import Callable
 
@@ -37,11 +38,51 @@ from .mathlib import(
 from .primitives2D import(
     floatregpolygonvert,
     iterline,
-    rectboundarycoords,
     regpolygonvert
     )
 
-from .messages import sysmsg
+
+_meshcache = {}
+
+
+def clearmeshcache():
+    """Drops the vertices and surfaces
+        cached by the solid generators
+    """
+    _meshcache.clear()
+
+
+def _cachedmesh(func: Callable) -> Callable:
+    """Caches the vertices and surfaces
+        a solid generator makes for
+        each set of arguments and
+        hands out copies of them
+        (calls with a function as an
+        argument are not cached since
+        what the function returns
+        can change)
+    """
+    @wraps(func)
+    def callf(*args, **kwargs):
+        if any(callable(a) for a in
+               list(args) + list(kwargs.values())):
+            return func(*args, **kwargs)
+        try:
+            key = (func.__name__,) + tuple(
+                  (k, type(a), tuple(a) if isinstance(a, list) else a)
+                  for (k, a) in list(enumerate(args)) +
+                                sorted(kwargs.items()))
+            mesh = _meshcache.get(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        if mesh is None:
+            if len(_meshcache) > 255:
+                _meshcache.clear()
+            mesh = _meshcache[key] = func(*args, **kwargs)
+        (vlist, surf) = mesh
+        return ([list(v) for v in vlist],
+                [list(f) for f in surf])
+    return(callf)
 
 
 def getshapesidedict() -> dict:
@@ -332,11 +373,10 @@ def perspective(
     return (rotvlist, projvlist)
 
 
-#may be slow if polygon goes offscreen
 def fillpolydata(
         polybnd: list[list[int, int]],
         xlim: int,
-        ylim: int) -> list:
+        ylim: int) -> dict:
     """Generates a list of x values per
         y values for filling polygon
         boundaries
@@ -354,27 +394,139 @@ def fillpolydata(
 
     Returns:
         A dictionary with y values
-        as key and list of x values
-        per key (if within bounds)
-        or an empty list if out of
-        bounds
+        as key and a sorted list of
+        x values per key clipped to
+        the screen
     """
     filld = {}
-    ((minx, miny), (maxx, maxy)) = \
-    rectboundarycoords(polybnd)
-    maxx += 1
-    maxy += 1
-    if (minx >= 0 and miny >= 0) and \
-       (maxx <= xlim and maxy <= ylim):
-        for y in range(miny, maxy):
-            filld.setdefault(y, [])
-            for x in range(minx, maxx):
-                if [x, y] in polybnd:
-                    filld[y] += [x]
+    xmax = xlim - 1
+    for (x, y) in polybnd:
+        if -1 < y < ylim:
+            filld.setdefault(y, set()).add(
+                0 if x < 0 else xmax if x > xmax else x)
+    return {y: sorted(filld[y]) for y in sorted(filld)}
+
+
+def _edgerowextents(
+        v1: list[int, int],
+        v2: list[int, int],
+        ylim: int) -> dict:
+    """Finds the pixels a polygon
+        edge covers on each scanline
+
+    Args:
+        v1, v2: edge endpoints
+                both [x:int, y:int]
+        ylim  : Screen limit y dim
+
+    Returns:
+        A dictionary with y values
+        as key and [xmin, xmax] of
+        the edge on that scanline
+    """
+    rows = {}
+    ((x1, y1), (x2, y2)) = (v1, v2)
+    if max(abs(x2 - x1), abs(y2 - y1)) <= (ylim << 2):
+        for (x, y) in iterline(v1, v2):
+            if y in rows:
+                r = rows[y]
+                if x < r[0]:
+                    r[0] = x
+                elif x > r[1]:
+                    r[1] = x
+            else:
+                rows[y] = [x, x]
+    elif y1 == y2:
+        rows[y1] = sorted([x1, x2])
     else:
-        print(sysmsg['regionoutofbounds'])
-        filld = []
-    return filld
+        # too long to trace so only the
+        # scanlines on screen are computed
+        if y1 > y2:
+            ((x1, y1), (x2, y2)) = (v2, v1)
+        m = (x2 - x1) / (y2 - y1)
+        for y in range(max(y1, 0), min(y2, ylim - 1) + 1):
+            xa = x1 + m * (max(y - 0.5, y1) - y1)
+            xb = x1 + m * (min(y + 0.5, y2) - y1)
+            rows[y] = sorted([round(xa), round(xb)])
+    return rows
+
+
+def iterpolyfillspans(
+        vertlist: list[list[Number, Number]],
+        xlim: int,
+        ylim: int) -> list[int, int, int]:
+    """Yields the horizontal spans
+        that fill a polygon using an
+        edge table and an active
+        edge list
+
+    Args:
+        vertlist: list of 2D vertices
+                  list[list[x: Number,
+                            y: Number]]
+        xlim    : Screen limit x dim
+        ylim    : Screen limit y dim
+
+    Yields:
+        (y: int, xstart: int, xend: int)
+        spans clipped to the screen
+        that cover the inside of the
+        polygon and its edges
+    """
+    verts = [roundvect(v) for v in vertlist]
+    edges = []
+    for i in range(len(verts)):
+        (v1, v2) = (verts[i - 1], verts[i])
+        (ya, yb) = sorted([v1[1], v2[1]])
+        # iterline can step one row past
+        # the end of an edge and those
+        # pixels are outside the polygon
+        rows = {y: r for (y, r) in
+                _edgerowextents(v1, v2, ylim).items()
+                if ya <= y <= yb}
+        edges.append((ya, yb, v1, v2, rows))
+    if edges == []:
+        return
+    edges.sort(key=lambda e: e[0])
+    ymin = max(edges[0][0], 0)
+    ymax = min(max(e[1] for e in edges), ylim - 1)
+    nxt = 0
+    active = []
+    xmax = xlim - 1
+    for y in range(ymin, ymax + 1):
+        while nxt < len(edges) and edges[nxt][0] <= y:
+            active.append(edges[nxt])
+            nxt += 1
+        active = [e for e in active if e[1] >= y]
+        spans = []
+        crossings = []
+        for (ya, yb, (x1, y1), (x2, y2), rows) in active:
+            r = rows.get(y)
+            if r is not None:
+                spans.append(r)
+            if ya <= y < yb:
+                if r is None:
+                    x = round(x1 + (x2 - x1) * (y - y1) / (y2 - y1))
+                    r = [x, x]
+                crossings.append(r)
+        crossings.sort()
+        for i in range(0, len(crossings) - 1, 2):
+            spans.append([crossings[i][0],
+                          crossings[i + 1][1]])
+        if spans == []:
+            continue
+        spans.sort()
+        merged = [list(spans[0])]
+        for (xs, xe) in spans[1:]:
+            if xs > merged[-1][1] + 1:
+                merged.append([xs, xe])
+            elif xe > merged[-1][1]:
+                merged[-1][1] = xe
+        for (xs, xe) in merged:
+            if xe >= 0 and xs <= xmax:
+                yield (y,
+                    0 if xs < 0 else xs,
+                    xmax if xe > xmax else xe)
 
 
 def polyboundary(
@@ -394,21 +546,15 @@ def polyboundary(
         the boundaries of the polygon
     """
     px = []
+    seen = set()
     vertcount = len(vertlist)
-    for i in range(vertcount):
-        if i>0:
-            v1 = roundvect(
-                    vertlist[i - 1])
-            v2 = roundvect(vertlist[i])
-            for p in iterline(v1, v2):
-                if p not in px:
-                    px.append(p)
-    v2 = roundvect(vertlist[0])
-    v1 = roundvect(
-            vertlist[vertcount - 1])
-    for p in iterline(v1, v2):
-        if p not in px:
-            px.append(p)
+    for i in range(1, vertcount + 1):
+        v1 = roundvect(vertlist[i - 1])
+        v2 = roundvect(vertlist[i % vertcount])
+        for p in iterline(v1, v2):
+            if (p[0], p[1]) not in seen:
+                seen.add((p[0], p[1]))
+                px.append(p)
     return px
 
 
@@ -469,6 +615,7 @@ def spherevert(vcen: list[float,
               z: float)
     """
     plist = []
+    seen = set()
     for theta in range(0, 360,
                 deganglestep):
         for phi in range(0, 180,
@@ -477,10 +624,11 @@ def spherevert(vcen: list[float,
                    spherical2rectcoord3D(
                        [r, radians(theta),
                            radians(phi)]))
-            if p not in plist:
+            if tuple(p) not in seen:
+                seen.add(tuple(p))
                 plist.append(p)
     p = [0, 0, -r]
-    if p not in plist:
+    if tuple(p) not in seen:
         plist.append(p)
     return plist
 
@@ -502,8 +650,9 @@ def zlevelcoords(verlist: list
     """
     zlist = []
     zord = {}
-    for p in verlist:
-        pind = [verlist.index(p)]
+    first = {}
+    for (i, p) in enumerate(verlist):
+        pind = [first.setdefault(tuple(p), i)]
         z = p[2]
         if z not in zord:
             zord.setdefault(z, pind)
@@ -560,6 +709,7 @@ def genspheresurfaces(
     return surf
 
 
+@_cachedmesh
 def spherevertandsurface(
         vcen: list[float, float, float],
         r: float,
@@ -587,6 +737,7 @@ def spherevertandsurface(
     return (s, genspheresurfaces(zlevelcoords(s)))
 
 
+@_cachedmesh
 def cylindervertandsurface(
         vcen: list[float, float, float],
         r: float,
@@ -638,6 +789,7 @@ def cylindervertandsurface(
     return (plist, [top] + side + [bottom])
 
 
+@_cachedmesh
 def conevertandsurface(
         vcen: list[float, float, float],
         r: float,
@@ -707,8 +859,7 @@ def surfplot3Dvertandsurface(
     dx = abs(x2 - x1) // step
     dx1 = dx - 1
     vl = len(vlist)
-    for v in vlist:
-        i = vlist.index(v)
+    for i in range(vl):
         idx = i + dx
         idx1 = idx + 1
         if (vl - idx1) >= 0 and (i % dx) < dx1:
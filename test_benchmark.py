@@ -0,0 +1,82 @@
+notice = """
+ Unit tests for the benchmark harness
+ for a Pure Python graphics library
+ that saves to a bitmap
+ -----------------------------------
+| Copyright 2022 by Joel C. Alcarez |
+| [joelalcarez1975@gmail.com]       |
+|-----------------------------------|
+|    We make absolutely no warranty |
+| of any kind, expressed or implied |
+|-----------------------------------|
+|       The primary author and any  |
+| any subsequent code contributors  |
+| shall not be liable in any event  |
+| for  incidental or consequential  |
+| damages  in connection with,  or  |
+| arising out from the use of this  |
+| code in current form or with any  |
+| modifications.                    |
+|-----------------------------------|
+|   This graphics library outputs   |
+|   to a bitmap file.               |
+ -----------------------------------
+"""
+import unittest
+from os import path
+from Python_BMP.benchmark import(
+        compareresults,
+        listbenchmarks,
+        loadresults,
+        resultfields,
+        runbenchmarks,
+        saveresultsCSV,
+        saveresultsJSON
+        )
+
+
+rootdir = path.dirname(__file__)
+
+
+class TestBenchmark(unittest.TestCase):
+
+        outputdir = f'{rootdir}/test_output/'
+
+
+        def testbenchmarksarenamed(self):
+                for n in ('plotxybit', 'line', 'filledcircle',
+                          'plotpolyfill', 'font.plotstring',
+                          'io.loadBMP', 'io.saveBMP',
+                          'fractal.mandelbrot',
+                          'solid3D.cube',
+                          'filter.invertbits2file'):
+                        self.assertIn(n, listbenchmarks())
+                self.assertEqual(listbenchmarks('io.*'),
+                                 ['io.loadBMP', 'io.saveBMP'])
+
+
+        def testrunsaveandcompare(self):
+                results = runbenchmarks(
+                        ['line', 'filter.flipvertical2file'],
+                        [(32, 24)], [1, 4, 8, 24], 0, 1)
+                self.assertEqual(len(results), 8)
+                for r in results:
+                        self.assertEqual(r['error'], '')
+                        self.assertEqual(list(r), resultfields)
+                        self.assertGreater(r['median'], 0)
+                for ext, save in (('json', saveresultsJSON),
+                                  ('csv', saveresultsCSV)):
+                        f = f'{self.outputdir}benchmark.{ext}'
+                        save(f, results)
+                        baseline = loadresults(f)
+                        cmp = compareresults(results, baseline)
+                        self.assertEqual(len(cmp), 8)
+                        self.assertFalse(any(c['regressed'] for c in cmp))
+                        for b in baseline:
+                                b['min'] /= 2
+                        cmp = compareresults(results, baseline)
+                        self.assertTrue(all(c['regressed'] for c in cmp))
+
+
+if __name__ == '__main__':
+        unittest.main()
@@ -27,7 +27,14 @@ from typing import Callable
 import unittest
 from os import path
 from Python_BMP.BITMAPlib import(
+        clearglyphcache,
+        getcharfont,
         loadBMP,
+        newBMP,
+        plot8bitpattern,
+        plotitalic8bitpattern,
+        plotitalicstring,
+        plotstring,
         plotstring2file,
         plotstringasdots2file,
         plotreversedstring2file,
@@ -184,6 +191,22 @@ JKLMNOPQRSTUVWXYZ"""
     def test19(self): self.dofontfunc(*self.testcases[19])
     def test20(self): self.dofontfunc(*self.testcases[20])
 
+    def testglyphcachematchesfontrenderer(self):
+        clearglyphcache()
+        for bits in (24, 8, 4, 1):
+            color = 1 if bits == 1 else 5
+            for (x, y) in ((7, 30), (8, 31), (33, 0), (-3, 40), (52, 35)):
+                for (strfunc, renderfunc) in (
+                        (plotstring, plot8bitpattern),
+                        (plotitalicstring, plotitalic8bitpattern)):
+                    for c in 'Ag_':
+                        for i in range(2):
+                            bmp1 = newBMP(61, 47, bits)
+                            bmp2 = newBMP(61, 47, bits)
+                            strfunc(bmp1, x, y, c, 2, 1, 0, color, font8x8)
+                            renderfunc(bmp2, x, y, getcharfont(font8x8, c), 2, 1, color)
+                            self.assertEqual(bmp1, bmp2)
+
 
 if __name__ == "__main__":
     print(notice)
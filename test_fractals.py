@@ -25,9 +25,19 @@ notice = """
 import unittest
 from os import path
 from Python_BMP.BITMAPlib import(
+        FractalTileCache,
+        fractaltilegrid,
+        itermultibrot,
+        itertiledfractalrows,
         lambdafractal,
         loadBMP,
+        mandelbrot,
+        mandelbrottiles,
+        multibrotrows,
         multicircle,
+        multijuliarows,
+        newBMP,
+        plotmultifractal,
         savebarnsleytreefractal2file as barnsleytree,
         savemandelbrotfractal2file as mandel,
         savemultibrotfractal2file as multibrot,
@@ -214,6 +224,62 @@ class TestFractal2filefunc(unittest.TestCase):
         self.filecmp(*p)
 
 
+    def testmandelbrotrowsmatchpixels(self):
+        for bits in (1, 4, 8, 24):
+            bmp1 = newBMP(61, 47, bits)
+            bmp2 = newBMP(61, 47, bits)
+            mandelbrot(bmp1, 3, 5, 58, 40,
+            self.domain, self.c['deepskyblue'], 64)
+            plotmultifractal(bmp2, 3, 5, 58, 40, 2,
+            itermultibrot, self.domain,
+            self.c['deepskyblue'], 64)
+            self.assertEqual(bmp1, bmp2)
+
+
+    def testsavemandelbrotfractal2filewithworkers(self):
+        p = self._filepaths("mandelbrot.bmp")
+        mandel(p[0], 256, 256,
+        self.domain, self.c['deepskyblue'],
+        workers=3)
+        self.filecmp(*p)
+
+
+    def testsavenewtonsfractal2filewithworkers(self):
+        p = self._filepaths("newtons4.bmp")
+        newton(p[0], 256, 256,
+        self.fdict[4], self.domain,
+        (self.c['red'],
+         self.c['yellow'],
+         self.c['green'],
+         self.c['blue']),
+         workers=3)
+        self.filecmp(*p)
+
+
+    def testfractaltilesmatchscanlinefunctions(self):
+        (P0, Q0, s) = fractaltilegrid(self.domain, 1)
+        cache = FractalTileCache(8)
+        for (x, y, maxiter) in ((0, 0, 20), (37, 21, 20), (37, 21, 64)):
+            P = [P0 + i * s for i in range(x, x + 90)]
+            Q = [Q0 + j * s for j in range(y, y + 70)]
+            for (func, c, expected) in (
+                    (multibrotrows, None,
+                     multibrotrows(P, Q, 2, maxiter)),
+                    (multijuliarows, self.imag,
+                     multijuliarows(P, Q, self.imag, 2, maxiter))):
+                rows = [r for (_, _, r) in itertiledfractalrows(
+                        x, y, 90, 70, 1, 2, func, self.domain,
+                        maxiter, c, cache=cache)]
+                self.assertEqual(rows, expected)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (16, 8, 8))
+        bmp1 = newBMP(90, 70, 24)
+        mandelbrottiles(bmp1, 37, 21, 1, self.domain,
+            self.c['deepskyblue'], 64, cache)
+        bmp2 = newBMP(90, 70, 24)
+        mandelbrottiles(bmp2, 37, 21, 1, self.domain,
+            self.c['deepskyblue'], 64, FractalTileCache())
+        self.assertEqual(bmp1, bmp2)
+
 
 if __name__ == "__main__":
         print(notice)
@@ -33,48 +33,92 @@ notice = """
  -----------------------------------
 """
 from typing import Callable
+import json
 import unittest
+from array import array
+from contextlib import redirect_stdout
+from io import StringIO
+from math import cos, pi, sin
+from copy import copy
 from os import path
+from random import Random
+from Python_BMP import colormasks, render3D, resample
+from Python_BMP.primitives2D import itercirclepartlineedge
+from Python_BMP.solids3D import iterpolyfillspans, spherevert, zlevelcoords
 from Python_BMP.BITMAPlib import(
         adjustbrightness2file,
         adjustbrightnessinregion2file,
         adjustthresholdinregion2file,
+        applybrightnessadjtoBGRbuf,
+        applycolorfiltertoBGRbuf,
+        applygammaBGRbuf,
+        applythresholdadjtoBGRbuf,
         autocropimg2file,
         brightnessadjcircregion2file,
         circle2file,
+        clearmeshcache,
+        colorfilter,
+        colorhistorgram,
         colorfilter2file,
         colorfiltercircregion2file,
         colorfilterinregion2file,
         copycircregion2file,
+        copyrect,
+        createBMPfile,
+        crop,
         cropBMPandsave,
+        cubevert,
+        drawarc,
         eraseeverynthhoriline2file,
         eraseeverynthhorilineinccircregion2file,
         eraseeverynthhorilineinregion2file,
+        filledcircle,
         filledcircle2file,
         filledrect2file,
         fliphoricircregion2file,
         fliphorizontal2file,
+        flipvertical,
         flipvertical2file,
+        fliphorizontalregion,
+        fliphoricircregion,
         fliphorizontalregion2file,
         flipvertcircregion2file,
         flipverticalregion2file,
+        flipXY,
         flipXY2file,
         flipXYcircregion2file,
         gammaadj2file,
         gammaadjtoregion2file,
         gammacorrectcircregion2file,
         getcolorname2RGBdict,
+        getallRGBpal,
+        getprofilesink,
+        getBMPimgbytes,
+        getimagedgevert,
+        getimageregionbyRGB,
+        getmaxxy,
+        getRGBpal,
+        getRGBxybit,
+        getxybit,
         getRGBfactors,
+        getshapesidedict,
         horibrightnessgrad2circregion2file,
+        horiline,
         horizontalbrightnessgrad2file,
         horizontalbrightnessgradregion2file,
         imgregionbyRGB2file,
         int2RGB,
         invertbits2file,
         invertbitsincircregion2file,
+        invertbitsinbuffer,
+        invertregion,
         invertregion2file,
         loadBMP,
+        mapBMP,
+        magnifyNtimescircregion,
         magnifyNtimescircregion2file,
+        matchRGBtopal,
+        matchRGBtopalfunc,
         mirrorbottom2file,
         mirrorbottomincircregion2file,
         mirrorbottominregion2file,
@@ -102,24 +146,58 @@ from Python_BMP.BITMAPlib import(
         monochrome2file,
         monochromecircregion2file,
         monofilterinregion2file,
+        newBMP,
+        newzbuffer,
         outline2file,
         outlinecircregion2file,
         outlineregion2file,
+        pasterect,
+        perspective,
+        piechart,
+        pixelizenxn,
+        pixelizenxncircregion,
         pixelizenxncircregion2file,
         pixelizenxntofile,
+        printprogress,
+        progressreporting,
+        plot3Dsolid,
+        plotpolyfill,
+        plotRGBpoints,
+        plotRGBxybit,
+        plotxybit,
+        plotxybits,
+        profiling,
+        quantize24bitimage,
         rectangle2file,
         reduce24bitimagebits,
+        regionview,
+        resize,
         resizeNtimesbigger2file,
         resizeNtimessmaller2file,
+        rotvec3D,
+        saveBMP,
+        saveprofilestats2JSON,
         sphere2file,
+        spherevertandsurface,
+        statssink,
+        surfplot3Dvertandsurface,
         thickencirclearea2file,
         thresholdadjcircregion2file,
         thresholdadjust2file,
+        throttleprogress,
         upgradeto24bitimage2file,
         vertbrightnessgrad2circregion2file,
         verticalbrightnessgrad2file,
         verticalbrightnessgradregion2file,
-        getX11colorname2RGBdict
+        getX11colorname2RGBdict,
+        gradcircle,
+        gradthickroundline,
+        iterline,
+        itergetneighbors,
+        mirrorleftinregion,
+        distance,
+        plotimgedges,
+        thickroundline
         )
 
 
@@ -304,6 +382,17 @@ class Test2filefunc(unittest.TestCase):
                         invertbits2file)
 
 
+        def teststreamingfilefuncsreportmissingfile(self):
+                for func in (invertbits2file, flipvertical2file):
+                        p = self._filepaths('missing.bmp')
+                        out = StringIO()
+                        with redirect_stdout(out):
+                                func(p[1], p[0])
+                        self.assertIn('Not a file or file does not exist!',
+                                      out.getvalue())
+                        self.assertFalse(path.isfile(p[0]))
+
+
         def testflipverticalregion2file(self):
                 self.dotestrectregion(
                         'raccoon-flipverticalregion.bmp',
@@ -753,6 +842,639 @@ class Test2filefunc(unittest.TestCase):
                         250, 60, 860, 666, [-100, 200])
 
 
+        def testhorilinematchesplotxybit(self):
+                for bits in (1, 8, 24):
+                        for (x1, x2) in ((0, 0), (1, 1), (2, 5),
+                                         (3, 12), (-4, 9), (7, 30)):
+                                bmp1 = newBMP(21, 3, bits)
+                                bmp2 = newBMP(21, 3, bits)
+                                horiline(bmp1, 1, x1, x2, 1)
+                                for x in range(max(x1, 0), min(x2, 20) + 1):
+                                        plotxybit(bmp2, x, 1, 1)
+                                self.assertEqual(bmp1, bmp2)
+
+
+        def testplotxybitgetxybitroundtrip(self):
+                for (bits, c) in ((1, 1), (4, 9), (8, 200), (24, 0x123456)):
+                        bmp = newBMP(13, 7, bits)
+                        for (x, y) in ((0, 0), (12, 6), (5, 3), (7, 0)):
+                                plotxybit(bmp, x, y, c)
+                                self.assertEqual(getxybit(bmp, x, y), c)
+                        self.assertEqual(getxybit(bmp, 1, 1), 0)
+                        self.assertEqual(getxybit(bmp, 13, 0), -1)
+                        self.assertEqual(getxybit(bmp, 0, -1), -1)
+
+
+        def testplotxybitsmatchesplotxybit(self):
+                xs = [0, 3, 3, 12, 13, -1, 7, 5]
+                ys = [0, 2, 2, 6, 1, 3, 7, 4]
+                for (bits, cs) in ((1, [1, 1, 0, 1, 1, 1, 1, 0]),
+                                   (4, [9, 3, 5, 15, 1, 2, 3, 4]),
+                                   (8, [200, 1, 2, 3, 4, 5, 6, 7]),
+                                   (24, [0x123456, 1, 2, 0xffffff,
+                                         4, 5, 6, 7])):
+                        bmp1 = newBMP(13, 7, bits)
+                        bmp2 = newBMP(13, 7, bits)
+                        plotxybits(bmp1, xs, ys, cs)
+                        for (x, y, c) in zip(xs, ys, cs):
+                                plotxybit(bmp2, x, y, c)
+                        self.assertEqual(bmp1, bmp2)
+                        plotRGBpoints(bmp1, xs, ys, [255, 255, 255])
+                        for (x, y) in zip(xs, ys):
+                                plotRGBxybit(bmp2, x, y, [255, 255, 255])
+                        self.assertEqual(bmp1, bmp2)
+
+
+        def testplotpolyfillconcaveandoffscreen(self):
+                for bits in (1, 4, 8, 24):
+                        bmp = newBMP(64, 64, bits)
+                        plotpolyfill(bmp, [[-20, -20], [100, -20],
+                                [32, 32], [100, 84], [-20, 84]], 1)
+                        self.assertEqual(getxybit(bmp, 0, 0), 1)
+                        self.assertEqual(getxybit(bmp, 31, 63), 1)
+                        self.assertEqual(getxybit(bmp, 63, 32), 0)
+                        self.assertEqual(getxybit(bmp, 63, 0), 1)
+                bmp = newBMP(64, 64, 8)
+                plotpolyfill(bmp, [[56, 6], [23, 24], [7, 8],
+                        [31, 37], [18, 21]], 1)
+                self.assertEqual([x for x in range(64)
+                                  if getxybit(bmp, x, 7) == 1],
+                                 [53, 54, 55])
+                self.assertEqual(getxybit(bmp, 30, 10), 0)
+
+
+        def testplotpolyfillconvexhasonespanperrow(self):
+                bmp = newBMP(200, 200, 8)
+                plotpolyfill(bmp, [[117, 34], [120, 46], [129, 37]], 1)
+                self.assertEqual([getxybit(bmp, x, 36) for x in range(116, 131)],
+                                 [0] + [1] * 10 + [0] * 4)
+                rnd = Random(3)
+                for _ in range(500):
+                        n = rnd.randrange(3, 9)
+                        (cx, cy, r, a) = (rnd.uniform(20, 180), rnd.uniform(20, 180),
+                                          rnd.uniform(2, 40), rnd.uniform(0, 6.3))
+                        ys = [y for (y, _, _) in iterpolyfillspans(
+                                [[cx + r * cos(a + 2 * pi * k / n),
+                                  cy + r * sin(a + 2 * pi * k / n)]
+                                 for k in range(n)], 200, 200)]
+                        self.assertEqual(ys, list(range(ys[0], ys[-1] + 1)))
+
+
+        def testmatchRGBtopalmatcheslinearsearch(self):
+                pal = getallRGBpal(newBMP(4, 4, 8))
+                match = matchRGBtopalfunc(pal)
+                for r in range(0, 256, 15):
+                        for g in range(3, 256, 21):
+                                for b in range(7, 256, 31):
+                                        d = [(r - p[0]) ** 2 +
+                                             (g - p[1]) ** 2 +
+                                             (b - p[2]) ** 2
+                                             for p in pal[1:]]
+                                        c = d.index(min(d)) + 1
+                                        self.assertEqual(
+                                            match([r, g, b]), c)
+                                        self.assertEqual(
+                                            matchRGBtopal([r, g, b],
+                                                pal), c)
+
+
+        def testquantize24bitimagekeepsfewcolors(self):
+                bmp = newBMP(37, 21, 24)
+                rgbs = [[255, 0, 0], [0, 128, 255],
+                        [250, 250, 250], [30, 90, 40],
+                        [7, 7, 7]]
+                for x in range(37):
+                        for y in range(21):
+                                plotRGBxybit(bmp, x, y,
+                                        rgbs[(x // 5 + y // 4) % 5])
+                for bits in (4, 8):
+                        for dither in ('none', 'floydsteinberg'):
+                                nbmp = quantize24bitimage(
+                                        bmp, bits, dither)
+                                for x in range(37):
+                                        for y in range(21):
+                                                self.assertEqual(
+                                                    getRGBpal(nbmp,
+                                                    getxybit(nbmp, x, y)),
+                                                    getRGBxybit(bmp, x, y))
+                nbmp = quantize24bitimage(bmp, 1)
+                for x in range(37):
+                        for y in range(21):
+                                self.assertEqual(getxybit(nbmp, x, y),
+                                        int(getRGBxybit(bmp, x, y) ==
+                                            [250, 250, 250]))
+
+
+        def testmapBMPdrawsonfile(self):
+                for bits in (1, 4, 8, 24):
+                        f = f'{self.outputdir}mapped{bits}bit.bmp'
+                        createBMPfile(f, 61, 47, bits)
+                        bmp = newBMP(61, 47, bits)
+                        mbmp = mapBMP(f)
+                        for b in (bmp, mbmp):
+                                plotpolyfill(b, [[0, 0], [60, 10],
+                                        [30, 46]], 1)
+                                plotxybit(b, 59, 45, 1)
+                                fliphorizontalregion(b, 0, 0, 40, 30)
+                        self.assertEqual(mbmp[:], bmp)
+                        mbmp.close()
+                        self.assertEqual(loadBMP(f), bmp)
+
+
+        def teststreamed2filekeepspalettebitmaps(self):
+                for bits in (1, 4, 8):
+                        f = f'{self.outputdir}stream{bits}bit.bmp'
+                        bmp = newBMP(37, 23, bits)
+                        plotpolyfill(bmp, [[0, 0], [36, 5],
+                                [20, 22]], 1)
+                        saveBMP(f, bmp)
+                        p = self._filepaths(f'stream{bits}bitcf.bmp')
+                        colorfilter2file(f, p[0], self.cfcyan)
+                        nbmp = loadBMP(p[0])
+                        self.assertEqual(getBMPimgbytes(nbmp),
+                                         getBMPimgbytes(bmp))
+                        self.assertEqual(getallRGBpal(nbmp),
+                                [colorfilter(c, self.cfcyan)
+                                 for c in getallRGBpal(bmp)])
+                        p = self._filepaths(f'stream{bits}bitflip.bmp')
+                        flipvertical2file(f, p[0])
+                        flipvertical(bmp)
+                        self.assertEqual(loadBMP(p[0]), bmp)
+
+
+        def testthickroundlinematchesstampedcircles(self):
+                for bits in (1, 8, 24):
+                        bmp1 = newBMP(64, 48, bits)
+                        bmp2 = newBMP(64, 48, bits)
+                        bmp3 = newBMP(64, 48, bits)
+                        (p1, p2) = ([-3, 40], [50, 7])
+                        thickroundline(bmp1, p1, p2, 6, 1)
+                        for (x, y) in iterline(p1, p2):
+                                filledcircle(bmp2, x, y, 6, 1)
+                        self.assertEqual(bmp1, bmp2)
+                        gradthickroundline(bmp3, p1, p2, 6,
+                                [255, 128], [1.0, 1.0, 1.0])
+                        self.assertEqual(
+                                [getxybit(bmp1, x, y) > 0
+                                 for x in range(64)
+                                 for y in range(48)],
+                                [getxybit(bmp3, x, y) > 0
+                                 for x in range(64)
+                                 for y in range(48)])
+
+
+        def testthickroundline4bitmatches8bit(self):
+                bmp1 = newBMP(63, 48, 4)
+                bmp2 = newBMP(63, 48, 8)
+                for (p1, p2, r) in (([-3, 40], [50, 7], 6),
+                                    ([10, 3], [11, 44], 5),
+                                    ([60, 20], [2, 22], 4)):
+                        thickroundline(bmp1, p1, p2, r, 15)
+                        thickroundline(bmp2, p1, p2, r, 15)
+                self.assertEqual(
+                        [getxybit(bmp1, x, y)
+                         for x in range(63)
+                         for y in range(48)],
+                        [getxybit(bmp2, x, y)
+                         for x in range(63)
+                         for y in range(48)])
+
+
+        def testgradcirclecoversfilledcircle(self):
+                for bits in (1, 8, 24):
+                        bmp1 = newBMP(64, 48, bits)
+                        bmp2 = newBMP(64, 48, bits)
+                        filledcircle(bmp1, 50, 20, 17, 1)
+                        gradcircle(bmp2, 50, 20, 17,
+                                [255, 128], [1.0, 1.0, 1.0])
+                        self.assertEqual(
+                                [getxybit(bmp1, x, y) > 0
+                                 for x in range(64)
+                                 for y in range(48)],
+                                [getxybit(bmp2, x, y) > 0
+                                 for x in range(64)
+                                 for y in range(48)])
+                        self.assertEqual(
+                                getRGBxybit(bmp2, 50, 20),
+                                [255, 255, 255])
+
+
+        def testfilledarcwrapsaround12oclock(self):
+                bmp1 = newBMP(40, 40, 8)
+                bmp2 = newBMP(40, 40, 8)
+                drawarc(bmp1, 19, 19, 14, 300, 60, 1, False, 9, True)
+                drawarc(bmp2, 19, 19, 14, 300, 360, 1, False, 9, True)
+                drawarc(bmp2, 19, 19, 14, 0, 60, 1, False, 9, True)
+                self.assertEqual(bmp1, bmp2)
+                self.assertEqual(getxybit(bmp1, 19, 8), 9)
+                self.assertEqual(getxybit(bmp1, 19, 30), 0)
+
+
+        def testpiechartfillseveryslice(self):
+                bmp1 = newBMP(40, 40, 8)
+                bmp2 = newBMP(40, 40, 8)
+                filledcircle(bmp1, 19, 19, 14, 9)
+                piechart(bmp2, 19, 19, 14,
+                        [[35, 1], [25, 2], [20, 3],
+                         [15, 4], [5, 5]])
+                self.assertEqual(
+                        [getxybit(bmp1, x, y) > 0
+                         for x in range(40)
+                         for y in range(40)],
+                        [getxybit(bmp2, x, y) > 0
+                         for x in range(40)
+                         for y in range(40)])
+                self.assertEqual(
+                        [getxybit(bmp2, 27, 12),
+                         getxybit(bmp2, 22, 29),
+                         getxybit(bmp2, 9, 23),
+                         getxybit(bmp2, 10, 11),
+                         getxybit(bmp2, 17, 8)],
+                        [1, 2, 3, 4, 5])
+                bmp2 = newBMP(40, 40, 8)
+                self.assertEqual(piechart(bmp2, 19, 19, 14, []), [[], -1])
+                self.assertEqual(bmp2, newBMP(40, 40, 8))
+
+
+        def testprofilingcountsfilterand2filedispatcher(self):
+                self.assertIsNone(getprofilesink())
+                stats = {}
+                f = f'{self.outputdir}raccoon-profiled.bmp'
+                with profiling(statssink(stats)):
+                        invertbits2file(self.ofile, f)
+                        colorfilter2file(self.ofile, f, self.cfcyan)
+                        colorfilter2file(self.ofile, f, self.cfyellow)
+                self.assertIsNone(getprofilesink())
+                bmp = loadBMP(self.ofile)
+                (x, y) = getmaxxy(bmp)
+                s = stats['invertbits2file']
+                self.assertEqual(s['calls'], 1)
+                self.assertEqual(s['pixels'], x * y)
+                self.assertEqual(s['bytesread'], len(bmp))
+                self.assertEqual(s['byteswritten'], len(bmp))
+                for name in ('colorfilter2file', '_useclradjfn'):
+                        s = stats[name]
+                        self.assertEqual(s['calls'], 2)
+                        self.assertEqual(s['pixels'], 2 * x * y)
+                        self.assertGreaterEqual(s['wall'], s['maxwall'])
+                        self.assertGreater(s['maxwall'], 0)
+                f = f'{self.outputdir}profile.json'
+                saveprofilestats2JSON(f, stats)
+                with open(f) as j:
+                        self.assertEqual(json.load(j), stats)
+
+
+        def testimageiteratorsreportprogressonlywhenasked(self):
+                bmp = newBMP(12, 40, 4)
+                filledcircle(bmp, 6, 20, 5, 3)
+                out = StringIO()
+                with redirect_stdout(out):
+                        hist = colorhistorgram(bmp)
+                        flipXY(bmp)
+                self.assertEqual(out.getvalue(), '')
+                calls = []
+                report = lambda *a: calls.append(a)
+                self.assertEqual(colorhistorgram(bmp, report), hist)
+                self.assertEqual(calls[0][1:], (0, 40))
+                self.assertEqual([c[1] for c in calls[1: -1]],
+                                 list(range(1, 40)))
+                self.assertEqual(calls[-1][1:], (40, 40))
+                calls = []
+                with progressreporting(throttleprogress(report, 10)):
+                        flipXY(bmp)
+                self.assertEqual([c[1] for c in calls],
+                                 [0, 10, 20, 30, 40])
+                out = StringIO()
+                with redirect_stdout(out):
+                        flipXY(bmp, printprogress(20))
+                self.assertEqual(out.getvalue().count('*'), 1)
+
+
+        def testedgeandregionmasksmatchpixelscan(self):
+                npmod = colormasks._np
+                try:
+                        for usenp in (True, False):
+                                if not usenp:
+                                        colormasks._np = None
+                                for bits in (1, 4, 8, 24):
+                                        self.doedgeandregionmasks(bits)
+                finally:
+                        colormasks._np = npmod
+
+
+        def doedgeandregionmasks(self, bits):
+                (mx, my) = (13, 11)
+                bmp = newBMP(mx, my, bits)
+                filledcircle(bmp, 6, 5, 4,
+                        0xffffff if bits == 24
+                        else (1 << bits) - 1)
+                plotxybit(bmp, 1, 1, 1)
+                rgb = {(x, y): getRGBxybit(bmp, x, y)
+                       for x in range(mx) for y in range(my)}
+                for t in (0, 120):
+                        edges = set()
+                        for (v, c) in rgb.items():
+                                for u in itergetneighbors(v,
+                                            mx, my, False):
+                                        if distance(rgb[tuple(u)],
+                                                    c) > t:
+                                                edges.add(tuple(u))
+                                                break
+                        self.assertEqual(
+                                set(getimagedgevert(bmp, t)),
+                                edges)
+                        self.assertEqual(
+                                set(getimageregionbyRGB(bmp,
+                                        rgb[(6, 5)], t + 1)),
+                                {v for (v, c) in rgb.items()
+                                 if distance(c, rgb[(6, 5)]) < t + 1})
+                        plotted = bmp[:]
+                        expected = bmp[:]
+                        plotimgedges(plotted, t, 1, 1)
+                        for (x, y) in edges:
+                                plotxybit(expected, x, y, 1)
+                        self.assertEqual(plotted, expected)
+
+
+        def testhorizontalflipsarepixelexactatanybitdepth(self):
+                (mx, my) = (21, 13)
+                for bits in (1, 4, 8, 24):
+                        bmp = newBMP(mx, my, bits)
+                        for (x, y) in iterline([0, 0], [mx - 1, my - 1]):
+                                plotxybit(bmp, x, y, 1)
+                        plotxybit(bmp, 3, 9, 1)
+                        px = lambda b: [[getxybit(b, x, y)
+                                         for x in range(mx)]
+                                        for y in range(my)]
+                        before = px(bmp)
+                        flipped = bmp[:]
+                        fliphorizontalregion(flipped, 3, 2, 17, 11)
+                        mirrored = bmp[:]
+                        mirrorleftinregion(mirrored, 3, 2, 17, 11)
+                        expected = [r[:] for r in before]
+                        for y in range(2, 12):
+                                expected[y][3: 18] = before[y][17: 2: -1]
+                        self.assertEqual(px(flipped), expected)
+                        for y in range(2, 12):
+                                expected[y][3: 11] = before[y][3: 11]
+                        self.assertEqual(px(mirrored), expected)
+                        circ = bmp[:]
+                        fliphoricircregion(circ, 10, 6, 5)
+                        self.assertEqual(px(circ)[6][5: 16],
+                                         before[6][15: 4: -1])
+                        self.assertEqual(px(circ)[0], before[0])
+                        f = flipXY(bmp)
+                        self.assertEqual(getmaxxy(f), (my, mx))
+                        if bits < 8:
+                                expected = [[before[x][y]
+                                             for x in range(my)]
+                                            for y in range(mx)]
+                        else:
+                                expected = [[before[my - 1 - x][mx - 1 - y]
+                                             for x in range(my)]
+                                            for y in range(mx)]
+                        self.assertEqual(
+                                [[getxybit(f, x, y)
+                                  for x in range(my)]
+                                 for y in range(mx)], expected)
+
+        def testregionviewcropsandblitsatanybitdepth(self):
+                (mx, my) = (21, 13)
+                for bits in (1, 4, 8, 24):
+                        bmp = newBMP(mx, my, bits)
+                        for (x, y) in iterline([0, 0], [mx - 1, my - 1]):
+                                plotxybit(bmp, x, y, 1)
+                        plotxybit(bmp, 3, 9, 1)
+                        px = lambda b: [[getxybit(b, x, y)
+                                         for x in range(getmaxxy(b)[0])]
+                                        for y in range(getmaxxy(b)[1])]
+                        before = px(bmp)
+                        c = crop(bmp, 3, 2, 17, 11)
+                        self.assertEqual(px(c), [r[3: 18] for r in before[2: 12]])
+                        if bits < 24:
+                                self.assertEqual(getallRGBpal(c), getallRGBpal(bmp))
+                        v = regionview(bmp, 3, 2, 17, 11)
+                        self.assertEqual((len(v), v.width), (10, 15))
+                        if bits < 24:
+                                self.assertEqual(list(v.pixelrow(7)), before[9][3: 18])
+                        else:
+                                self.assertEqual(len(v.pixelrow(7)), 45)
+                        v.blit(bmp, 5, 3)
+                        expected = [r[:] for r in before]
+                        for y in range(2, 12):
+                                expected[y + 1][5: 20] = before[y][3: 18]
+                        self.assertEqual(px(bmp), expected)
+                        if bits >= 8:
+                                b = bmp[:]
+                                pasterect(b, copyrect(bmp, 0, 0, 5, 4), 7, 6)
+                                after = px(b)
+                                for y in range(5):
+                                        self.assertEqual(after[y + 7][7: 13], expected[y][0: 6])
+
+        def testresizetoanysizewitheachfilter(self):
+                (mx, my) = (13, 9)
+                for bits in (1, 4, 8, 24):
+                        bmp = newBMP(mx, my, bits)
+                        c = 0x3060c0 if bits == 24 else 1
+                        for y in range(my):
+                                for x in range(mx):
+                                        plotxybit(bmp, x, y, c)
+                        for filter in ('box', 'bilinear', 'bicubic', 'lanczos'):
+                                for (nx, ny) in ((29, 4), (5, 20)):
+                                        r = resize(bmp, nx, ny, filter)
+                                        self.assertEqual(getmaxxy(r), (nx, ny))
+                                        self.assertEqual(r[28], bits)
+                                        self.assertEqual({getxybit(r, x, y)
+                                                for x in range(nx)
+                                                for y in range(ny)}, {c})
+                        for (x, y) in iterline([0, 0], [mx - 1, my - 1]):
+                                plotxybit(bmp, x, y, 0)
+                        r = resize(bmp, 3 * mx, 3 * my, 'box')
+                        self.assertEqual([[getxybit(r, x, y) for x in range(3 * mx)]
+                                                for y in range(3 * my)],
+                                         [[getxybit(bmp, x // 3, y // 3) for x in range(3 * mx)]
+                                                for y in range(3 * my)])
+                bmp = newBMP(8, 6, 24)
+                for y in range(6):
+                        for x in range(8):
+                                plotxybit(bmp, x, y, (x >> 1) * 0x102030 + (y >> 1) * 0x30201)
+                r = resize(bmp, 4, 3, 'box')
+                for y in range(3):
+                        for x in range(4):
+                                self.assertEqual(getxybit(r, x, y), getxybit(bmp, 2 * x, 2 * y))
+                self.assertIsNone(resize(bmp, 4, 3, 'nearest'))
+                filters = ('box', 'bilinear', 'bicubic', 'lanczos')
+                resized = [resize(bmp, 11, 17, f) for f in filters]
+                npmod = resample._np
+                try:
+                        resample._np = None
+                        self.assertEqual([resize(bmp, 11, 17, f) for f in filters], resized)
+                finally:
+                        resample._np = npmod
+
+
+        def testcircregionsreadonlytheirrows(self):
+                (mx, my, x, y, r) = (31, 27, 14, 12, 9)
+                rnd = Random(23)
+                bmp = newBMP(mx, my, 24)
+                for Y in range(my):
+                        for X in range(mx):
+                                plotxybit(bmp, X, Y, rnd.randrange(1 << 24))
+                old = [[getxybit(bmp, X, Y) for X in range(mx)] for Y in range(my)]
+                inside = {(X, Y) for (v0, v1) in itercirclepartlineedge(r)
+                        for Y in (y - v1, y + v1) for X in range(x - v0, x + v0)}
+                b = copy(bmp)
+                magnifyNtimescircregion(b, x, y, r, 3)
+                for Y in range(my):
+                        for X in range(mx):
+                                self.assertEqual(getxybit(b, X, Y),
+                                        old[y + (Y - y) // 3][x + (X - x) // 3]
+                                        if (X, Y) in inside else old[Y][X])
+                b = copy(bmp)
+                pixelizenxncircregion(b, x, y, r, 4)
+                off = my % 4
+                for (X, Y) in inside:
+                        (bx, by) = (X // 4 * 4, Y // 4 * 4 + off)
+                        block = [old[v][u] for u in range(bx, bx + 4) for v in range(by, by + 4)]
+                        self.assertEqual(getRGBxybit(b, X, Y), [round(sum(c >> s & 255 for c in block) / 16)
+                                                               for s in (16, 8, 0)])
+                b = copy(bmp)
+                pixelizenxn(b, 5)
+                self.assertEqual(getmaxxy(b), (mx, my))
+                self.assertEqual(len(b), len(bmp))
+
+        def testplot3Dsolidsharesdepthbuffer(self):
+                cf = getRGBfactors()
+                sd = getshapesidedict()
+                near = ([cubevert(20), sd['cube']], cf['brightred'], [0, 0, 100])
+                far = ([cubevert(30), sd['cube']], cf['brightblue'], [0, 0, 140])
+                rv = rotvec3D(20, 30, 40)
+                for bits in (1, 4, 8, 24):
+                        bmps = []
+                        for order in ((near, far), (far, near), (near,)):
+                                bmp = newBMP(80, 60, bits)
+                                zb = newzbuffer(80, 60)
+                                for (vs, rgb, tv) in order:
+                                        plot3Dsolid(bmp, vs, True, rgb, False, 0,
+                                                rv, tv, 200, [40, 30], zb)
+                                bmps.append(bmp)
+                        self.assertEqual(bmps[0], bmps[1])
+                        self.assertEqual(getxybit(bmps[0], 40, 30), getxybit(bmps[2], 40, 30))
+                        self.assertNotEqual(getxybit(bmps[0], 40, 30), 0)
+                        self.assertNotEqual(bmps[0], bmps[2])
+                (vs, sides) = spherevertandsurface([5, 0, 0], 30, 15)
+                self.assertEqual([list(map(list, v)) for v in
+                                  render3D.transformvertices(vs, rv, [0, 0, 100], 200)],
+                                 list(perspective(vs, rv, [0, 0, 100], 200)))
+                bmp = newBMP(80, 60, 24)
+                plot3Dsolid(bmp, [vs, sides], True, cf['brightwhite'], True, 0xff,
+                        rv, [0, 0, 100], 200, [40, 30], None, 'gouraud')
+                npmod = render3D._np
+                try:
+                        render3D._np = None
+                        bmp2 = newBMP(80, 60, 24)
+                        plot3Dsolid(bmp2, [vs, sides], True, cf['brightwhite'], True, 0xff,
+                                rv, [0, 0, 100], 200, [40, 30], None, 'gouraud')
+                        self.assertEqual(bmp, bmp2)
+                finally:
+                        render3D._np = npmod
+                self.assertIsNone(plot3Dsolid(bmp, [vs, sides], True, cf['red'], False, 0,
+                        rv, [0, 0, 100], 200, [40, 30], None, 'phong'))
+                self.assertIsNone(plot3Dsolid(bmp, [vs, sides], True, cf['red'], False, 0,
+                        rv, [0, 0, 100], 200, [40, 30], newzbuffer(8, 6)))
+                self.assertEqual(bmp, bmp2)
+
+        def testmeshgeneratorsindexverticesdirectly(self):
+                (vs, sides) = surfplot3Dvertandsurface(-6, -4, 6, 4, 2, lambda x, y: x * y)
+                self.assertEqual(len(vs), 24)
+                self.assertEqual(sides[:2], [[6, 7, 1, 0], [7, 8, 2, 1]])
+                self.assertEqual(len(sides), 15)
+                self.assertEqual(zlevelcoords([[1, 2, 3], [4, 5, 3], [1, 2, 3], [1, 2, 6]]),
+                                 ([3, 6], {3: [0, 1, 0], 6: [3]}))
+                pts = spherevert([0, 0, 0], 10, 30)
+                self.assertEqual(len(pts), len({tuple(p) for p in pts}))
+                clearmeshcache()
+                m = spherevertandsurface([5, 0, 0], 30, 15)
+                m[0][0][0] = 999
+                m[1].clear()
+                m2 = spherevertandsurface([5, 0, 0], 30, 15)
+                self.assertNotEqual(m2[0][0][0], 999)
+                self.assertNotEqual(m2[1], [])
+                clearmeshcache()
+                self.assertEqual(spherevertandsurface([5, 0, 0], 30, 15), m2)
+                t = [1]
+                f = lambda x, y: x * y * t[0]
+                m = surfplot3Dvertandsurface(-6, -4, 6, 4, 2, f)
+                t[0] = 2
+                m2 = surfplot3Dvertandsurface(-6, -4, 6, 4, 2, f)
+                self.assertEqual([v[2] * 2 for v in m[0]], [v[2] for v in m2[0]])
+                self.assertNotEqual(m[0], m2[0])
+
+        def testcoloradjustmentlutsmatchperpixelformulas(self):
+                def _gamma(buf, gamma):
+                        for i in range(0, len(buf), 3):
+                                lum = max(buf[i: i + 3]) or 1
+                                f = int(((lum / 255) ** gamma) * 255) / lum
+                                for j in range(i, i + 3):
+                                        buf[j] = int(buf[j] * f) & 0xff
+
+                def _threshold(buf, lumrange):
+                        (lummin, lummax) = sorted(v & 0xff for v in lumrange)
+                        for i in range(0, len(buf), 3):
+                                lum = max(buf[i: i + 3])
+                                f = 1
+                                if lum > 0:
+                                        if lum < lummin:
+                                                f = lummin / lum
+                                        if lum > lummax:
+                                                f = lummax / lum
+                                for j in range(i, i + 3):
+                                        buf[j] = int(f * buf[j])
+
+                rnd = Random(10)
+                bmp = newBMP(36, 23, 24)
+                for y in range(23):
+                        for x in range(36):
+                                plotxybit(bmp, x, y, rnd.randrange(1 << 24))
+                pal = getallRGBpal(newBMP(4, 4, 8))
+                bufs = [getBMPimgbytes(bmp),
+                        array('B', [c for (r, g, b) in pal for c in (b, g, r)])]
+                for buf in bufs:
+                        for f in ([1.0, 0.5, 0.25], [0.3, 0.9, 0.7]):
+                                (b, ref) = (array('B', buf), array('B', buf))
+                                applycolorfiltertoBGRbuf(b, f)
+                                m = len(buf) - 1
+                                for ch in range(3):
+                                        ref[ch: m - 2 + ch: 3] = array('B',
+                                                [round(v * f[2 - ch]) for v in buf[ch: m - 2 + ch: 3]])
+                                self.assertEqual(b, ref)
+                        for gamma in (0.5, 1.7):
+                                (b, ref) = (array('B', buf), array('B', buf))
+                                applygammaBGRbuf(b, gamma)
+                                _gamma(ref, gamma)
+                                self.assertEqual(b, ref)
+                        for adj in (-40, 25, 80):
+                                self.assertEqual(applybrightnessadjtoBGRbuf(array('B', buf), adj),
+                                        array('B', [min(max(v + round(v * adj / 100), 0), 255)
+                                                    for v in buf]))
+                        for lumrange in ((40, 200), (220, 30)):
+                                (b, ref) = (array('B', buf), array('B', buf))
+                                applythresholdadjtoBGRbuf(b, lumrange)
+                                _threshold(ref, lumrange)
+                                self.assertEqual(b, ref)
+                        self.assertEqual(array('B', invertbitsinbuffer(array('B', buf))),
+                                         array('B', [v ^ 0xff for v in buf]))
+                bmp = newBMP(37, 23, 8)
+                for y in range(23):
+                        for x in range(37):
+                                plotxybit(bmp, x, y, rnd.randrange(256))
+                old = [[getxybit(bmp, x, y) for x in range(37)] for y in range(23)]
+                invertregion(bmp, 3, 4, 30, 20)
+                for y in range(23):
+                        for x in range(37):
+                                self.assertEqual(getxybit(bmp, x, y), old[y][x] ^ 0xff
+                                        if 3 <= x <= 30 and 4 <= y <= 20 else old[y][x])
+
 if __name__ == "__main__":
         print(notice)
         print('Root directory is: ',rootdir)